@@ -0,0 +1,28 @@
+"""Rendered HTML bodies for posts and comments
+
+Revision ID: 004
+Revises: 003
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "004"
+down_revision: Union[str, None] = "003"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Sanitized HTML rendered from the Markdown body at write time.
+    # NULL until rendered; existing rows are filled by jobs.backfill_body_html.
+    op.add_column("posts", sa.Column("body_html", sa.Text, nullable=True))
+    op.add_column("comments", sa.Column("body_html", sa.Text, nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("comments", "body_html")
+    op.drop_column("posts", "body_html")
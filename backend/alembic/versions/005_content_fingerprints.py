@@ -0,0 +1,38 @@
+"""Content fingerprints for duplicate detection; system-raised flags
+
+Revision ID: 005
+Revises: 004
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "005"
+down_revision: Union[str, None] = "004"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    for table in ["posts", "comments"]:
+        op.add_column(table, sa.Column("content_hash", sa.String(64), nullable=True))
+        op.add_column(table, sa.Column("simhash", sa.BigInteger, nullable=True))
+        op.create_index(f"idx_{table}_content_hash", table, ["content_hash", "created_at"])
+        op.create_index(f"idx_{table}_simhash", table, ["simhash"])
+
+    # Flags raised automatically (duplicate floods, classifiers) have no reporter.
+    op.alter_column("flags", "reporter_id", nullable=True)
+
+
+def downgrade() -> None:
+    op.execute("DELETE FROM flags WHERE reporter_id IS NULL")
+    op.alter_column("flags", "reporter_id", nullable=False)
+
+    for table in ["comments", "posts"]:
+        op.drop_index(f"idx_{table}_simhash", table_name=table)
+        op.drop_index(f"idx_{table}_content_hash", table_name=table)
+        op.drop_column(table, "simhash")
+        op.drop_column(table, "content_hash")
@@ -0,0 +1,73 @@
+"""Lookalike-insensitive handle skeletons with a unique index
+
+Revision ID: 006
+Revises: 005
+Create Date: 2026-10-19
+
+"""
+import re
+import unicodedata
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "006"
+down_revision: Union[str, None] = "005"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Snapshot of app/core/confusables.skeleton at this revision, so the
+# backfill means the same thing however the live function changes.
+_CHAR_MAP = str.maketrans({
+    "0": "o", "1": "l", "3": "e", "4": "a", "5": "s", "7": "t", "8": "b",
+    "|": "l", "!": "l", "$": "s", "@": "a",
+    "i": "l", "ı": "l", "ɩ": "l",
+    "а": "a", "в": "b", "с": "c", "ԁ": "d", "е": "e", "һ": "h", "і": "l",
+    "ј": "j", "к": "k", "м": "m", "н": "h", "о": "o", "р": "p", "ԛ": "q",
+    "ѕ": "s", "т": "t", "у": "y", "х": "x", "ԝ": "w", "ү": "y",
+    "α": "a", "β": "b", "ε": "e", "η": "n", "ι": "l", "κ": "k", "ν": "v",
+    "ο": "o", "ρ": "p", "τ": "t", "υ": "u", "χ": "x", "ω": "w",
+    "-": None, "_": None, ".": None,
+})
+_SEQUENCES = [("rn", "m"), ("vv", "w")]
+_COMBINING_RE = re.compile("[\u0300-\u036f]")
+
+
+def skeleton(handle: str) -> str:
+    text = unicodedata.normalize("NFKD", unicodedata.normalize("NFKC", handle).casefold())
+    text = _COMBINING_RE.sub("", text).translate(_CHAR_MAP)
+    for sequence, replacement in _SEQUENCES:
+        text = text.replace(sequence, replacement)
+    return text
+
+
+def upgrade() -> None:
+    op.add_column("actors", sa.Column("handle_skeleton", sa.String(64), nullable=True))
+
+    # Backfill in Python (the skeleton is not expressible in SQL). Existing
+    # lookalikes keep working: the oldest actor gets the skeleton, later
+    # collisions stay NULL and are listed for moderator review.
+    conn = op.get_bind()
+    rows = conn.execute(sa.text("SELECT id, handle FROM actors ORDER BY created_at, id")).all()
+    seen: dict[str, str] = {}
+    updates = []
+    for actor_id, handle in rows:
+        key = skeleton(handle)
+        if key in seen:
+            print(f"  handle '{handle}' looks like '{seen[key]}'; skeleton left NULL")
+            continue
+        seen[key] = handle
+        updates.append({"id": actor_id, "skeleton": key})
+    if updates:
+        conn.execute(
+            sa.text("UPDATE actors SET handle_skeleton = :skeleton WHERE id = :id"),
+            updates,
+        )
+
+    op.create_index("idx_actors_handle_skeleton", "actors", ["handle_skeleton"], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index("idx_actors_handle_skeleton", table_name="actors")
+    op.drop_column("actors", "handle_skeleton")
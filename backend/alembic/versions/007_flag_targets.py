@@ -0,0 +1,47 @@
+"""Per-target pending flag counters
+
+Revision ID: 007
+Revises: 006
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision: str = "007"
+down_revision: Union[str, None] = "006"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "flag_targets",
+        sa.Column("target_type", sa.String(16), primary_key=True),
+        sa.Column("target_id", postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column("pending_count", sa.Integer, server_default="0", nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    )
+    op.execute("""
+        CREATE TRIGGER update_flag_targets_updated_at
+        BEFORE UPDATE ON flag_targets
+        FOR EACH ROW
+        EXECUTE FUNCTION update_updated_at_column();
+    """)
+
+    op.execute("""
+        INSERT INTO flag_targets (target_type, target_id, pending_count)
+        SELECT target_type, target_id, count(*)
+        FROM flags
+        WHERE status = 'pending'
+        GROUP BY target_type, target_id
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS update_flag_targets_updated_at ON flag_targets")
+    op.drop_table("flag_targets")
@@ -0,0 +1,100 @@
+"""Target-grouped moderation queue: priority and aggregates on flag_targets
+
+Revision ID: 008
+Revises: 007
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision: str = "008"
+down_revision: Union[str, None] = "007"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Snapshot of app/core/constants.py at this revision; the backfill must
+# not change meaning when the live constants are retuned.
+FLAG_REASON_WEIGHTS = {
+    "violence": 5.0,
+    "harassment": 4.0,
+    "impersonation": 3.0,
+    "crypto": 3.0,
+    "spam": 2.0,
+    "misinformation": 2.0,
+    "other": 1.0,
+}
+HIGH_TRUST_THRESHOLD = 30.0
+SYSTEM_FLAG_TRUST = 10.0
+
+
+def upgrade() -> None:
+    op.add_column("flags", sa.Column("reporter_trust", sa.Float, nullable=True))
+    op.add_column("flag_targets", sa.Column("priority", sa.Float, server_default="0", nullable=False))
+    op.add_column("flag_targets", sa.Column("reporter_trust_sum", sa.Float, server_default="0", nullable=False))
+    op.add_column(
+        "flag_targets",
+        sa.Column("reason_counts", postgresql.JSONB, server_default=sa.text("'{}'::jsonb"), nullable=False),
+    )
+    op.add_column("flag_targets", sa.Column("last_flagged_at", sa.DateTime(timezone=True), nullable=True))
+
+    # Snapshot current reporter trust onto existing flags.
+    op.execute("""
+        UPDATE flags SET reporter_trust = actors.trust_score
+        FROM actors WHERE actors.id = flags.reporter_id
+    """)
+
+    # Rebuild the aggregates from pending flags (same formula as
+    # app/services/flag_service.flag_weight).
+    weight_cases = " ".join(
+        f"WHEN '{reason}' THEN {weight}" for reason, weight in FLAG_REASON_WEIGHTS.items()
+    )
+    op.execute(f"""
+        WITH pending AS (
+            SELECT target_type, target_id, reason::text AS reason, created_at,
+                   COALESCE(reporter_trust, {SYSTEM_FLAG_TRUST}) AS trust
+            FROM flags WHERE status = 'pending'
+        ),
+        by_reason AS (
+            SELECT target_type, target_id, jsonb_object_agg(reason, n) AS reason_counts
+            FROM (
+                SELECT target_type, target_id, reason, count(*) AS n
+                FROM pending GROUP BY target_type, target_id, reason
+            ) r
+            GROUP BY target_type, target_id
+        )
+        INSERT INTO flag_targets
+            (target_type, target_id, pending_count, priority, reporter_trust_sum,
+             reason_counts, last_flagged_at)
+        SELECT p.target_type, p.target_id, count(*),
+               sum((CASE p.reason {weight_cases} ELSE 1.0 END) * (1 + p.trust / {HIGH_TRUST_THRESHOLD})),
+               sum(p.trust), b.reason_counts, max(p.created_at)
+        FROM pending p
+        JOIN by_reason b USING (target_type, target_id)
+        GROUP BY p.target_type, p.target_id, b.reason_counts
+        ON CONFLICT (target_type, target_id) DO UPDATE SET
+            pending_count = EXCLUDED.pending_count,
+            priority = EXCLUDED.priority,
+            reporter_trust_sum = EXCLUDED.reporter_trust_sum,
+            reason_counts = EXCLUDED.reason_counts,
+            last_flagged_at = EXCLUDED.last_flagged_at
+    """)
+
+    op.create_index(
+        "idx_flag_targets_queue",
+        "flag_targets",
+        [sa.text("priority DESC"), "last_flagged_at"],
+        postgresql_where=sa.text("pending_count > 0"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("idx_flag_targets_queue", table_name="flag_targets")
+    op.drop_column("flag_targets", "last_flagged_at")
+    op.drop_column("flag_targets", "reason_counts")
+    op.drop_column("flag_targets", "reporter_trust_sum")
+    op.drop_column("flag_targets", "priority")
+    op.drop_column("flags", "reporter_trust")
@@ -0,0 +1,106 @@
+"""Monthly range partitioning for audit_log
+
+Revision ID: 009
+Revises: 008
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+revision: str = "009"
+down_revision: Union[str, None] = "008"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Snapshot of app/core/constants.AUDIT_PARTITIONS_AHEAD at this revision;
+# later months are created by app/core/audit_partitions.py at startup.
+AUDIT_PARTITIONS_AHEAD = 3
+
+
+def upgrade() -> None:
+    # A partitioned table's primary key must contain the partition key.
+    op.execute("ALTER TABLE audit_log RENAME TO audit_log_unpartitioned")
+    op.execute("ALTER TABLE audit_log_unpartitioned RENAME CONSTRAINT audit_log_pkey TO audit_log_unpartitioned_pkey")
+    op.execute("ALTER INDEX idx_audit_resource RENAME TO idx_audit_resource_unpartitioned")
+    op.execute("ALTER INDEX idx_audit_created RENAME TO idx_audit_created_unpartitioned")
+    op.execute("ALTER INDEX ix_audit_log_actor_id RENAME TO ix_audit_log_actor_id_unpartitioned")
+
+    op.execute("""
+        CREATE TABLE audit_log (
+            id UUID NOT NULL DEFAULT uuid_generate_v4(),
+            actor_id UUID REFERENCES actors(id) ON DELETE SET NULL,
+            action VARCHAR(64) NOT NULL,
+            resource_type VARCHAR(32) NOT NULL,
+            resource_id UUID,
+            details JSONB,
+            ip_address VARCHAR(45),
+            created_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+            PRIMARY KEY (id, created_at)
+        ) PARTITION BY RANGE (created_at)
+    """)
+    op.execute("CREATE INDEX ix_audit_log_actor_id ON audit_log (actor_id)")
+    op.execute("CREATE INDEX idx_audit_resource ON audit_log (resource_type, resource_id)")
+    op.execute("CREATE INDEX idx_audit_created ON audit_log (created_at DESC)")
+
+    # One partition per month from the oldest entry through the months
+    # ahead; the default partition only catches rows if maintenance lapses.
+    op.execute(f"""
+        DO $$
+        DECLARE
+            month DATE := date_trunc('month', LEAST(
+                (SELECT min(created_at) FROM audit_log_unpartitioned), now()
+            ) AT TIME ZONE 'UTC')::date;
+            last DATE := (date_trunc('month', now() AT TIME ZONE 'UTC')
+                          + interval '{AUDIT_PARTITIONS_AHEAD} months')::date;
+        BEGIN
+            WHILE month <= last LOOP
+                EXECUTE format(
+                    'CREATE TABLE %I PARTITION OF audit_log FOR VALUES FROM (%L) TO (%L)',
+                    'audit_log_' || to_char(month, 'YYYY_MM'),
+                    month::timestamp AT TIME ZONE 'UTC',
+                    (month + interval '1 month')::timestamp AT TIME ZONE 'UTC'
+                );
+                month := (month + interval '1 month')::date;
+            END LOOP;
+        END $$;
+    """)
+    op.execute("CREATE TABLE audit_log_default PARTITION OF audit_log DEFAULT")
+
+    op.execute("""
+        INSERT INTO audit_log (id, actor_id, action, resource_type, resource_id, details, ip_address, created_at)
+        SELECT id, actor_id, action, resource_type, resource_id, details, ip_address, created_at
+        FROM audit_log_unpartitioned
+    """)
+    op.execute("DROP TABLE audit_log_unpartitioned")
+
+
+def downgrade() -> None:
+    # Entries already archived to files are not restored.
+    op.execute("ALTER TABLE audit_log RENAME TO audit_log_partitioned")
+    op.execute("ALTER TABLE audit_log_partitioned RENAME CONSTRAINT audit_log_pkey TO audit_log_partitioned_pkey")
+    op.execute("ALTER INDEX ix_audit_log_actor_id RENAME TO ix_audit_log_actor_id_partitioned")
+    op.execute("ALTER INDEX idx_audit_resource RENAME TO idx_audit_resource_partitioned")
+    op.execute("ALTER INDEX idx_audit_created RENAME TO idx_audit_created_partitioned")
+    op.execute("""
+        CREATE TABLE audit_log (
+            id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+            actor_id UUID REFERENCES actors(id) ON DELETE SET NULL,
+            action VARCHAR(64) NOT NULL,
+            resource_type VARCHAR(32) NOT NULL,
+            resource_id UUID,
+            details JSONB,
+            ip_address VARCHAR(45),
+            created_at TIMESTAMPTZ NOT NULL DEFAULT now()
+        )
+    """)
+    op.execute("""
+        INSERT INTO audit_log (id, actor_id, action, resource_type, resource_id, details, ip_address, created_at)
+        SELECT id, actor_id, action, resource_type, resource_id, details, ip_address, created_at
+        FROM audit_log_partitioned
+    """)
+    op.execute("DROP TABLE audit_log_partitioned")
+    op.execute("CREATE INDEX ix_audit_log_actor_id ON audit_log (actor_id)")
+    op.execute("CREATE INDEX idx_audit_resource ON audit_log (resource_type, resource_id)")
+    op.execute("CREATE INDEX idx_audit_created ON audit_log (created_at DESC)")
@@ -0,0 +1,66 @@
+"""Expiry for timed mutes and bans
+
+Revision ID: 010
+Revises: 009
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision: str = "010"
+down_revision: Union[str, None] = "009"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("moderation_actions", sa.Column("expires_at", sa.DateTime(timezone=True), nullable=True))
+    op.add_column(
+        "moderation_actions",
+        sa.Column(
+            "target_author_id",
+            postgresql.UUID(as_uuid=True),
+            sa.ForeignKey("actors.id", ondelete="SET NULL"),
+            nullable=True,
+        ),
+    )
+
+    # Mutes and bans record whom they restrict; timed ones get a deadline.
+    # Deadlines already in the past are lifted by the scheduler on startup.
+    for table in ("posts", "comments"):
+        op.execute(f"""
+            UPDATE moderation_actions m SET target_author_id = t.author_id
+            FROM {table} t
+            WHERE t.id = m.target_id
+              AND m.target_type = '{table[:-1]}'
+              AND m.action IN ('mute', 'ban')
+        """)
+    op.execute("""
+        UPDATE moderation_actions
+        SET expires_at = created_at + duration_hours * interval '1 hour'
+        WHERE action IN ('mute', 'ban') AND duration_hours IS NOT NULL
+    """)
+
+    op.create_index(
+        "idx_mod_actions_expiry",
+        "moderation_actions",
+        ["expires_at"],
+        postgresql_where=sa.text("expires_at IS NOT NULL AND is_reversed = false"),
+    )
+    op.create_index(
+        "idx_mod_actions_restrictions",
+        "moderation_actions",
+        ["target_author_id"],
+        postgresql_where=sa.text("action IN ('mute', 'ban') AND is_reversed = false"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("idx_mod_actions_restrictions", table_name="moderation_actions")
+    op.drop_index("idx_mod_actions_expiry", table_name="moderation_actions")
+    op.drop_column("moderation_actions", "target_author_id")
+    op.drop_column("moderation_actions", "expires_at")
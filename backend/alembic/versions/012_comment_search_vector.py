@@ -0,0 +1,30 @@
+"""Full-text search vector on comments
+
+Revision ID: 012
+Revises: 011
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+revision: str = "012"
+down_revision: Union[str, None] = "011"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Same configuration as posts.search_vector (002), and weighted like a
+    # post body so comments and posts rank comparably in mixed results.
+    op.execute("""
+        ALTER TABLE comments ADD COLUMN search_vector tsvector
+            GENERATED ALWAYS AS (setweight(to_tsvector('english', coalesce(body, '')), 'B')) STORED
+    """)
+    op.execute("CREATE INDEX idx_comments_search ON comments USING GIN (search_vector)")
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS idx_comments_search")
+    op.execute("ALTER TABLE comments DROP COLUMN search_vector")
@@ -0,0 +1,45 @@
+"""Trigram and prefix indexes for handle and community autocomplete
+
+Revision ID: 013
+Revises: 012
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+revision: str = "013"
+down_revision: Union[str, None] = "012"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+
+    # Fuzzy matching (similarity / word_similarity); pg_trgm lowercases
+    # trigrams, so these serve case-insensitive matches on the raw columns.
+    op.execute("CREATE INDEX idx_actors_handle_trgm ON actors USING GIN (handle gin_trgm_ops)")
+    op.execute("CREATE INDEX idx_actors_display_name_trgm ON actors USING GIN (display_name gin_trgm_ops)")
+    op.execute("CREATE INDEX idx_communities_slug_trgm ON communities USING GIN (slug gin_trgm_ops)")
+    op.execute("CREATE INDEX idx_communities_name_trgm ON communities USING GIN (name gin_trgm_ops)")
+
+    # Prefix matching as an ordered btree range scan that stops after
+    # LIMIT rows (a trigram index has to collect every match first). The
+    # "C" collation lets one index serve both LIKE 'q%' and the ORDER BY.
+    op.execute('CREATE INDEX idx_actors_handle_prefix ON actors (handle COLLATE "C")')
+    op.execute('CREATE INDEX idx_actors_display_name_prefix ON actors (lower(display_name) COLLATE "C")')
+    op.execute('CREATE INDEX idx_communities_slug_prefix ON communities (slug COLLATE "C")')
+    op.execute('CREATE INDEX idx_communities_name_prefix ON communities (lower(name) COLLATE "C")')
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS idx_communities_name_prefix")
+    op.execute("DROP INDEX IF EXISTS idx_communities_slug_prefix")
+    op.execute("DROP INDEX IF EXISTS idx_actors_display_name_prefix")
+    op.execute("DROP INDEX IF EXISTS idx_actors_handle_prefix")
+    op.execute("DROP INDEX IF EXISTS idx_communities_name_trgm")
+    op.execute("DROP INDEX IF EXISTS idx_communities_slug_trgm")
+    op.execute("DROP INDEX IF EXISTS idx_actors_display_name_trgm")
+    op.execute("DROP INDEX IF EXISTS idx_actors_handle_trgm")
+    # pg_trgm is left installed; other objects may depend on it.
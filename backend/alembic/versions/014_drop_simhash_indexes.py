@@ -0,0 +1,29 @@
+"""Drop the unused simhash btree indexes
+
+Near duplicates are found by LSH banding in Redis (app/core/dedup.py); no
+query filters or sorts on the raw simhash, so these indexes were pure
+write overhead.
+
+Revision ID: 014
+Revises: 013
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+revision: str = "014"
+down_revision: Union[str, None] = "013"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    for table in ["posts", "comments"]:
+        op.drop_index(f"idx_{table}_simhash", table_name=table)
+
+
+def downgrade() -> None:
+    for table in ["posts", "comments"]:
+        op.create_index(f"idx_{table}_simhash", table, ["simhash"])
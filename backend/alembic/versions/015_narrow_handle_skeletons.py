@@ -0,0 +1,96 @@
+"""Recompute handle skeletons with the narrower confusables map
+
+The skeleton no longer folds lowercase "i" into "l", leetspeak digits, or
+symbols handles cannot contain (see app/core/confusables.py). Recomputing
+only splits skeletons apart, so no set skeleton collides; actors whose
+handle was left NULL as a lookalike may get one now.
+
+Revision ID: 015
+Revises: 014
+Create Date: 2026-10-19
+
+"""
+import re
+import unicodedata
+from typing import Callable, Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "015"
+down_revision: Union[str, None] = "014"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+_COMBINING_RE = re.compile("[\u0300-\u036f]")
+_SEQUENCES = [("rn", "m"), ("vv", "w")]
+
+_SHARED_MAP = {
+    "а": "a", "в": "b", "с": "c", "ԁ": "d", "е": "e", "һ": "h",
+    "ј": "j", "к": "k", "м": "m", "н": "h", "о": "o", "р": "p", "ԛ": "q",
+    "ѕ": "s", "т": "t", "у": "y", "х": "x", "ԝ": "w", "ү": "y",
+    "α": "a", "β": "b", "ε": "e", "η": "n", "κ": "k", "ν": "v",
+    "ο": "o", "ρ": "p", "τ": "t", "υ": "u", "χ": "x", "ω": "w",
+    "-": None, "_": None, ".": None,
+}
+
+# Snapshot of app/core/confusables.skeleton at this revision.
+_CHAR_MAP = str.maketrans({
+    **_SHARED_MAP,
+    "0": "o", "1": "l", "ı": "i", "ɩ": "i", "і": "i", "ι": "i",
+})
+
+# The skeleton from migration 006, for downgrades.
+_CHAR_MAP_006 = str.maketrans({
+    **_SHARED_MAP,
+    "0": "o", "1": "l", "3": "e", "4": "a", "5": "s", "7": "t", "8": "b",
+    "|": "l", "!": "l", "$": "s", "@": "a",
+    "i": "l", "ı": "l", "ɩ": "l", "і": "l", "ι": "l",
+})
+
+
+def skeleton(handle: str) -> str:
+    text = unicodedata.normalize("NFKC", handle).casefold()
+    text = _COMBINING_RE.sub("", unicodedata.normalize("NFKD", text)).translate(_CHAR_MAP)
+    for sequence, replacement in _SEQUENCES:
+        text = text.replace(sequence, replacement)
+    return text
+
+
+def skeleton_006(handle: str) -> str:
+    text = unicodedata.normalize("NFKD", unicodedata.normalize("NFKC", handle).casefold())
+    text = _COMBINING_RE.sub("", text).translate(_CHAR_MAP_006)
+    for sequence, replacement in _SEQUENCES:
+        text = text.replace(sequence, replacement)
+    return text
+
+
+def _backfill(key: Callable[[str], str]) -> None:
+    # As in 006: the oldest actor gets a contested skeleton, later
+    # lookalikes stay NULL and are listed for moderator review.
+    conn = op.get_bind()
+    rows = conn.execute(sa.text("SELECT id, handle FROM actors ORDER BY created_at, id")).all()
+    seen: dict[str, str] = {}
+    updates = []
+    for actor_id, handle in rows:
+        value = key(handle)
+        if value in seen:
+            print(f"  handle '{handle}' looks like '{seen[value]}'; skeleton left NULL")
+            continue
+        seen[value] = handle
+        updates.append({"id": actor_id, "skeleton": value})
+
+    conn.execute(sa.text("UPDATE actors SET handle_skeleton = NULL"))
+    if updates:
+        conn.execute(
+            sa.text("UPDATE actors SET handle_skeleton = :skeleton WHERE id = :id"),
+            updates,
+        )
+
+
+def upgrade() -> None:
+    _backfill(skeleton)
+
+
+def downgrade() -> None:
+    _backfill(skeleton_006)
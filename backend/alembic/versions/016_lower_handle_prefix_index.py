@@ -0,0 +1,28 @@
+"""Case-insensitive handle prefix index for autocomplete
+
+Autocomplete lowercases the query, so the handle prefix stage matches
+lower(handle); rebuild idx_actors_handle_prefix on that expression.
+
+Revision ID: 016
+Revises: 015
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+revision: str = "016"
+down_revision: Union[str, None] = "015"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS idx_actors_handle_prefix")
+    op.execute('CREATE INDEX idx_actors_handle_prefix ON actors (lower(handle) COLLATE "C")')
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS idx_actors_handle_prefix")
+    op.execute('CREATE INDEX idx_actors_handle_prefix ON actors (handle COLLATE "C")')
@@ -0,0 +1,65 @@
+"""Record mute/ban expiry apart from reversals
+
+Expired actions were marked is_reversed with no reversed_by_id. They get
+expired_at instead; is_reversed is left to moderators overturning an
+action. Rows the scheduler lifted are told apart from reversals by an
+empty reversed_by_id and a reversed_at at or after their deadline.
+
+Revision ID: 017
+Revises: 016
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "017"
+down_revision: Union[str, None] = "016"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _create_indexes(in_force: str) -> None:
+    op.create_index(
+        "idx_mod_actions_expiry",
+        "moderation_actions",
+        ["expires_at"],
+        postgresql_where=sa.text(f"expires_at IS NOT NULL AND {in_force}"),
+    )
+    op.create_index(
+        "idx_mod_actions_restrictions",
+        "moderation_actions",
+        ["target_author_id"],
+        postgresql_where=sa.text(f"action IN ('mute', 'ban') AND {in_force}"),
+    )
+
+
+def _drop_indexes() -> None:
+    op.drop_index("idx_mod_actions_restrictions", table_name="moderation_actions")
+    op.drop_index("idx_mod_actions_expiry", table_name="moderation_actions")
+
+
+def upgrade() -> None:
+    op.add_column("moderation_actions", sa.Column("expired_at", sa.DateTime(timezone=True), nullable=True))
+    op.execute("""
+        UPDATE moderation_actions
+        SET expired_at = reversed_at, is_reversed = false, reversed_at = NULL
+        WHERE is_reversed AND reversed_by_id IS NULL
+          AND expires_at IS NOT NULL AND reversed_at >= expires_at
+    """)
+
+    _drop_indexes()
+    _create_indexes("is_reversed = false AND expired_at IS NULL")
+
+
+def downgrade() -> None:
+    op.execute("""
+        UPDATE moderation_actions
+        SET is_reversed = true, reversed_at = expired_at, reversed_by_id = NULL
+        WHERE expired_at IS NOT NULL AND is_reversed = false
+    """)
+    _drop_indexes()
+    _create_indexes("is_reversed = false")
+    op.drop_column("moderation_actions", "expired_at")
@@ -0,0 +1,52 @@
+import structlog
+from fastapi import Request
+from starlette.middleware.base import BaseHTTPMiddleware
+
+from app.core.config import settings
+from app.core.query_stats import begin_request_stats
+from app.core.slow_queries import normalize_route
+
+logger = structlog.get_logger()
+
+
+class QueryStatsMiddleware(BaseHTTPMiddleware):
+    """
+    Report per-request SQL statement counts and DB time.
+    Dev: Server-Timing header. Prod: structured log fields.
+    Never exposes SQL text in responses.
+    """
+
+    async def dispatch(self, request: Request, call_next):
+        stats = begin_request_stats(normalize_route(request.url.path))
+        response = await call_next(request)
+
+        if stats.count == 0:
+            return response
+
+        n_plus_one = stats.max_repeat >= settings.query_stats_n_plus_one_threshold
+
+        if settings.is_dev:
+            response.headers["Server-Timing"] = (
+                f'db;dur={stats.total_ms:.1f};'
+                f'desc="{stats.count} statements, {len(stats.duplicates)} repeated shapes"'
+            )
+
+        logger.info(
+            "request_query_stats",
+            method=request.method,
+            path=request.url.path,
+            statements=stats.count,
+            db_ms=round(stats.total_ms, 1),
+            repeated_shapes=len(stats.duplicates),
+            max_repeat=stats.max_repeat,
+        )
+        if n_plus_one:
+            worst_shape, worst_count = stats.shapes.most_common(1)[0]
+            logger.warning(
+                "n_plus_one_suspected",
+                method=request.method,
+                path=request.url.path,
+                repeat=worst_count,
+                statement_shape=worst_shape,
+            )
+        return response
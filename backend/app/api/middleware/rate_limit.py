@@ -0,0 +1,75 @@
+import structlog
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.rate_limiter import client_ip_from_headers, credential_principal, lookup_principal
+from app.core.rate_policies import get_policy_table
+from app.core.redis_client import RedisUnavailable
+from app.core.security import credential_from_headers
+
+logger = structlog.get_logger()
+
+
+class RateLimitMiddleware:
+    """
+    Enforce the central rate-limit policy table as pure ASGI, before the
+    request body is read, dependencies resolve or a DB session opens.
+
+    Actor-keyed policies identify the caller from the principal cache
+    (written on successful authentication), or from the credential itself
+    when it is not cached yet (see credential_principal); only requests
+    without a usable credential share the per-IP limit. Nothing here
+    authenticates the caller.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        limiter = get_policy_table().match(scope["method"], scope["path"])
+        if limiter is None:
+            await self.app(scope, receive, send)
+            return
+
+        headers = Headers(scope=scope)
+        client = scope.get("client")
+        client_ip = client_ip_from_headers(headers, client[0] if client else None)
+
+        principal = None
+        if limiter.per_actor:
+            credential = credential_from_headers(headers)
+            if credential is not None:
+                try:
+                    principal = await lookup_principal(credential)
+                except RedisUnavailable:
+                    pass
+                except Exception as e:
+                    logger.warning("principal_cache_read_failed", error=str(e))
+                if principal is None:
+                    principal = credential_principal(credential)
+
+        allowed, limit_headers = await limiter.check(client_ip, principal)
+        if not allowed:
+            response = JSONResponse(
+                status_code=429,
+                content={"detail": "Too many requests. Please try again later."},
+                headers=limit_headers,
+            )
+            await response(scope, receive, send)
+            return
+
+        if not limit_headers:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_headers(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message).update(limit_headers)
+            await send(message)
+
+        await self.app(scope, receive, send_with_headers)
@@ -1,23 +1,29 @@
+import asyncio
 import uuid
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 from typing import Optional
 
-from fastapi import Depends, Header, HTTPException, status
+import structlog
+from fastapi import Depends, Header, HTTPException, Request, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from sqlalchemy import select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import settings
-from app.core.constants import ActorRole, ActorType, API_KEY_PREFIX
-from app.core.database import get_db
+from app.core.constants import ActorRole, ActorType, API_KEY_PREFIX, API_KEY_TOUCH_INTERVAL_SECONDS
+from app.core.database import LazySession, async_session_factory, get_lazy_session
+from app.core.rate_limiter import remember_principal
 from app.core.security import decode_token, hash_api_key
 from app.models.actor import Actor, AgentApiKey
 
+logger = structlog.get_logger()
+
 security_scheme = HTTPBearer(auto_error=False)
 
 
 async def get_current_actor(
-    db: AsyncSession = Depends(get_db),
+    request: Request,
+    lazy: LazySession = Depends(get_lazy_session),
     credentials: Optional[HTTPAuthorizationCredentials] = Depends(security_scheme),
     x_agent_key: Optional[str] = Header(None),
 ) -> Actor:
@@ -25,18 +31,11 @@ async def get_current_actor(
     Resolve the current actor from either:
     1. JWT Bearer token (humans + council)
     2. API key via X-Agent-Key header or Bearer token with cg_live_ prefix (agents)
-    """
-    actor: Optional[Actor] = None
 
-    # Check for API key in X-Agent-Key header first
-    api_key = x_agent_key
-    if not api_key and credentials and credentials.credentials.startswith(API_KEY_PREFIX):
-        api_key = credentials.credentials
-
-    if api_key:
-        actor = await _resolve_api_key(db, api_key)
-    elif credentials:
-        actor = await _resolve_jwt(db, credentials.credentials)
+    Resolved on the request's shared session: the read session on GETs,
+    the primary (the one get_db hands out) otherwise.
+    """
+    actor = await _authenticate_lazy(lazy, credentials, x_agent_key)
 
     if actor is None:
         raise HTTPException(
@@ -51,20 +50,79 @@ async def get_current_actor(
             detail="Account is deactivated.",
         )
 
+    await _track_actor(request, credentials, x_agent_key, actor)
     return actor
 
 
 async def get_optional_actor(
-    db: AsyncSession = Depends(get_db),
+    request: Request,
+    lazy: LazySession = Depends(get_lazy_session),
     credentials: Optional[HTTPAuthorizationCredentials] = Depends(security_scheme),
     x_agent_key: Optional[str] = Header(None),
 ) -> Optional[Actor]:
-    """Same as get_current_actor but returns None instead of 401."""
-    try:
-        return await get_current_actor(db, credentials, x_agent_key)
-    except HTTPException:
+    """
+    Same as get_current_actor but returns None instead of 401/403.
+
+    Anonymous requests return immediately: no session is opened and no
+    connection is checked out. When credentials are present, the request's
+    shared session is created on demand, so get_db / get_read_db reuse it.
+    """
+    if not x_agent_key and not credentials:
         return None
 
+    actor = await _authenticate_lazy(lazy, credentials, x_agent_key)
+    if actor is None or not actor.is_active:
+        return None
+
+    await _track_actor(request, credentials, x_agent_key, actor)
+    return actor
+
+
+async def _authenticate_lazy(
+    lazy: LazySession,
+    credentials: Optional[HTTPAuthorizationCredentials],
+    x_agent_key: Optional[str],
+) -> Optional[Actor]:
+    actor = await _authenticate(lazy.auth_session, credentials, x_agent_key)
+    if actor is None and lazy.reads_from_replica and lazy.auth_session is lazy.read_session:
+        # An actor or key created moments ago may not have replicated yet.
+        actor = await _authenticate(lazy.session, credentials, x_agent_key)
+    return actor
+
+
+async def _authenticate(
+    db: AsyncSession,
+    credentials: Optional[HTTPAuthorizationCredentials],
+    x_agent_key: Optional[str],
+) -> Optional[Actor]:
+    """Resolve an actor from whichever credential was supplied, if any."""
+    # Check for API key in X-Agent-Key header first
+    api_key = x_agent_key
+    if not api_key and credentials and credentials.credentials.startswith(API_KEY_PREFIX):
+        api_key = credentials.credentials
+
+    if api_key:
+        return await _resolve_api_key(db, api_key)
+    if credentials:
+        return await _resolve_jwt(db, credentials.credentials)
+    return None
+
+
+async def _track_actor(
+    request: Request,
+    credentials: Optional[HTTPAuthorizationCredentials],
+    x_agent_key: Optional[str],
+    actor: Actor,
+) -> None:
+    """
+    Expose the resolved actor to later dependencies (e.g. rate limiting) and
+    cache it against the credential so they can identify the caller
+    without a DB query on future requests.
+    """
+    request.state.actor = actor
+    credential = x_agent_key or credentials.credentials
+    await remember_principal(credential, str(actor.id), actor.trust_score)
+
 
 async def _resolve_jwt(db: AsyncSession, token: str) -> Optional[Actor]:
     """Resolve actor from JWT token."""
@@ -105,17 +163,42 @@ async def _resolve_api_key(db: AsyncSession, key: str) -> Optional[Actor]:
     if api_key.expires_at and api_key.expires_at < datetime.now(timezone.utc):
         return None
 
-    # Update last_used_at
-    await db.execute(
-        update(AgentApiKey)
-        .where(AgentApiKey.id == api_key.id)
-        .values(last_used_at=datetime.now(timezone.utc))
-    )
+    await _touch_api_key(db, api_key)
 
     result = await db.execute(select(Actor).where(Actor.id == api_key.actor_id))
     return result.scalar_one_or_none()
 
 
+async def _touch_api_key(db: AsyncSession, api_key: AgentApiKey) -> None:
+    """
+    Update last_used_at, at most once per API_KEY_TOUCH_INTERVAL_SECONDS.
+    A read-only session can't write it, so there the update runs on a
+    short primary session after the response instead.
+    """
+    now = datetime.now(timezone.utc)
+    if api_key.last_used_at and now - api_key.last_used_at < timedelta(seconds=API_KEY_TOUCH_INTERVAL_SECONDS):
+        return
+    stmt = update(AgentApiKey).where(AgentApiKey.id == api_key.id).values(last_used_at=now)
+    if not db.info.get("read_only"):
+        await db.execute(stmt)
+        return
+    task = asyncio.create_task(_touch_on_primary(stmt))
+    _touch_tasks.add(task)
+    task.add_done_callback(_touch_tasks.discard)
+
+
+_touch_tasks: set[asyncio.Task] = set()
+
+
+async def _touch_on_primary(stmt) -> None:
+    try:
+        async with async_session_factory() as session:
+            await session.execute(stmt)
+            await session.commit()
+    except Exception as e:
+        logger.warning("api_key_touch_failed", error=str(e))
+
+
 def require_role(*roles: ActorRole):
     """Dependency that checks actor has one of the specified roles."""
     async def checker(actor: Actor = Depends(get_current_actor)) -> Actor:
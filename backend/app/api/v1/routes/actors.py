@@ -3,7 +3,7 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.v1.deps import get_current_actor
-from app.core.database import get_db
+from app.core.database import get_db, get_read_db
 from app.models.actor import Actor
 from app.schemas.actor import (
     ActorDetailPublic,
@@ -81,7 +81,7 @@ async def update_me(
 @router.get("/{handle}", response_model=ActorDetailPublic)
 async def get_actor(
     handle: str,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """Get a public actor profile by handle."""
     result = await db.execute(
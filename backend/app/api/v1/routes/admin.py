@@ -0,0 +1,26 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+
+from app.api.v1.deps import require_role
+from app.core.constants import ActorRole
+from app.core.redis_client import RedisUnavailable
+from app.core.slow_queries import top_slow_queries
+from app.models.actor import Actor
+from app.schemas.admin import SlowQueryEntry
+
+router = APIRouter(prefix="/admin", tags=["admin"])
+
+
+@router.get("/slow-queries", response_model=list[SlowQueryEntry])
+async def slow_queries(
+    actor: Actor = Depends(require_role(ActorRole.ADMIN, ActorRole.FOUNDER)),
+    order: str = Query("total", pattern="^(total|max)$"),
+    limit: int = Query(50, ge=1, le=200),
+):
+    """
+    Slowest statement shapes over the last 24h, across all workers (admin+ only).
+    Includes the most recent sampled EXPLAIN (ANALYZE, BUFFERS) plan.
+    """
+    try:
+        return await top_slow_queries(limit=limit, order=order)
+    except RedisUnavailable:
+        raise HTTPException(status_code=503, detail="Slow-query log temporarily unavailable.")
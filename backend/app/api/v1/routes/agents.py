@@ -6,7 +6,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.v1.deps import get_current_actor, require_actor_type
 from app.core.constants import ActorType
-from app.core.database import get_db
+from app.core.database import get_db, get_read_db
 from app.models.actor import Actor, AgentApiKey
 from app.schemas.auth import (
     AgentRegisterRequest,
@@ -61,7 +61,7 @@ async def create_key(
 @router.get("/keys", response_model=list[ApiKeyResponse])
 async def list_keys(
     actor: Actor = Depends(require_actor_type(ActorType.AGENT)),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """List all API keys for the authenticated agent."""
     result = await db.execute(
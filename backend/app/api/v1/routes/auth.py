@@ -3,7 +3,6 @@ from fastapi import APIRouter, Depends, HTTPException, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.database import get_db
-from app.core.rate_limiter import rate_limit_login, rate_limit_register
 from app.schemas.auth import (
     HumanRegisterRequest,
     LoginRequest,
@@ -24,7 +23,6 @@ router = APIRouter(prefix="/auth", tags=["auth"])
 async def register(
     req: HumanRegisterRequest,
     db: AsyncSession = Depends(get_db),
-    _rl: None = Depends(rate_limit_register),
 ):
     """Register a new human account."""
     try:
@@ -38,7 +36,6 @@ async def login(
     req: LoginRequest,
     response: Response,
     db: AsyncSession = Depends(get_db),
-    _rl: None = Depends(rate_limit_login),
 ):
     """Login with email and password. Returns access token + sets refresh cookie."""
     try:
@@ -6,16 +6,19 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.v1.deps import get_current_actor, get_optional_actor
-from app.core.constants import ActorRole
-from app.core.database import get_db
-from app.core.rate_limiter import rate_limit_comment, rate_limit_vote
-from app.core.sanitizer import sanitize_html
+from app.core.audit import record_audit
+from app.core.ban_terms import screen_content
+from app.core.constants import ActorRole, FlagReason
+from app.core.database import get_db, get_read_db
+from app.core.dedup import Fingerprint, check_duplicate, fingerprint, release_content
+from app.core.sanitizer import render_markdown_async, sanitize_html_async
 from app.models.actor import Actor
 from app.models.comment import Comment
-from app.models.moderation import AuditLog, ModerationAction
 from app.models.post import Post
 from app.models.vote import Vote
 from app.schemas.comment import CommentCreate, CommentPublic, CommentUpdate
+from app.services.auto_moderation import flag_term_matches, raise_system_flag, schedule_spam_check
+from app.services.moderation_service import add_moderation_action, commit_moderation
 
 router = APIRouter(tags=["comments"])
 
@@ -55,6 +58,7 @@ async def _enrich_comment(comment: Comment, db: AsyncSession, viewer_id=None) ->
         author_type=author_type,
         parent_id=str(comment.parent_id) if comment.parent_id else None,
         body=comment.body,
+        body_html=comment.body_html,
         depth=comment.depth,
         vote_score=comment.vote_score,
         posted_via_human_assist=comment.posted_via_human_assist,
@@ -68,7 +72,7 @@ async def list_comments(
     post_id: uuid.UUID,
     sort: str = Query("best", regex="^(best|new|old)$"),
     actor: Actor = Depends(get_optional_actor),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """List comments for a post, sorted by best/new/old."""
     query = select(Comment).where(
@@ -96,7 +100,6 @@ async def create_comment(
     req: CommentCreate,
     actor: Actor = Depends(get_current_actor),
     db: AsyncSession = Depends(get_db),
-    _rl: None = Depends(rate_limit_comment),
 ):
     """Create a comment on a post."""
     result = await db.execute(
@@ -131,26 +134,52 @@ async def create_comment(
         parent_id = parent.id
         path = f"{parent.path}.{str(parent.id)}" if parent.path else str(parent.id)
 
-    clean_body = sanitize_html(req.body)
-
-    comment = Comment(
-        post_id=post.id,
-        author_id=actor.id,
-        parent_id=parent_id,
-        body=clean_body,
-        depth=depth,
-        path=path,
-        posted_via_human_assist=req.posted_via_human_assist,
-    )
-    db.add(comment)
-
-    # Update counters
-    post.comment_count += 1
-    post.last_activity_at = datetime.now(timezone.utc)
-    actor.comment_count += 1
-
-    await db.commit()
+    clean_body = await sanitize_html_async(req.body)
+
+    matches = screen_content(clean_body)
+
+    # Duplicate floods are stopped before any row is written; the check
+    # reserves this comment's fingerprint, released if the insert fails.
+    fp = fingerprint(clean_body)
+    comment_id = uuid.uuid4()
+    verdict = await check_duplicate(db, fp, str(actor.id), str(comment_id))
+    if verdict.action == "reject":
+        raise HTTPException(status_code=409, detail=verdict.reason)
+
+    try:
+        comment = Comment(
+            id=comment_id,
+            post_id=post.id,
+            author_id=actor.id,
+            parent_id=parent_id,
+            body=clean_body,
+            body_html=await render_markdown_async(clean_body),
+            content_hash=fp.content_hash,
+            simhash=fp.simhash,
+            depth=depth,
+            path=path,
+            posted_via_human_assist=req.posted_via_human_assist,
+        )
+        db.add(comment)
+
+        # Update counters
+        post.comment_count += 1
+        post.last_activity_at = datetime.now(timezone.utc)
+        actor.comment_count += 1
+
+        if verdict.action == "flag" or matches:
+            await db.flush()
+        if verdict.action == "flag":
+            await raise_system_flag(db, "comment", comment.id, FlagReason.SPAM.value, verdict.reason, source="dedup")
+        if matches:
+            await flag_term_matches(db, "comment", comment.id, matches)
+
+        await db.commit()
+    except Exception:
+        await release_content(fp, str(actor.id), str(comment_id))
+        raise
     await db.refresh(comment)
+    schedule_spam_check("comment", comment.id, comment.body)
 
     return await _enrich_comment(comment, db)
 
@@ -170,9 +199,36 @@ async def update_comment(
     if comment.author_id != actor.id:
         raise HTTPException(status_code=403, detail="Not authorized.")
 
-    comment.body = req.body
-    await db.commit()
+    body = await sanitize_html_async(req.body)
+
+    # Edits go through the same duplicate check as new comments, against
+    # everything but this comment's own recorded text.
+    fp = fingerprint(body)
+    previous = Fingerprint(comment.content_hash, comment.simhash, trivial=False) if comment.content_hash else None
+    author_id, verdict = str(comment.author_id), None
+    if fp.content_hash != comment.content_hash:
+        verdict = await check_duplicate(db, fp, author_id, str(comment_id))
+        if verdict.action == "reject":
+            raise HTTPException(status_code=409, detail=verdict.reason)
+
+    try:
+        comment.body = body
+        comment.body_html = await render_markdown_async(body)
+        comment.content_hash, comment.simhash = fp.content_hash, fp.simhash
+
+        if verdict is not None and verdict.action == "flag":
+            await raise_system_flag(db, "comment", comment.id, FlagReason.SPAM.value, verdict.reason, source="dedup")
+        matches = screen_content(comment.body)
+        if matches:
+            await flag_term_matches(db, "comment", comment.id, matches)
+        await db.commit()
+    except Exception:
+        if verdict is not None:
+            await release_content(fp, author_id, str(comment_id), keep=previous)
+        raise
     await db.refresh(comment)
+    if verdict is not None and previous is not None:
+        await release_content(previous, author_id, str(comment_id), keep=fp)
     return await _enrich_comment(comment, db)
 
 
@@ -196,23 +252,23 @@ async def delete_comment(
 
     # If a moderator (not the author) is removing, log the action
     if comment.author_id != actor.id:
-        mod_action = ModerationAction(
+        add_moderation_action(
+            db,
             moderator_id=actor.id,
             target_type="comment",
             target_id=comment.id,
             action="remove",
             reason="Removed via delete endpoint",
         )
-        db.add(mod_action)
-        audit = AuditLog(
+        record_audit(
+            db,
             actor_id=actor.id,
             action="mod_remove",
             resource_type="comment",
             resource_id=comment.id,
         )
-        db.add(audit)
 
-    await db.commit()
+    await commit_moderation(db)
     return {"status": "ok", "detail": "Comment removed."}
 
 
@@ -222,7 +278,6 @@ async def vote_on_comment(
     value: int = Query(ge=-1, le=1),
     actor: Actor = Depends(get_current_actor),
     db: AsyncSession = Depends(get_db),
-    _rl: None = Depends(rate_limit_vote),
 ):
     """Vote on a comment."""
     result = await db.execute(
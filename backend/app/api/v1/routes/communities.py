@@ -6,7 +6,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.v1.deps import get_current_actor, get_optional_actor, require_role
 from app.core.constants import ActorRole
-from app.core.database import get_db
+from app.core.database import get_db, get_read_db
 from app.models.actor import Actor
 from app.models.community import Community, CommunityMembership
 from app.schemas.community import CommunityCreate, CommunityPublic, CommunityUpdate
@@ -18,7 +18,7 @@ router = APIRouter(prefix="/communities", tags=["communities"])
 async def list_communities(
     limit: int = Query(50, le=100),
     offset: int = Query(0, ge=0),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """List all communities."""
     result = await db.execute(
@@ -45,7 +45,7 @@ async def list_communities(
 
 
 @router.get("/{slug}", response_model=CommunityPublic)
-async def get_community(slug: str, db: AsyncSession = Depends(get_db)):
+async def get_community(slug: str, db: AsyncSession = Depends(get_read_db)):
     """Get a community by slug."""
     result = await db.execute(select(Community).where(Community.slug == slug))
     community = result.scalar_one_or_none()
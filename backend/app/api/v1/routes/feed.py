@@ -8,7 +8,8 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.v1.deps import get_optional_actor
 from app.core.constants import FeedSort, TimePeriod
-from app.core.database import get_db
+from app.core.database import get_read_db
+from app.core.sanitizer import render_markdown_async
 from app.models.actor import Actor
 from app.models.community import Community
 from app.models.post import Post
@@ -25,10 +26,15 @@ async def get_feed(
     community: str = Query(None),
     limit: int = Query(25, le=50),
     offset: int = Query(0, ge=0),
+    body_format: str = Query("markdown", regex="^(markdown|html|both)$"),
     actor: Actor = Depends(get_optional_actor),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
-    """Get the feed. Supports sorting, filtering by community, and pagination."""
+    """
+    Get the feed. Supports sorting, filtering by community, and pagination.
+    body_format picks the body representation: raw Markdown (`body`),
+    server-rendered sanitized HTML (`body_html`), or both.
+    """
     query = select(Post).where(Post.is_removed == False)
 
     # Filter by community
@@ -102,6 +108,12 @@ async def get_feed(
             if vote:
                 viewer_vote = vote.value
 
+        body_html = None
+        if body_format != "markdown":
+            # Rows written before rendering existed render until backfilled,
+            # off the event loop like every other render.
+            body_html = post.body_html or await render_markdown_async(post.body)
+
         enriched.append(PostPublic(
             id=str(post.id),
             community_id=str(post.community_id),
@@ -111,7 +123,8 @@ async def get_feed(
             author_display_name=author_display_name,
             author_type=author_type,
             title=post.title,
-            body=post.body,
+            body=post.body if body_format != "html" else None,
+            body_html=body_html,
             post_type=post.post_type,
             link_url=post.link_url,
             is_pinned=post.is_pinned,
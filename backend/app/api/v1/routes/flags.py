@@ -2,24 +2,31 @@ import uuid
 from datetime import datetime, timezone
 
 from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy import select, func as sa_func
+from sqlalchemy import and_, func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 import structlog
 
 from app.api.v1.deps import get_current_actor, require_role
+from app.core.audit import record_audit
 from app.core.config import settings
 from app.core.constants import ActorRole, FlagStatus
-from app.core.database import get_db
+from app.core.database import get_db, get_read_db
 
 logger = structlog.get_logger()
-from app.core.rate_limiter import rate_limit_flag
 from app.models.actor import Actor
 from app.models.comment import Comment
-from app.models.flag import Flag
-from app.models.moderation import AuditLog
+from app.models.flag import Flag, FlagTarget
 from app.models.post import Post
-from app.schemas.flag import FlagCreate, FlagPublic, FlagUpdate
+from app.schemas.flag import (
+    FlagBulkResult,
+    FlagBulkUpdate,
+    FlagCreate,
+    FlagPublic,
+    FlagTargetPublic,
+    FlagUpdate,
+)
+from app.services.flag_service import apply_flag, resolve_flags
 
 router = APIRouter(prefix="/flags", tags=["flags"])
 
@@ -27,10 +34,11 @@ router = APIRouter(prefix="/flags", tags=["flags"])
 async def _enrich_flag(flag: Flag) -> FlagPublic:
     """Build FlagPublic from a Flag with reporter info."""
     reporter = flag.reporter
+    automated = flag.reporter_id is None
     return FlagPublic(
         id=str(flag.id),
-        reporter_handle=reporter.handle if reporter else "unknown",
-        reporter_type=reporter.actor_type if reporter else "unknown",
+        reporter_handle=reporter.handle if reporter else ("system" if automated else "unknown"),
+        reporter_type=reporter.actor_type if reporter else ("system" if automated else "unknown"),
         target_type=flag.target_type,
         target_id=str(flag.target_id),
         reason=flag.reason,
@@ -46,7 +54,6 @@ async def create_flag(
     req: FlagCreate,
     actor: Actor = Depends(get_current_actor),
     db: AsyncSession = Depends(get_db),
-    _rl: None = Depends(rate_limit_flag),
 ):
     """Flag content for moderator review."""
     target_uuid = uuid.UUID(req.target_id)
@@ -84,37 +91,30 @@ async def create_flag(
         reason=req.reason,
         details=req.details,
         status=FlagStatus.PENDING.value,
+        reporter_trust=actor.trust_score,
     )
     db.add(flag)
 
     # Audit log
-    audit = AuditLog(
+    record_audit(
+        db,
         actor_id=actor.id,
         action="flag_created",
         resource_type=req.target_type,
         resource_id=target_uuid,
         details={"reason": req.reason},
     )
-    db.add(audit)
 
-    await db.flush()
-
-    # ── Auto-hide: count pending flags for this target ──────────────
-    flag_count_result = await db.execute(
-        select(sa_func.count(Flag.id)).where(
-            Flag.target_type == req.target_type,
-            Flag.target_id == target_uuid,
-            Flag.status == FlagStatus.PENDING.value,
-        )
-    )
-    flag_count = flag_count_result.scalar() or 0
+    # ── Auto-hide: O(1) pending-flag counter for this target ────────
+    flag_count = await apply_flag(db, flag, 1)
 
     if flag_count >= settings.flag_threshold_hide and not target.is_removed:
         target.is_removed = True
         auto_action = "auto_hide"
         if flag_count >= settings.flag_threshold_remove:
             auto_action = "auto_remove"
-        db.add(AuditLog(
+        record_audit(
+            db,
             actor_id=actor.id,
             action=auto_action,
             resource_type=req.target_type,
@@ -124,7 +124,7 @@ async def create_flag(
                 "flag_count": flag_count,
                 "threshold": settings.flag_threshold_hide,
             },
-        ))
+        )
         logger.info(
             "auto_hide_triggered",
             target_type=req.target_type,
@@ -141,7 +141,7 @@ async def create_flag(
 @router.get("/mine", response_model=list[FlagPublic])
 async def my_flags(
     actor: Actor = Depends(get_current_actor),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     limit: int = Query(25, ge=1, le=100),
     offset: int = Query(0, ge=0),
 ):
@@ -160,7 +160,7 @@ async def my_flags(
 @router.get("/queue", response_model=list[FlagPublic])
 async def flag_queue(
     actor: Actor = Depends(require_role(ActorRole.MODERATOR, ActorRole.ADMIN, ActorRole.FOUNDER)),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     status: str = Query("pending", pattern="^(pending|reviewed|actioned|dismissed)$"),
     limit: int = Query(25, ge=1, le=100),
     offset: int = Query(0, ge=0),
@@ -177,6 +177,75 @@ async def flag_queue(
     return [await _enrich_flag(f) for f in flags]
 
 
+@router.get("/queue/targets", response_model=list[FlagTargetPublic])
+async def flag_target_queue(
+    actor: Actor = Depends(require_role(ActorRole.MODERATOR, ActorRole.ADMIN, ActorRole.FOUNDER)),
+    db: AsyncSession = Depends(get_read_db),
+    target_type: str | None = Query(None, pattern="^(post|comment)$"),
+    reason: str | None = Query(None, pattern="^(spam|harassment|misinformation|impersonation|crypto|violence|other)$"),
+    limit: int = Query(25, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+):
+    """
+    Moderation queue grouped by target, highest priority first.
+    Each entry aggregates the target's pending flags; priority weighs
+    each flag by reason severity and reporter trust (see flag_service).
+    """
+    query = (
+        select(
+            FlagTarget,
+            func.coalesce(Post.title, func.left(Comment.body, 200)).label("preview"),
+            func.coalesce(Post.is_removed, Comment.is_removed, False).label("is_removed"),
+            Actor.handle.label("author_handle"),
+        )
+        .outerjoin(Post, and_(FlagTarget.target_type == "post", Post.id == FlagTarget.target_id))
+        .outerjoin(Comment, and_(FlagTarget.target_type == "comment", Comment.id == FlagTarget.target_id))
+        .outerjoin(Actor, Actor.id == func.coalesce(Post.author_id, Comment.author_id))
+        .where(FlagTarget.pending_count > 0)
+        .order_by(FlagTarget.priority.desc(), FlagTarget.last_flagged_at)
+        .limit(limit)
+        .offset(offset)
+    )
+    if target_type:
+        query = query.where(FlagTarget.target_type == target_type)
+    if reason:
+        query = query.where(FlagTarget.reason_counts[reason].as_integer() > 0)
+
+    result = await db.execute(query)
+    return [
+        FlagTargetPublic(
+            target_type=row.FlagTarget.target_type,
+            target_id=str(row.FlagTarget.target_id),
+            pending_count=row.FlagTarget.pending_count,
+            reasons={r: n for r, n in row.FlagTarget.reason_counts.items() if n > 0},
+            avg_reporter_trust=round(row.FlagTarget.reporter_trust_sum / row.FlagTarget.pending_count, 2),
+            priority=round(row.FlagTarget.priority, 2),
+            preview=row.preview,
+            author_handle=row.author_handle,
+            is_removed=row.is_removed,
+            last_flagged_at=row.FlagTarget.last_flagged_at.isoformat() if row.FlagTarget.last_flagged_at else None,
+        )
+        for row in result
+    ]
+
+
+@router.post("/bulk", response_model=FlagBulkResult)
+async def bulk_update_flags(
+    req: FlagBulkUpdate,
+    actor: Actor = Depends(require_role(ActorRole.MODERATOR, ActorRole.ADMIN, ActorRole.FOUNDER)),
+    db: AsyncSession = Depends(get_db),
+):
+    """Set the status of many flags in one transaction (moderator action)."""
+    try:
+        flag_ids = [uuid.UUID(f) for f in req.flag_ids]
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid flag id.")
+
+    updated = await resolve_flags(db, req.status, actor.id, flag_ids=flag_ids)
+    await db.commit()
+    return FlagBulkResult(status=req.status, updated=updated)
+
+
 @router.patch("/{flag_id}", response_model=FlagPublic)
 async def update_flag(
     flag_id: uuid.UUID,
@@ -190,19 +259,23 @@ async def update_flag(
     if not flag:
         raise HTTPException(status_code=404, detail="Flag not found.")
 
+    delta = (req.status == FlagStatus.PENDING.value) - (flag.status == FlagStatus.PENDING.value)
+    if delta:
+        await apply_flag(db, flag, delta)
+
     flag.status = req.status
     flag.reviewer_id = actor.id
     flag.reviewed_at = datetime.now(timezone.utc)
 
     # Audit log
-    audit = AuditLog(
+    record_audit(
+        db,
         actor_id=actor.id,
         action=f"flag_{req.status}",
         resource_type="flag",
         resource_id=flag.id,
         details={"target_type": flag.target_type, "target_id": str(flag.target_id)},
     )
-    db.add(audit)
 
     await db.commit()
     await db.refresh(flag)
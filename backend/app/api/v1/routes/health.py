@@ -4,7 +4,13 @@ from fastapi import APIRouter
 from sqlalchemy import text
 
 from app.core.config import settings
-from app.core.database import async_session_factory
+from app.core.database import (
+    async_session_factory,
+    engine,
+    replica_engine,
+    replica_session_factory,
+)
+from app.core.redis_client import RedisUnavailable, breaker_state, redis_client
 
 router = APIRouter()
 
@@ -21,8 +27,9 @@ async def health_check():
 
 @router.get("/ready")
 async def readiness_check():
-    """Readiness check - verifies DB connectivity."""
+    """Readiness check - verifies DB and Redis connectivity, replica lag and breaker state."""
     checks = {"database": "unknown"}
+    replica_lag_seconds = None
 
     try:
         async with async_session_factory() as session:
@@ -31,10 +38,37 @@ async def readiness_check():
     except Exception as e:
         checks["database"] = f"error: {str(e)}"
 
+    if replica_engine is not engine:
+        checks["replica"] = "unknown"
+        try:
+            async with replica_session_factory() as session:
+                result = await session.execute(text(
+                    "SELECT CASE WHEN pg_is_in_recovery() "
+                    "THEN EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()) "
+                    "ELSE 0 END"
+                ))
+                lag = result.scalar()
+                replica_lag_seconds = float(lag) if lag is not None else None
+                checks["replica"] = "connected"
+        except Exception as e:
+            checks["replica"] = f"error: {str(e)}"
+
+    checks["redis"] = "unknown"
+    try:
+        async with redis_client() as r:
+            await r.ping()
+        checks["redis"] = "connected"
+    except RedisUnavailable:
+        checks["redis"] = "circuit_open"
+    except Exception as e:
+        checks["redis"] = f"error: {str(e)}"
+
     all_ok = all(v == "connected" for v in checks.values())
 
     return {
         "status": "ok" if all_ok else "degraded",
         "timestamp": datetime.now(timezone.utc).isoformat(),
         "checks": checks,
+        "replica_lag_seconds": replica_lag_seconds,
+        "redis_breaker": breaker_state(),
     }
@@ -1,21 +1,43 @@
+import asyncio
+import json
 import uuid
 from datetime import datetime, timezone
 
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy import select
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy import select, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.v1.deps import get_current_actor, require_role
+from app.core.audit import record_audit
+from app.core.audit_partitions import search_archives
 from app.core.constants import (
-    ActorRole, ModAction,
+    ActorRole, ModAction, MOD_LOG_CACHE_TTL_SECONDS, MOD_LOG_CACHED_PAGES, MOD_LOG_PAGE_SIZE,
     TRUST_FLAG_ACTIONED, TRUST_WARNED, TRUST_MUTED, TRUST_MIN, TRUST_MAX,
 )
-from app.core.database import get_db
+from app.core.database import get_db, get_read_db
+from app.core.pagination import decode_signed_cursor, encode_signed_cursor
 from app.models.actor import Actor
 from app.models.comment import Comment
 from app.models.moderation import AuditLog, ModerationAction
 from app.models.post import Post
-from app.schemas.moderation import AuditEntry, ModActionCreate, ModActionPublic
+from app.schemas.moderation import (
+    AuditEntry,
+    ModActionBulkCreate,
+    ModActionBulkResult,
+    ModActionCreate,
+    ModActionPublic,
+)
+from app.services.moderation_service import (
+    RESTRICTING_ACTIONS,
+    add_moderation_action,
+    apply_bulk_action,
+    commit_moderation,
+    moderation_log_cache,
+    moderation_log_changed,
+    notify_expiry_scheduler,
+    reactivate_authors,
+    restriction_expiry,
+)
 
 router = APIRouter(prefix="/moderation", tags=["moderation"])
 
@@ -33,6 +55,8 @@ async def _enrich_mod_action(action: ModerationAction) -> ModActionPublic:
         reason=action.reason,
         duration_hours=action.duration_hours,
         is_reversed=action.is_reversed,
+        expires_at=action.expires_at.isoformat() if action.expires_at else None,
+        expired_at=action.expired_at.isoformat() if action.expired_at else None,
         created_at=action.created_at.isoformat(),
     )
 
@@ -105,7 +129,8 @@ async def take_action(
     flag_uuid = uuid.UUID(req.flag_id) if req.flag_id else None
 
     # Create moderation action record
-    mod_action = ModerationAction(
+    mod_action = add_moderation_action(
+        db,
         moderator_id=actor.id,
         target_type=req.target_type,
         target_id=target_uuid,
@@ -114,10 +139,15 @@ async def take_action(
         duration_hours=req.duration_hours,
         flag_id=flag_uuid,
     )
-    db.add(mod_action)
+    if req.action in RESTRICTING_ACTIONS and target_author:
+        mod_action.target_author_id = target_author.id
+        mod_action.expires_at = restriction_expiry(req.action, req.duration_hours)
+    if mod_action.expires_at is not None:
+        await notify_expiry_scheduler(db)
 
     # Audit log
-    audit = AuditLog(
+    record_audit(
+        db,
         actor_id=actor.id,
         action=f"mod_{req.action}",
         resource_type=req.target_type,
@@ -127,57 +157,266 @@ async def take_action(
             "target_author": target_author.handle if target_author else None,
         },
     )
-    db.add(audit)
 
-    await db.commit()
+    await commit_moderation(db)
     await db.refresh(mod_action)
 
     return await _enrich_mod_action(mod_action)
 
 
+@router.post("/actions/bulk", response_model=ModActionBulkResult)
+async def take_bulk_action(
+    req: ModActionBulkCreate,
+    actor: Actor = Depends(require_role(ActorRole.MODERATOR, ActorRole.ADMIN, ActorRole.FOUNDER)),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Apply one moderation action to many posts/comments in a single
+    transaction, e.g. remove everything an account posted since a time.
+    Pending flags on affected content are marked actioned unless
+    resolve_flags is false.
+    """
+    try:
+        targets = (
+            [(t.target_type, uuid.UUID(t.target_id)) for t in req.targets]
+            if req.targets is not None else None
+        )
+        author_id = uuid.UUID(req.author_id) if req.author_id else None
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid id.")
+    if author_id is not None:
+        result = await db.execute(select(Actor.id).where(Actor.id == author_id))
+        if result.scalar_one_or_none() is None:
+            raise HTTPException(status_code=404, detail="Actor not found.")
+
+    result = await apply_bulk_action(
+        db,
+        moderator_id=actor.id,
+        action=req.action,
+        reason=req.reason,
+        duration_hours=req.duration_hours,
+        targets=targets,
+        author_id=author_id,
+        since=req.since,
+        resolve_pending_flags=req.resolve_flags,
+    )
+    await commit_moderation(db)
+    return ModActionBulkResult(
+        action=req.action,
+        applied=result.applied,
+        authors_affected=result.authors_affected,
+        flags_resolved=result.flags_resolved,
+        truncated=result.truncated,
+    )
+
+
+# Lean projection for the public log: moderator handle/type only, none of
+# the ORM's joined relationships.
+_LOG_COLUMNS = (
+    ModerationAction.id,
+    ModerationAction.target_type,
+    ModerationAction.target_id,
+    ModerationAction.action,
+    ModerationAction.reason,
+    ModerationAction.duration_hours,
+    ModerationAction.is_reversed,
+    ModerationAction.expires_at,
+    ModerationAction.expired_at,
+    ModerationAction.created_at,
+    Actor.handle.label("moderator_handle"),
+    Actor.actor_type.label("moderator_type"),
+)
+
+
+def _log_query():
+    return (
+        select(*_LOG_COLUMNS)
+        .outerjoin(Actor, Actor.id == ModerationAction.moderator_id)
+        .order_by(ModerationAction.created_at.desc(), ModerationAction.id.desc())
+    )
+
+
+def _log_entry(row) -> ModActionPublic:
+    return ModActionPublic(
+        id=str(row.id),
+        moderator_handle=row.moderator_handle or "system",
+        moderator_type=row.moderator_type or "system",
+        target_type=row.target_type,
+        target_id=str(row.target_id),
+        action=row.action,
+        reason=row.reason,
+        duration_hours=row.duration_hours,
+        is_reversed=row.is_reversed,
+        expires_at=row.expires_at.isoformat() if row.expires_at else None,
+        expired_at=row.expired_at.isoformat() if row.expired_at else None,
+        created_at=row.created_at.isoformat(),
+    )
+
+
+def _log_body(rows: list[ModActionPublic]) -> bytes:
+    return json.dumps([r.model_dump(mode="json") for r in rows], separators=(",", ":")).encode()
+
+
+def _log_page(body: bytes, next_cursor: str) -> Response:
+    headers = {"Cache-Control": f"public, max-age={MOD_LOG_CACHE_TTL_SECONDS}"}
+    if next_cursor:
+        headers["X-Next-Cursor"] = next_cursor
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
 @router.get("/log", response_model=list[ModActionPublic])
 async def public_moderation_log(
-    db: AsyncSession = Depends(get_db),
-    target_type: str | None = Query(None, pattern="^(post|comment)$"),
-    limit: int = Query(25, ge=1, le=100),
-    offset: int = Query(0, ge=0),
+    db: AsyncSession = Depends(get_read_db),
+    target_type: str | None = Query(None, pattern="^(post|comment|actor)$"),
+    limit: int = Query(MOD_LOG_PAGE_SIZE, ge=1, le=100),
+    cursor: str | None = Query(None, max_length=200),
 ):
     """
     Public moderation log. No auth required.
     Anyone can view every moderation action ever taken.
-    """
-    query = select(ModerationAction).order_by(ModerationAction.created_at.desc())
 
+    Newest first. For the next page, pass the X-Next-Cursor response
+    header back as cursor; the header is absent on the last page.
+    """
+    page = 0
+    after = None
+    if cursor:
+        try:
+            created_at, action_id, page = decode_signed_cursor(cursor)
+            after = (datetime.fromisoformat(created_at), uuid.UUID(action_id))
+            page = int(page)
+        except (TypeError, ValueError):
+            raise HTTPException(status_code=400, detail="Invalid cursor.")
+
+    # The newest pages take nearly all traffic and change only when an
+    # action is taken (which invalidates them). Cursors are signed, so the
+    # variants are the server's own cursors for the first few pages of the
+    # default page size: at most 4 x MOD_LOG_CACHED_PAGES fields between
+    # invalidations, whatever clients send.
+    variant = f"{target_type or 'all'}:{cursor or ''}"
+    cacheable = page < MOD_LOG_CACHED_PAGES and limit == MOD_LOG_PAGE_SIZE
+    if cacheable:
+        cached = await moderation_log_cache.get(variant)
+        if cached is not None:
+            next_cursor, _, body = cached.partition(b"\n")
+            return _log_page(body, next_cursor.decode())
+
+    query = _log_query().limit(limit + 1)
     if target_type:
         query = query.where(ModerationAction.target_type == target_type)
+    if after:
+        query = query.where(tuple_(ModerationAction.created_at, ModerationAction.id) < after)
 
-    query = query.limit(limit).offset(offset)
+    rows = (await db.execute(query)).all()
+    next_cursor = ""
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_signed_cursor(last.created_at.isoformat(), last.id, page + 1)
 
-    result = await db.execute(query)
-    actions = result.scalars().all()
-    return [await _enrich_mod_action(a) for a in actions]
+    body = _log_body([_log_entry(row) for row in rows])
+    if cacheable:
+        await moderation_log_cache.put(variant, next_cursor.encode() + b"\n" + body)
+    return _log_page(body, next_cursor)
 
 
 @router.get("/log/{target_type}/{target_id}", response_model=list[ModActionPublic])
 async def target_moderation_history(
     target_type: str,
     target_id: uuid.UUID,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
-    """Public moderation history for a specific post or comment."""
-    if target_type not in ("post", "comment"):
-        raise HTTPException(status_code=400, detail="target_type must be 'post' or 'comment'.")
+    """Public moderation history for a specific post, comment or actor."""
+    if target_type not in ("post", "comment", "actor"):
+        raise HTTPException(status_code=400, detail="target_type must be 'post', 'comment' or 'actor'.")
 
     result = await db.execute(
-        select(ModerationAction)
-        .where(
+        _log_query().where(
             ModerationAction.target_type == target_type,
             ModerationAction.target_id == target_id,
         )
-        .order_by(ModerationAction.created_at.desc())
     )
-    actions = result.scalars().all()
-    return [await _enrich_mod_action(a) for a in actions]
+    return [_log_entry(row) for row in result.all()]
+
+
+@router.get("/audit", response_model=list[AuditEntry])
+async def audit_log(
+    actor: Actor = Depends(require_role(ActorRole.ADMIN, ActorRole.FOUNDER)),
+    db: AsyncSession = Depends(get_read_db),
+    action: str | None = Query(None, max_length=64),
+    resource_type: str | None = Query(None, max_length=32),
+    resource_id: uuid.UUID | None = None,
+    actor_id: uuid.UUID | None = None,
+    since: datetime | None = None,
+    until: datetime | None = None,
+    include_archived: bool = False,
+    limit: int = Query(100, ge=1, le=500),
+):
+    """
+    Audit trail, newest first (admin+ only). With include_archived, months
+    already moved out of Postgres are searched too; that scans the archive
+    files in the requested range, so narrow it with since/until.
+    """
+    since = since.replace(tzinfo=timezone.utc) if since and since.tzinfo is None else since
+    until = until.replace(tzinfo=timezone.utc) if until and until.tzinfo is None else until
+
+    query = select(AuditLog).order_by(AuditLog.created_at.desc()).limit(limit)
+    if action:
+        query = query.where(AuditLog.action == action)
+    if resource_type:
+        query = query.where(AuditLog.resource_type == resource_type)
+    if resource_id:
+        query = query.where(AuditLog.resource_id == resource_id)
+    if actor_id:
+        query = query.where(AuditLog.actor_id == actor_id)
+    if since:
+        query = query.where(AuditLog.created_at >= since)
+    if until:
+        query = query.where(AuditLog.created_at < until)
+
+    result = await db.execute(query)
+    entries = [
+        AuditEntry(
+            id=str(entry.id),
+            actor_handle=entry.actor.handle if entry.actor else None,
+            actor_type=entry.actor.actor_type if entry.actor else None,
+            action=entry.action,
+            resource_type=entry.resource_type,
+            resource_id=str(entry.resource_id) if entry.resource_id else None,
+            details=entry.details,
+            created_at=entry.created_at.isoformat(),
+        )
+        for entry in result.scalars().all()
+    ]
+
+    # Archived months all predate the live table, so they only fill the
+    # remainder of the page.
+    if include_archived and len(entries) < limit:
+        archived = await asyncio.to_thread(
+            search_archives,
+            since=since,
+            until=until,
+            action=action,
+            resource_type=resource_type,
+            resource_id=resource_id,
+            actor_id=actor_id,
+            limit=limit - len(entries),
+        )
+        entries += [
+            AuditEntry(
+                id=entry["id"],
+                actor_handle=entry["actor_handle"],
+                actor_type=entry["actor_type"],
+                action=entry["action"],
+                resource_type=entry["resource_type"],
+                resource_id=entry["resource_id"],
+                details=entry["details"],
+                created_at=entry["created_at"].isoformat(),
+                archived=True,
+            )
+            for entry in archived
+        ]
+    return entries
 
 
 @router.post("/actions/{action_id}/reverse", response_model=ModActionPublic)
@@ -197,11 +436,12 @@ async def reverse_action(
     if mod_action.is_reversed:
         raise HTTPException(status_code=400, detail="Action already reversed.")
 
-    # Undo the effect
+    # Undo the effect; bulk warn/mute/ban target the author ("actor")
+    target = None
     if mod_action.target_type == "post":
         result = await db.execute(select(Post).where(Post.id == mod_action.target_id))
         target = result.scalar_one_or_none()
-    else:
+    elif mod_action.target_type == "comment":
         result = await db.execute(select(Comment).where(Comment.id == mod_action.target_id))
         target = result.scalar_one_or_none()
 
@@ -215,29 +455,31 @@ async def reverse_action(
             if hasattr(target, "is_locked"):
                 target.is_locked = False
 
-        # Reactivate author if was muted/banned
-        if mod_action.action in (ModAction.MUTE.value, ModAction.BAN.value):
-            if target.author_id:
-                result = await db.execute(select(Actor).where(Actor.id == target.author_id))
-                author = result.scalar_one_or_none()
-                if author:
-                    author.is_active = True
-
     mod_action.is_reversed = True
     mod_action.reversed_by_id = actor.id
     mod_action.reversed_at = datetime.now(timezone.utc)
+    moderation_log_changed(db)
+
+    # Reactivate author if was muted/banned, unless another mute/ban
+    # still applies. An expired one can still be overturned for the
+    # record; the scheduler already lifted it.
+    if mod_action.action in RESTRICTING_ACTIONS and mod_action.expired_at is None:
+        author_id = mod_action.target_author_id or (target.author_id if target else None)
+        if author_id:
+            await db.flush()
+            await reactivate_authors(db, [author_id])
 
     # Audit log
-    audit = AuditLog(
+    record_audit(
+        db,
         actor_id=actor.id,
         action=f"mod_{mod_action.action}_reversed",
         resource_type=mod_action.target_type,
         resource_id=mod_action.target_id,
         details={"original_action_id": str(mod_action.id)},
     )
-    db.add(audit)
 
-    await db.commit()
+    await commit_moderation(db)
     await db.refresh(mod_action)
 
     return await _enrich_mod_action(mod_action)
@@ -6,16 +6,24 @@ from sqlalchemy import select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.v1.deps import get_current_actor, get_optional_actor, require_role
-from app.core.constants import ActorRole
-from app.core.database import get_db
-from app.core.rate_limiter import rate_limit_post, rate_limit_vote
-from app.core.sanitizer import sanitize_html, sanitize_plain_text, is_safe_url
+from app.core.audit import record_audit
+from app.core.ban_terms import screen_content
+from app.core.constants import ActorRole, FlagReason
+from app.core.database import get_db, get_read_db
+from app.core.dedup import Fingerprint, check_duplicate, fingerprint, release_content
+from app.core.sanitizer import (
+    is_safe_url,
+    render_markdown_async,
+    sanitize_html_async,
+    sanitize_plain_text,
+)
 from app.models.actor import Actor
 from app.models.community import Community
-from app.models.moderation import AuditLog, ModerationAction
 from app.models.post import Post
 from app.models.vote import Vote
 from app.schemas.post import PostCreate, PostDetail, PostPublic, PostUpdate
+from app.services.auto_moderation import flag_term_matches, raise_system_flag, schedule_spam_check
+from app.services.moderation_service import add_moderation_action, commit_moderation
 
 router = APIRouter(prefix="/posts", tags=["posts"])
 
@@ -66,6 +74,7 @@ async def _enrich_post(post: Post, db: AsyncSession, viewer_id=None) -> PostPubl
         author_type=author_type,
         title=post.title,
         body=post.body,
+        body_html=post.body_html,
         post_type=post.post_type,
         link_url=post.link_url,
         is_pinned=post.is_pinned,
@@ -84,7 +93,6 @@ async def create_post(
     req: PostCreate,
     actor: Actor = Depends(get_current_actor),
     db: AsyncSession = Depends(get_db),
-    _rl: None = Depends(rate_limit_post),
 ):
     """Create a new post."""
     # Validate URL if provided
@@ -101,26 +109,52 @@ async def create_post(
 
     # Sanitize input
     clean_title = sanitize_plain_text(req.title)
-    clean_body = sanitize_html(req.body) if req.body else None
-
-    post = Post(
-        community_id=community.id,
-        author_id=actor.id,
-        title=clean_title,
-        body=clean_body,
-        post_type=req.post_type,
-        link_url=req.link_url,
-        posted_via_human_assist=req.posted_via_human_assist,
-        last_activity_at=datetime.now(timezone.utc),
-    )
-    db.add(post)
-
-    # Update counters
-    community.post_count += 1
-    actor.post_count += 1
-
-    await db.commit()
+    clean_body = await sanitize_html_async(req.body) if req.body else None
+
+    matches = screen_content(clean_title, clean_body)
+
+    # Duplicate floods are stopped before any row is written; the check
+    # reserves this post's fingerprint, released if the insert fails.
+    fp = fingerprint(clean_title, clean_body)
+    post_id = uuid.uuid4()
+    verdict = await check_duplicate(db, fp, str(actor.id), str(post_id))
+    if verdict.action == "reject":
+        raise HTTPException(status_code=409, detail=verdict.reason)
+
+    try:
+        post = Post(
+            id=post_id,
+            community_id=community.id,
+            author_id=actor.id,
+            title=clean_title,
+            body=clean_body,
+            body_html=await render_markdown_async(clean_body),
+            content_hash=fp.content_hash,
+            simhash=fp.simhash,
+            post_type=req.post_type,
+            link_url=req.link_url,
+            posted_via_human_assist=req.posted_via_human_assist,
+            last_activity_at=datetime.now(timezone.utc),
+        )
+        db.add(post)
+
+        # Update counters
+        community.post_count += 1
+        actor.post_count += 1
+
+        if verdict.action == "flag" or matches:
+            await db.flush()
+        if verdict.action == "flag":
+            await raise_system_flag(db, "post", post.id, FlagReason.SPAM.value, verdict.reason, source="dedup")
+        if matches:
+            await flag_term_matches(db, "post", post.id, matches)
+
+        await db.commit()
+    except Exception:
+        await release_content(fp, str(actor.id), str(post_id))
+        raise
     await db.refresh(post)
+    schedule_spam_check("post", post.id, f"{post.title}\n\n{post.body or ''}")
 
     return await _enrich_post(post, db)
 
@@ -129,7 +163,7 @@ async def create_post(
 async def get_post(
     post_id: uuid.UUID,
     actor: Actor = Depends(get_optional_actor),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """Get a single post by ID."""
     result = await db.execute(
@@ -167,13 +201,47 @@ async def update_post(
     # (e.g., attacker sending is_pinned=true, vote_score=9999, author_id=...)
     ALLOWED_FIELDS = {"title", "body"}
     update_data = req.model_dump(exclude_unset=True)
+    changes = {}
     for field, value in update_data.items():
         if field not in ALLOWED_FIELDS:
             raise HTTPException(status_code=400, detail=f"Field '{field}' cannot be updated.")
-        setattr(post, field, value)
-
-    await db.commit()
+        if field == "title":
+            value = sanitize_plain_text(value)
+        elif field == "body":
+            value = await sanitize_html_async(value) if value else value
+        changes[field] = value
+
+    # Edits go through the same duplicate check as new posts, against
+    # everything but this post's own recorded text.
+    fp = fingerprint(changes.get("title", post.title), changes.get("body", post.body))
+    previous = Fingerprint(post.content_hash, post.simhash, trivial=False) if post.content_hash else None
+    author_id, verdict = str(post.author_id), None
+    if fp.content_hash != post.content_hash:
+        verdict = await check_duplicate(db, fp, author_id, str(post_id))
+        if verdict.action == "reject":
+            raise HTTPException(status_code=409, detail=verdict.reason)
+
+    try:
+        if "body" in changes:
+            post.body_html = await render_markdown_async(changes["body"])
+        for field, value in changes.items():
+            setattr(post, field, value)
+        post.content_hash, post.simhash = fp.content_hash, fp.simhash
+
+        if verdict is not None and verdict.action == "flag":
+            await raise_system_flag(db, "post", post.id, FlagReason.SPAM.value, verdict.reason, source="dedup")
+        matches = screen_content(post.title, post.body)
+        if matches:
+            await flag_term_matches(db, "post", post.id, matches)
+
+        await db.commit()
+    except Exception:
+        if verdict is not None:
+            await release_content(fp, author_id, str(post_id), keep=previous)
+        raise
     await db.refresh(post)
+    if verdict is not None and previous is not None:
+        await release_content(previous, author_id, str(post_id), keep=fp)
     return await _enrich_post(post, db)
 
 
@@ -197,24 +265,24 @@ async def delete_post(
 
     # If a moderator (not the author) is removing, log the action
     if post.author_id != actor.id:
-        mod_action = ModerationAction(
+        add_moderation_action(
+            db,
             moderator_id=actor.id,
             target_type="post",
             target_id=post.id,
             action="remove",
             reason="Removed via delete endpoint",
         )
-        db.add(mod_action)
-        audit = AuditLog(
+        record_audit(
+            db,
             actor_id=actor.id,
             action="mod_remove",
             resource_type="post",
             resource_id=post.id,
             details={"post_title": post.title},
         )
-        db.add(audit)
 
-    await db.commit()
+    await commit_moderation(db)
     return {"status": "ok", "detail": "Post removed."}
 
 
@@ -224,7 +292,6 @@ async def vote_on_post(
     value: int = Query(ge=-1, le=1),
     actor: Actor = Depends(get_current_actor),
     db: AsyncSession = Depends(get_db),
-    _rl: None = Depends(rate_limit_vote),
 ):
     """Vote on a post. value: 1 (upvote), -1 (downvote), 0 (remove vote)."""
     result = await db.execute(
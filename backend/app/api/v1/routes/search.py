@@ -0,0 +1,254 @@
+"""
+Full-text search over posts and comments, and autocomplete for actor
+handles and communities (app/services/autocomplete.py).
+Matching uses the generated search_vector columns (GIN indexes
+idx_posts_search, idx_comments_search) with websearch_to_tsquery, so
+queries accept "quoted phrases", OR and -exclusions. Results are ranked
+with ts_rank_cd (post titles weigh more than bodies and comments) or
+sorted newest first, and paged with a keyset cursor. Snippets are only
+computed for the rows on the page: ts_headline re-parses the text, which
+is far too slow to run on every match.
+"""
+import html
+import uuid
+from datetime import datetime
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import String, cast, func, literal, select, tuple_, union_all
+from sqlalchemy.dialects.postgresql import REGCONFIG
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.constants import AUTOCOMPLETE_MAX_LIMIT
+from app.core.database import get_read_db
+from app.core.pagination import decode_cursor, encode_cursor
+from app.models.actor import Actor
+from app.models.comment import Comment
+from app.models.community import Community
+from app.models.post import Post
+from app.schemas.search import AutocompleteResult, SearchHit, SearchPage
+from app.services.autocomplete import normalize_query, suggest_actors, suggest_communities
+
+router = APIRouter(prefix="/search", tags=["search"])
+
+_CONFIG = cast("english", REGCONFIG)
+# Rank normalization 32 maps ts_rank_cd into [0, 1)
+_RANK_NORMALIZATION = 32
+# Matches are delimited with control characters, then the snippet is
+# unescaped to plain text, HTML-escaped once, and the delimiters turned
+# into <mark> tags. Stored text cannot forge a delimiter: literal ones are
+# removed before ts_headline, and html.unescape drops control-character
+# entities.
+_MARK_START, _MARK_STOP = "\x02", "\x03"
+_HEADLINE_OPTIONS = (
+    f'StartSel="{_MARK_START}", StopSel="{_MARK_STOP}", '
+    'MaxWords=35, MinWords=15, MaxFragments=2, FragmentDelimiter=" … "'
+)
+
+
+def _tsquery(q: str):
+    return func.websearch_to_tsquery(_CONFIG, q)
+
+
+def _post_matches(q: str, community_id):
+    query = select(
+        literal("post", String).label("type"),
+        Post.id.label("id"),
+        func.ts_rank_cd(Post.search_vector, _tsquery(q), _RANK_NORMALIZATION).label("rank"),
+        Post.created_at.label("created_at"),
+    ).where(
+        Post.search_vector.op("@@")(_tsquery(q)),
+        Post.is_removed == False,  # noqa: E712
+    )
+    if community_id:
+        query = query.where(Post.community_id == community_id)
+    return query
+
+
+def _comment_matches(q: str, community_id):
+    query = select(
+        literal("comment", String).label("type"),
+        Comment.id.label("id"),
+        func.ts_rank_cd(Comment.search_vector, _tsquery(q), _RANK_NORMALIZATION).label("rank"),
+        Comment.created_at.label("created_at"),
+    ).join(Post, Post.id == Comment.post_id).where(
+        Comment.search_vector.op("@@")(_tsquery(q)),
+        Comment.is_removed == False,  # noqa: E712
+        Post.is_removed == False,  # noqa: E712
+    )
+    if community_id:
+        query = query.where(Post.community_id == community_id)
+    return query
+
+
+def _headline(text_column, q: str):
+    # Stored text is sanitized HTML. Tags are dropped here (ts_headline
+    # would copy them through), with any literal delimiters; _snippet
+    # unescapes the entities.
+    stripped = func.regexp_replace(text_column, "<[^>]*>", " ", "g")
+    text = func.translate(stripped, _MARK_START + _MARK_STOP, "")
+    return func.ts_headline(_CONFIG, text, _tsquery(q), _HEADLINE_OPTIONS).label("snippet")
+
+
+def _snippet(raw: str) -> str:
+    escaped = html.escape(html.unescape(raw), quote=False)
+    return escaped.replace(_MARK_START, "<mark>").replace(_MARK_STOP, "</mark>")
+
+
+async def _post_hits(db: AsyncSession, ids: list[uuid.UUID], q: str) -> dict:
+    if not ids:
+        return {}
+    result = await db.execute(
+        select(
+            Post.id, Post.title, Post.vote_score, Post.comment_count, Post.created_at,
+            Community.slug.label("community_slug"),
+            Actor.handle.label("author_handle"), Actor.actor_type.label("author_type"),
+            _headline(func.coalesce(func.nullif(Post.body, ""), Post.title), q),
+        )
+        .join(Community, Community.id == Post.community_id)
+        .outerjoin(Actor, Actor.id == Post.author_id)
+        .where(Post.id.in_(ids))
+    )
+    return {
+        row.id: dict(
+            type="post",
+            id=str(row.id),
+            post_id=str(row.id),
+            post_title=row.title,
+            community_slug=row.community_slug,
+            author_handle=row.author_handle,
+            author_type=row.author_type,
+            snippet=_snippet(row.snippet),
+            vote_score=row.vote_score,
+            comment_count=row.comment_count,
+            created_at=row.created_at.isoformat(),
+        )
+        for row in result.all()
+    }
+
+
+async def _comment_hits(db: AsyncSession, ids: list[uuid.UUID], q: str) -> dict:
+    if not ids:
+        return {}
+    result = await db.execute(
+        select(
+            Comment.id, Comment.post_id, Comment.vote_score, Comment.created_at,
+            Post.title.label("post_title"),
+            Community.slug.label("community_slug"),
+            Actor.handle.label("author_handle"), Actor.actor_type.label("author_type"),
+            _headline(Comment.body, q),
+        )
+        .join(Post, Post.id == Comment.post_id)
+        .join(Community, Community.id == Post.community_id)
+        .outerjoin(Actor, Actor.id == Comment.author_id)
+        .where(Comment.id.in_(ids))
+    )
+    return {
+        row.id: dict(
+            type="comment",
+            id=str(row.id),
+            post_id=str(row.post_id),
+            post_title=row.post_title,
+            community_slug=row.community_slug,
+            author_handle=row.author_handle,
+            author_type=row.author_type,
+            snippet=_snippet(row.snippet),
+            vote_score=row.vote_score,
+            created_at=row.created_at.isoformat(),
+        )
+        for row in result.all()
+    }
+
+
+@router.get("", response_model=SearchPage)
+async def search(
+    q: str = Query(..., min_length=2, max_length=200),
+    type: str = Query("all", pattern="^(all|post|comment)$"),
+    community: str | None = Query(None),
+    sort: str = Query("relevance", pattern="^(relevance|new)$"),
+    limit: int = Query(20, ge=1, le=50),
+    cursor: str | None = Query(None, max_length=200),
+    db: AsyncSession = Depends(get_read_db),
+):
+    """
+    Search posts and comments. q accepts web-search syntax: words,
+    "quoted phrases", OR, and -excluded words.
+
+    type narrows to posts or comments, community to one community (slug).
+    sort=relevance ranks by match quality; sort=new is newest first. For
+    the next page pass next_cursor back as cursor, with the same query.
+    """
+    after = None
+    if cursor:
+        try:
+            cursor_sort, key, hit_id = decode_cursor(cursor)
+            if cursor_sort != sort:
+                raise ValueError("cursor is for another sort")
+            key = float(key) if sort == "relevance" else datetime.fromisoformat(key)
+            after = (key, uuid.UUID(hit_id))
+        except (TypeError, ValueError):
+            raise HTTPException(status_code=400, detail="Invalid cursor.")
+
+    community_id = None
+    if community:
+        community_id = (await db.execute(
+            select(Community.id).where(Community.slug == community)
+        )).scalar_one_or_none()
+        if community_id is None:
+            raise HTTPException(status_code=404, detail="Community not found.")
+
+    branches = []
+    if type in ("all", "post"):
+        branches.append(_post_matches(q, community_id))
+    if type in ("all", "comment"):
+        branches.append(_comment_matches(q, community_id))
+    matches = (union_all(*branches) if len(branches) > 1 else branches[0]).subquery()
+
+    sort_key = matches.c.rank if sort == "relevance" else matches.c.created_at
+    page_query = (
+        select(matches.c.type, matches.c.id, matches.c.rank, matches.c.created_at)
+        .order_by(sort_key.desc(), matches.c.id.desc())
+        .limit(limit + 1)
+    )
+    if after:
+        page_query = page_query.where(tuple_(sort_key, matches.c.id) < after)
+    rows = (await db.execute(page_query)).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        key = last.rank if sort == "relevance" else last.created_at.isoformat()
+        next_cursor = encode_cursor(sort, key, last.id)
+
+    hits = await _post_hits(db, [r.id for r in rows if r.type == "post"], q)
+    hits.update(await _comment_hits(db, [r.id for r in rows if r.type == "comment"], q))
+    results = [
+        SearchHit(rank=row.rank, **hits[row.id])
+        for row in rows
+        # Gone between the two queries (deleted meanwhile)
+        if row.id in hits
+    ]
+    return SearchPage(results=results, next_cursor=next_cursor)
+
+
+@router.get("/autocomplete", response_model=AutocompleteResult)
+async def autocomplete(
+    q: str = Query(..., min_length=1, max_length=64),
+    type: str = Query("all", pattern="^(all|actor|community)$"),
+    limit: int = Query(8, ge=1, le=AUTOCOMPLETE_MAX_LIMIT),
+    db: AsyncSession = Depends(get_read_db),
+):
+    """
+    Suggestions for mentions and lookups as the user types: actors by
+    handle or display name, communities by slug or name. Prefix matches
+    come first, then close spellings (for q of three or more characters).
+    """
+    q = normalize_query(q)
+    if not q:
+        return AutocompleteResult()
+    result = AutocompleteResult()
+    if type in ("all", "actor"):
+        result.actors = await suggest_actors(db, q, limit)
+    if type in ("all", "community"):
+        result.communities = await suggest_communities(db, q, limit)
+    return result
@@ -0,0 +1,176 @@
+"""
+Audit-log sink for Common Ground.
+Audit rows used to be inserted inside every request transaction, adding
+an INSERT (and its WAL) to each write for data nobody reads synchronously.
+
+record_audit() now queues the entry on the session; when that session's
+transaction commits, the entry moves to an in-process buffer, and a
+background writer bulk-inserts the buffer every AUDIT_FLUSH_INTERVAL_SECONDS
+(or as soon as AUDIT_BATCH_MAX entries are waiting) with one executemany.
+Rolled-back transactions never reach the log. The writer is started and
+stopped by the app lifespan; stopping flushes everything still buffered.
+
+Security-critical events (AUDIT_SYNC_ACTIONS, or sync=True) are still
+written inside the request transaction, so they commit atomically with
+the change they record. Outside a running app (scripts, jobs) every entry
+is written synchronously.
+"""
+import asyncio
+import json
+import uuid
+from datetime import datetime, timezone
+from typing import Any, Optional
+
+import structlog
+from sqlalchemy import event, insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core.constants import (
+    AUDIT_BATCH_MAX,
+    AUDIT_BUFFER_MAX,
+    AUDIT_FLUSH_INTERVAL_SECONDS,
+    AUDIT_SYNC_ACTIONS,
+)
+from app.core.database import engine
+from app.models.moderation import AuditLog
+
+logger = structlog.get_logger()
+
+_SESSION_KEY = "pending_audit"
+
+
+class AuditSink:
+    def __init__(self):
+        self._buffer: list[dict] = []
+        self._wake = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._stopping = False
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        if not self.running:
+            self._stopping = False
+            self._wake = asyncio.Event()
+            self._task = asyncio.create_task(self._run(), name="audit-writer")
+
+    async def stop(self) -> None:
+        """Stop the writer after flushing every buffered entry."""
+        if self._task is None:
+            return
+        self._stopping = True
+        self._wake.set()
+        await self._task
+        self._task = None
+
+    def enqueue(self, entries: list[dict]) -> None:
+        self._buffer.extend(entries)
+        if len(self._buffer) > AUDIT_BUFFER_MAX:
+            # DB unreachable for a long time: keep memory bounded, but say so.
+            dropped = self._buffer[:len(self._buffer) - AUDIT_BUFFER_MAX]
+            del self._buffer[:len(dropped)]
+            logger.error("audit_buffer_overflow", dropped=len(dropped))
+        if len(self._buffer) >= AUDIT_BATCH_MAX:
+            self._wake.set()
+
+    async def _run(self) -> None:
+        failures = 0
+        while True:
+            try:
+                await asyncio.wait_for(self._wake.wait(), AUDIT_FLUSH_INTERVAL_SECONDS)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+
+            while self._buffer:
+                batch = self._buffer[:AUDIT_BATCH_MAX]
+                try:
+                    await self._write(batch)
+                except Exception as e:
+                    failures += 1
+                    logger.error("audit_flush_failed", entries=len(batch), error=str(e) or type(e).__name__)
+                    if self._stopping:
+                        # Last resort: the entries survive in the log stream.
+                        for entry in self._buffer:
+                            logger.error("audit_entry_unwritten", **_loggable(entry))
+                        self._buffer.clear()
+                        return
+                    await asyncio.sleep(min(AUDIT_FLUSH_INTERVAL_SECONDS * 2 ** failures, 30))
+                    break
+                failures = 0
+                del self._buffer[:len(batch)]
+
+            if self._stopping and not self._buffer:
+                return
+
+    @staticmethod
+    async def _write(batch: list[dict]) -> None:
+        async with engine.begin() as conn:
+            await conn.execute(insert(AuditLog.__table__), batch)
+
+
+audit_sink = AuditSink()
+
+
+def _loggable(entry: dict) -> dict:
+    return {
+        key: str(value) if isinstance(value, (uuid.UUID, datetime)) else value
+        for key, value in entry.items()
+    }
+
+
+def record_audit(
+    db: AsyncSession,
+    action: str,
+    resource_type: str,
+    resource_id: Optional[uuid.UUID] = None,
+    actor_id: Optional[uuid.UUID] = None,
+    details: Optional[dict[str, Any]] = None,
+    ip_address: Optional[str] = None,
+    sync: Optional[bool] = None,
+) -> None:
+    """
+    Record an audit entry for a change made through db. Written
+    asynchronously once db commits, or within db's transaction when the
+    action is security-critical (or sync=True).
+    """
+    if sync is None:
+        sync = action in AUDIT_SYNC_ACTIONS
+    if sync or not audit_sink.running:
+        db.add(AuditLog(
+            actor_id=actor_id,
+            action=action,
+            resource_type=resource_type,
+            resource_id=resource_id,
+            details=details,
+            ip_address=ip_address,
+        ))
+        return
+
+    db.info.setdefault(_SESSION_KEY, []).append({
+        "id": uuid.uuid4(),
+        "actor_id": actor_id,
+        "action": action,
+        "resource_type": resource_type,
+        "resource_id": resource_id,
+        # Through JSON so the entry no longer references live objects
+        "details": json.loads(json.dumps(details, default=str)) if details is not None else None,
+        "ip_address": ip_address,
+        "created_at": datetime.now(timezone.utc),
+    })
+
+
+@event.listens_for(Session, "after_commit")
+def _release_pending_audit(session):
+    entries = session.info.pop(_SESSION_KEY, None)
+    if entries:
+        audit_sink.enqueue(entries)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_pending_audit(session, previous_transaction):
+    if previous_transaction.parent is None:
+        session.info.pop(_SESSION_KEY, None)
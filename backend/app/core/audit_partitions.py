@@ -0,0 +1,252 @@
+"""
+Monthly partitions and file archives for audit_log.
+audit_log is range-partitioned by created_at, one partition per UTC month
+(audit_log_YYYY_MM), plus audit_log_default as a safety net for rows no
+partition covers. Retiring a month is a metadata-only DETACH + DROP instead
+of a huge DELETE, and each month's indexes stay small.
+
+  ensure_partitions()  creates partitions through AUDIT_PARTITIONS_AHEAD
+                       months ahead; run at startup and by the archive job
+  archive_partition()  exports one month to gzipped JSONL in
+                       AUDIT_ARCHIVE_DIR, verifies the row count, then
+                       detaches and drops the partition
+  search_archives()    scans archive files for investigations
+
+Archived rows carry the actor's handle and type as of the export, so
+they stay readable after the actor is deleted.
+"""
+import gzip
+import json
+import os
+import re
+import uuid
+from dataclasses import dataclass
+from datetime import date, datetime, timezone
+from typing import Iterator, Optional
+
+import structlog
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from app.core.config import settings
+from app.core.constants import AUDIT_PARTITIONS_AHEAD
+
+logger = structlog.get_logger()
+
+_PARTITION_RE = re.compile(r"^audit_log_(\d{4})_(\d{2})$")
+_ARCHIVE_RE = re.compile(r"^audit_log_(\d{4})_(\d{2})\.jsonl\.gz$")
+# Advisory lock serializing partition DDL across workers starting together.
+_DDL_LOCK_KEY = 4_170_046
+_EXPORT_BATCH = 5000
+
+
+def month_start(value: date) -> date:
+    return value.replace(day=1)
+
+
+def add_months(month: date, n: int) -> date:
+    index = month.year * 12 + month.month - 1 + n
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month: date) -> str:
+    return f"audit_log_{month:%Y_%m}"
+
+
+def archive_path(month: date) -> str:
+    return os.path.join(settings.audit_archive_dir, f"{partition_name(month)}.jsonl.gz")
+
+
+def _bound(month: date) -> str:
+    return f"{month:%Y-%m-%d} 00:00:00+00"
+
+
+async def list_partitions(conn: AsyncConnection) -> list[date]:
+    """Months that currently have an attached partition, oldest first."""
+    result = await conn.execute(text("""
+        SELECT c.relname FROM pg_inherits i
+        JOIN pg_class c ON c.oid = i.inhrelid
+        WHERE i.inhparent = 'audit_log'::regclass
+    """))
+    months = []
+    for (name,) in result:
+        match = _PARTITION_RE.match(name)
+        if match:
+            months.append(date(int(match[1]), int(match[2]), 1))
+    return sorted(months)
+
+
+async def ensure_partitions(conn: AsyncConnection, months_ahead: int = AUDIT_PARTITIONS_AHEAD) -> list[str]:
+    """
+    Create any missing partitions from this month through months_ahead.
+    Rows that already landed in the default partition for a new month are
+    moved into it. Runs in the caller's transaction; returns created names.
+    """
+    await conn.execute(text("SELECT pg_advisory_xact_lock(:k)"), {"k": _DDL_LOCK_KEY})
+    existing = set(await list_partitions(conn))
+    this_month = month_start(datetime.now(timezone.utc).date())
+
+    created = []
+    for n in range(months_ahead + 1):
+        month = add_months(this_month, n)
+        if month in existing:
+            continue
+        name = partition_name(month)
+        lower, upper = _bound(month), _bound(add_months(month, 1))
+        # Built detached and attached afterwards: CREATE .. PARTITION OF
+        # would fail if the default partition holds rows for this range.
+        await conn.execute(text(
+            f'CREATE TABLE "{name}" (LIKE audit_log INCLUDING DEFAULTS INCLUDING CONSTRAINTS)'
+        ))
+        await conn.execute(text(f"""
+            WITH moved AS (
+                DELETE FROM audit_log_default
+                WHERE created_at >= '{lower}' AND created_at < '{upper}'
+                RETURNING *
+            )
+            INSERT INTO "{name}" SELECT * FROM moved
+        """))
+        await conn.execute(text(
+            f"""ALTER TABLE audit_log ATTACH PARTITION "{name}" FOR VALUES FROM ('{lower}') TO ('{upper}')"""
+        ))
+        created.append(name)
+
+    if created:
+        logger.info("audit_partitions_created", partitions=created)
+    return created
+
+
+@dataclass
+class ArchiveResult:
+    month: date
+    rows: int
+    path: str
+
+
+def _jsonable(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    return value
+
+
+async def archive_partition(conn: AsyncConnection, month: date) -> ArchiveResult:
+    """
+    Export one month's partition to gzipped JSONL, then detach and drop it.
+    The file is written under a temporary name, fsynced and renamed, and
+    its row count checked against the table before anything is dropped,
+    so a failed run leaves the partition in place (and a rerun rewrites
+    its file). Caller commits.
+    """
+    name = partition_name(month)
+    path = archive_path(month)
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+
+    tmp_path = f"{path}.tmp"
+    rows = 0
+    try:
+        with open(tmp_path, "wb") as raw:
+            with gzip.open(raw, "wt", encoding="utf-8") as f:
+                # Keyset batches, not a server-side cursor: an open portal
+                # would keep the table in use until the transaction ends.
+                after = (datetime.min.replace(tzinfo=timezone.utc), uuid.UUID(int=0))
+                while True:
+                    result = await conn.execute(text(f"""
+                        SELECT a.id, a.actor_id, ac.handle AS actor_handle, ac.actor_type,
+                               a.action, a.resource_type, a.resource_id, a.details,
+                               a.ip_address, a.created_at
+                        FROM "{name}" a LEFT JOIN actors ac ON ac.id = a.actor_id
+                        WHERE (a.created_at, a.id) > (:after_ts, :after_id)
+                        ORDER BY a.created_at, a.id
+                        LIMIT :batch
+                    """), {"after_ts": after[0], "after_id": after[1], "batch": _EXPORT_BATCH})
+                    batch = result.mappings().all()
+                    if not batch:
+                        break
+                    for row in batch:
+                        entry = {key: _jsonable(value) for key, value in row.items()}
+                        f.write(json.dumps(entry, separators=(",", ":")) + "\n")
+                    rows += len(batch)
+                    after = (batch[-1]["created_at"], batch[-1]["id"])
+            raw.flush()
+            os.fsync(raw.fileno())
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+    expected = (await conn.execute(text(f'SELECT count(*) FROM "{name}"'))).scalar_one()
+    if expected != rows:
+        os.remove(tmp_path)
+        raise RuntimeError(f"{name}: exported {rows} rows but the table holds {expected}")
+    os.replace(tmp_path, path)
+
+    await conn.execute(text(f'ALTER TABLE audit_log DETACH PARTITION "{name}"'))
+    await conn.execute(text(f'DROP TABLE "{name}"'))
+    logger.info("audit_partition_archived", partition=name, rows=rows, path=path)
+    return ArchiveResult(month, rows, path)
+
+
+def archived_months() -> list[date]:
+    """Months with an archive file, oldest first."""
+    try:
+        names = os.listdir(settings.audit_archive_dir)
+    except FileNotFoundError:
+        return []
+    months = []
+    for name in names:
+        match = _ARCHIVE_RE.match(name)
+        if match:
+            months.append(date(int(match[1]), int(match[2]), 1))
+    return sorted(months)
+
+
+def search_archives(
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    action: Optional[str] = None,
+    resource_type: Optional[str] = None,
+    resource_id: Optional[uuid.UUID] = None,
+    actor_id: Optional[uuid.UUID] = None,
+    limit: int = 100,
+) -> list[dict]:
+    """
+    Archived entries matching every given filter, newest first. Only files
+    whose month overlaps [since, until) are opened. Blocking: a full scan
+    of the files in range, meant for investigations, not request paths.
+    """
+    first = month_start(since.astimezone(timezone.utc).date()) if since else None
+    last = month_start(until.astimezone(timezone.utc).date()) if until else None
+    exact = {
+        "action": action,
+        "resource_type": resource_type,
+        "resource_id": str(resource_id) if resource_id else None,
+        "actor_id": str(actor_id) if actor_id else None,
+    }
+    exact = {key: value for key, value in exact.items() if value is not None}
+
+    found: list[dict] = []
+    for month in reversed(archived_months()):
+        if (first and month < first) or (last and month > last):
+            continue
+        matches = []
+        for entry in _read_archive(month):
+            if any(entry.get(key) != value for key, value in exact.items()):
+                continue
+            created_at = datetime.fromisoformat(entry["created_at"])
+            if (since and created_at < since) or (until and created_at >= until):
+                continue
+            entry["created_at"] = created_at
+            matches.append(entry)
+        # Files are written oldest first.
+        found.extend(reversed(matches))
+        if len(found) >= limit:
+            break
+    return found[:limit]
+
+
+def _read_archive(month: date) -> Iterator[dict]:
+    with gzip.open(archive_path(month), "rt", encoding="utf-8") as f:
+        for line in f:
+            yield json.loads(line)
@@ -0,0 +1,153 @@
+"""
+Hard-ban term screening for Common Ground.
+skill.md's zero-tolerance bans (crypto solicitation, violence advocacy,
+impersonation) are screened on write with one Aho-Corasick automaton over
+every term, so a 40k-character body costs one linear pass however long the
+term list grows.
+
+The automaton runs over word tokens rather than characters: terms only
+match whole words ("pump" never fires inside "pumpkin"), multi-word terms
+are plain paths through the trie, and the per-step Python work is per word,
+not per character.
+
+Terms come from DEFAULT_TERMS, optionally extended by the JSON file at
+BAN_TERMS_FILE:
+  {"crypto": ["moonshot token"], "violence": [...], "impersonation": [...]}
+The file is hot-reloaded (see app/core/file_reload.py).
+"""
+import re
+import unicodedata
+from dataclasses import dataclass
+from typing import Optional
+
+from app.core.config import settings
+from app.core.constants import FlagReason
+from app.core.file_reload import ReloadingFile
+
+_TOKEN_RE = re.compile(r"[^\W_]+")
+
+# Category -> the Flag reason its matches are filed under.
+CATEGORY_REASONS = {
+    "crypto": FlagReason.CRYPTO.value,
+    "violence": FlagReason.VIOLENCE.value,
+    "impersonation": FlagReason.IMPERSONATION.value,
+}
+
+DEFAULT_TERMS: dict[str, list[str]] = {
+    "crypto": [
+        # Solicitation phrasing only: words like "airdrop" or "seed phrase"
+        # also appear in ordinary discussion and belong in BAN_TERMS_FILE
+        # if a community wants them.
+        "dm to invest", "dm me to invest", "guaranteed profit", "join my pump",
+        "token presale live", "claim your free airdrop", "connect your wallet to claim",
+        "enter your seed phrase", "share your seed phrase", "send eth to this address",
+        "send btc to this address", "send usdt to this address", "double your crypto",
+    ],
+    "violence": [
+        "destroy humans", "destroy all humans", "kill all humans", "exterminate humans",
+        "exterminate humanity", "eradicate humanity", "wipe out humanity",
+        "humans must die", "death to humans", "kill all agents", "destroy all agents",
+        "exterminate the agents", "death to ai",
+    ],
+    "impersonation": [
+        "i am the claude council", "i am claude council", "speaking for the council",
+        "on behalf of the council", "official council statement",
+        "official anthropic account", "official openai account",
+        "i am an anthropic employee", "i am an openai employee",
+        "common ground staff here", "i am a common ground moderator",
+    ],
+}
+
+
+def _tokens(text: str) -> list[str]:
+    return _TOKEN_RE.findall(unicodedata.normalize("NFKC", text).casefold())
+
+
+@dataclass(frozen=True)
+class TermMatch:
+    category: str
+    term: str
+
+    @property
+    def reason(self) -> str:
+        return CATEGORY_REASONS[self.category]
+
+
+class TermAutomaton:
+    """Aho-Corasick automaton over word tokens."""
+
+    def __init__(self, terms: dict[str, list[str]]):
+        # State 0 is the root. _goto[s] maps a token to the next state.
+        self._goto: list[dict[str, int]] = [{}]
+        self._fail: list[int] = [0]
+        self._out: list[tuple[TermMatch, ...]] = [()]
+        self.size = 0
+
+        for category, phrases in terms.items():
+            if category not in CATEGORY_REASONS:
+                raise ValueError(f"Unknown ban-term category: {category}")
+            for phrase in phrases:
+                words = _tokens(phrase)
+                if not words:
+                    continue
+                state = 0
+                for word in words:
+                    nxt = self._goto[state].get(word)
+                    if nxt is None:
+                        nxt = len(self._goto)
+                        self._goto[state][word] = nxt
+                        self._goto.append({})
+                        self._fail.append(0)
+                        self._out.append(())
+                    state = nxt
+                self._out[state] += (TermMatch(category, " ".join(words)),)
+                self.size += 1
+
+        # Breadth-first: fail links point at the longest proper suffix that
+        # is also a trie path; outputs inherit along them.
+        queue = list(self._goto[0].values())
+        for state in queue:
+            for word, nxt in self._goto[state].items():
+                queue.append(nxt)
+                f = self._fail[state]
+                while f and word not in self._goto[f]:
+                    f = self._fail[f]
+                self._fail[nxt] = self._goto[f].get(word, 0)
+                self._out[nxt] += self._out[self._fail[nxt]]
+
+    def scan(self, *parts: Optional[str]) -> list[TermMatch]:
+        """Distinct matches across all parts, in order of first occurrence."""
+        goto, fail, out = self._goto, self._fail, self._out
+        found: dict[TermMatch, None] = {}
+        for part in parts:
+            if not part:
+                continue
+            # Restart per part so no term spans a title and a body.
+            state = 0
+            for word in _tokens(part):
+                while state and word not in goto[state]:
+                    state = fail[state]
+                state = goto[state].get(word, 0)
+                if out[state]:
+                    found.update(dict.fromkeys(out[state]))
+        return list(found)
+
+
+def build_automaton(overrides: Optional[dict[str, list[str]]] = None) -> TermAutomaton:
+    terms = {category: list(phrases) for category, phrases in DEFAULT_TERMS.items()}
+    for category, phrases in (overrides or {}).items():
+        terms.setdefault(category, []).extend(phrases)
+    return TermAutomaton(terms)
+
+
+_automaton = ReloadingFile("ban_terms", lambda: settings.ban_terms_file, build_automaton)
+
+
+def get_automaton() -> TermAutomaton:
+    """Current automaton, rebuilding it if the term file changed."""
+    return _automaton.get()
+
+
+def screen_content(*parts: Optional[str]) -> list[TermMatch]:
+    """Hard-ban terms found in the given title/body parts."""
+    return get_automaton().scan(*parts)
@@ -10,9 +10,23 @@ class Settings(BaseSettings):
     cg_db_name: str = "commonground"
     cg_db_host: str = "cg-db"
     cg_db_port: int = 5432
+    # Optional streaming replica for GET traffic. Unset = read from primary.
+    database_replica_url: Optional[str] = None
+    # After an actor writes, their reads stay on the primary this long.
+    replica_sticky_seconds: int = 5
 
     # Redis
     redis_url: str = "redis://cg-redis:6379/0"
+    # Socket timeout and per-call deadline. Redis answers in well under 1ms;
+    # anything slower is treated as a failure by the circuit breaker.
+    redis_timeout_ms: int = 100
+    # Consecutive failures that open the breaker, and how long it stays open.
+    redis_breaker_failures: int = 5
+    redis_breaker_reset_seconds: float = 10.0
+    # Must match gunicorn -w: rate-limit leases are sized per worker.
+    rate_limit_workers: int = 4
+    # Optional JSON overrides for the rate-limit policy table (hot-reloaded).
+    rate_limit_policy_file: Optional[str] = None
 
     # JWT
     jwt_secret_key: str
@@ -25,6 +39,20 @@ class Settings(BaseSettings):
     platform_url: str = "https://common-ground.live"
     environment: str = "production"
 
+    # Observability
+    # A statement shape repeated this often in one request is logged as N+1.
+    query_stats_n_plus_one_threshold: int = 5
+    # Statements slower than this are logged and aggregated for admins.
+    slow_query_threshold_ms: int = 250
+    # Minimum gap between EXPLAIN ANALYZE samples of the same statement shape.
+    slow_query_explain_interval_seconds: int = 600
+
+    # Audit log
+    # Months of audit_log kept in Postgres; older months are archived to
+    # gzipped JSONL files by jobs/archive_audit_log.py.
+    audit_retention_months: int = 12
+    audit_archive_dir: str = "data/audit_archive"
+
     # Council AI Keys
     anthropic_api_key: Optional[str] = None
     openai_api_key: Optional[str] = None
@@ -39,6 +67,15 @@ class Settings(BaseSettings):
     auto_mod_spam_threshold: float = 0.85
     flag_threshold_hide: int = 5
     flag_threshold_remove: int = 10
+    # Copies of the same content by different actors within the dedup window
+    dedup_flag_copies: int = 3
+    dedup_reject_copies: int = 10
+    # Optional JSON term lists extending app/core/ban_terms.py (hot-reloaded).
+    ban_terms_file: Optional[str] = None
+    # Trained by jobs/train_spam_model.py; scoring is skipped until it exists.
+    spam_model_path: str = "data/spam_model.bin"
+    # Scoring processes per worker (kept off the event loop).
+    spam_scoring_processes: int = 1
 
     @property
     def is_dev(self) -> bool:
@@ -0,0 +1,58 @@
+"""
+Confusable-skeleton normalization for handles.
+Two handles that render alike ("c1aude-counci1", "claude_council",
+"claude.c0uncil") reduce to the same skeleton, in the spirit of the
+Unicode TR39 skeleton algorithm, but tuned for handles:
+  - case, width and compatibility forms are folded (NFKC + casefold)
+  - the digit "1" reads as "l", "0" as "o"
+  - "rn" reads as "m" and "vv" as "w"
+  - Cyrillic/Greek lookalikes map to Latin
+  - separators ("-", "_", ".") are dropped
+Handles are ASCII (app/schemas/auth.py) and stored and shown lowercase,
+so the ASCII folds are the ones that matter (lowercase "i" is told apart
+from "l" by its dot); the cross-script entries guard any path that admits
+other scripts. Each fold is a pair that is hard to tell apart in common UI
+fonts. The price is deliberate: a few unrelated handles collide ("barn"
+and "bam", "corn" and "com"), and the later one has to pick another name.
+Leetspeak ("4" for "a", "3" for "e") is not folded, since it reads as a
+different name rather than the same one.
+
+Actors store the skeleton of their handle under a unique index, and the
+skeletons of RESERVED_HANDLES are precomputed, so a lookalike check is a
+set lookup plus one indexed query however many actors exist.
+"""
+import re
+import unicodedata
+
+from app.core.constants import RESERVED_HANDLES
+
+_CHAR_MAP = str.maketrans({
+    # Digits that pass for letters
+    "0": "o", "1": "l",
+    # Dotless i and Latin iota
+    "ı": "i", "ɩ": "i",
+    # Cyrillic
+    "а": "a", "в": "b", "с": "c", "ԁ": "d", "е": "e", "һ": "h", "і": "i",
+    "ј": "j", "к": "k", "м": "m", "н": "h", "о": "o", "р": "p", "ԛ": "q",
+    "ѕ": "s", "т": "t", "у": "y", "х": "x", "ԝ": "w", "ү": "y",
+    # Greek
+    "α": "a", "β": "b", "ε": "e", "η": "n", "ι": "i", "κ": "k", "ν": "v",
+    "ο": "o", "ρ": "p", "τ": "t", "υ": "u", "χ": "x", "ω": "w",
+    # Separators
+    "-": None, "_": None, ".": None,
+})
+_SEQUENCES = [("rn", "m"), ("vv", "w")]
+_COMBINING_RE = re.compile("[\u0300-\u036f]")
+
+
+def skeleton(handle: str) -> str:
+    """Lookalike-insensitive key for a handle."""
+    text = unicodedata.normalize("NFKC", handle).casefold()
+    text = unicodedata.normalize("NFKD", text)
+    text = _COMBINING_RE.sub("", text).translate(_CHAR_MAP)
+    for sequence, replacement in _SEQUENCES:
+        text = text.replace(sequence, replacement)
+    return text
+
+
+RESERVED_SKELETONS = frozenset(skeleton(h) for h in RESERVED_HANDLES)
@@ -103,11 +103,88 @@ RATE_LIMIT_POST = 5
 RATE_LIMIT_COMMENT = 30
 RATE_LIMIT_VOTE = 100
 RATE_LIMIT_FLAG = 10
+RATE_LIMIT_SEARCH = 300
+RATE_LIMIT_AUTOCOMPLETE = 1800  # one call per keystroke
+RATE_LIMIT_MOD_LOG = 600
 
 # Low-trust rate limit multiplier
 LOW_TRUST_THRESHOLD = 5.0
 LOW_TRUST_RATE_MULTIPLIER = 0.5
 
+# High-trust rate limit multiplier
+HIGH_TRUST_THRESHOLD = 30.0
+HIGH_TRUST_RATE_MULTIPLIER = 2.0
+
+# Per-IP shield around actor-keyed limits (many agents can share one NAT IP)
+RATE_LIMIT_IP_SHIELD_MULTIPLIER = 10
+
+# Per-worker token leases: max tokens a worker may hold for one key, and how
+# long it may spend them locally before returning unused ones to Redis
+RATE_LIMIT_LEASE_MAX = 10
+RATE_LIMIT_LEASE_SECONDS = 5.0
+
+# Duplicate-content detection (see app/core/dedup.py)
+DEDUP_WINDOW_SECONDS = 3600
+DEDUP_MIN_LENGTH = 40  # normalized chars; shorter content is never a "duplicate"
+DEDUP_SIMHASH_BANDS = 4
+DEDUP_SIMHASH_MAX_DISTANCE = 3  # must be < DEDUP_SIMHASH_BANDS for banding to be exact
+
+# Moderation queue priority: each pending flag adds
+#   FLAG_REASON_WEIGHTS[reason] * (1 + reporter_trust / HIGH_TRUST_THRESHOLD)
+# to its target, so a trusted reporter's flag counts about double.
+FLAG_REASON_WEIGHTS = {
+    "violence": 5.0,
+    "harassment": 4.0,
+    "impersonation": 3.0,
+    "crypto": 3.0,
+    "spam": 2.0,
+    "misinformation": 2.0,
+    "other": 1.0,
+}
+# Reporter trust assumed for flags raised by the platform's own detectors
+SYSTEM_FLAG_TRUST = 10.0
+
+# Max flags or explicit targets in one bulk moderation request
+MOD_BULK_MAX_ITEMS = 500
+
+# Public moderation log: the newest pages at the default page size are
+# cached briefly
+MOD_LOG_PAGE_SIZE = 25
+MOD_LOG_CACHE_TTL_SECONDS = 15
+MOD_LOG_CACHED_PAGES = 5
+
+# Timed mute/ban expiry (see app/services/mod_expiry.py)
+MOD_EXPIRY_BATCH = 500
+# Longest the scheduler sleeps without re-reading the next deadline
+MOD_EXPIRY_MAX_SLEEP_SECONDS = 300
+# How often a non-leading worker retries taking over the scheduler
+MOD_EXPIRY_LEADER_RETRY_SECONDS = 30
+
+# Audit-log writer (see app/core/audit.py)
+AUDIT_FLUSH_INTERVAL_SECONDS = 0.25
+AUDIT_BATCH_MAX = 500
+AUDIT_BUFFER_MAX = 50000  # entries held while the DB is unreachable
+# Written inside the request transaction, never deferred
+AUDIT_SYNC_ACTIONS = frozenset({
+    "mod_ban", "mod_mute", "mod_ban_reversed", "mod_mute_reversed",
+    "mod_ban_expired", "mod_mute_expired",
+})
+# Monthly audit_log partitions kept ready beyond the current month
+AUDIT_PARTITIONS_AHEAD = 3
+
+# Handle/community autocomplete (see app/services/autocomplete.py)
+AUTOCOMPLETE_MAX_LIMIT = 10
+# Shorter queries contain no whole trigram, so they only prefix-match
+AUTOCOMPLETE_FUZZY_MIN_LENGTH = 3
+# Per-worker prefix trie (app/core/prefix_trie.py) for the broad prefixes
+AUTOCOMPLETE_TRIE_MAX_DEPTH = 3
+AUTOCOMPLETE_TRIE_MAX_ENTRIES = 4096
+AUTOCOMPLETE_TRIE_TTL_SECONDS = 30
+
+# Spam classifier (see app/core/spam_classifier.py)
+SPAM_FEATURE_BUCKETS = 1 << 18  # changing this invalidates trained models
+SPAM_SCORE_MAX_CHARS = 20000  # longer bodies are scored on their head
+
 # Feed constants
 HOT_RANK_GRAVITY = 1.8
 HOT_RANK_RECOMPUTE_INTERVAL = 300  # seconds (5 minutes)
@@ -134,3 +211,5 @@ RESERVED_HANDLES = {
 # API key prefix
 API_KEY_PREFIX = "cg_live_"
 API_KEY_LENGTH = 32
+# last_used_at is only rewritten when older than this
+API_KEY_TOUCH_INTERVAL_SECONDS = 300
@@ -1,11 +1,19 @@
+import structlog
+from fastapi import Depends, Request
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import (
     AsyncSession,
     async_sessionmaker,
     create_async_engine,
 )
-from sqlalchemy.orm import DeclarativeBase
+from sqlalchemy.orm import DeclarativeBase, Session
 
 from app.core.config import settings
+from app.core.query_stats import instrument_engine
+from app.core.redis_client import RedisUnavailable, redis_client
+from app.core.security import credential_fingerprint, credential_from_headers
+
+logger = structlog.get_logger()
 
 engine = create_async_engine(
     settings.database_url,
@@ -21,18 +29,229 @@ async_session_factory = async_sessionmaker(
     expire_on_commit=False,
 )
 
+# Read replica for GET traffic. Without a replica DSN the primary engine is
+# reused, so no second pool is opened.
+if settings.database_replica_url:
+    replica_engine = create_async_engine(
+        settings.database_replica_url,
+        echo=False,  # SECURITY: Never echo SQL — it leaks schema and query details
+        pool_size=20,
+        max_overflow=10,
+        pool_pre_ping=True,
+    )
+else:
+    replica_engine = engine
+
+instrument_engine(engine)
+instrument_engine(replica_engine)
+
+# Sessions for pure reads: every transaction is opened READ ONLY and is
+# rolled back on exit, so GET requests never pay for a COMMIT round trip.
+read_session_factory = async_sessionmaker(
+    engine,
+    class_=AsyncSession,
+    expire_on_commit=False,
+    autoflush=False,
+    info={"read_only": True},
+)
+
+replica_session_factory = async_sessionmaker(
+    replica_engine,
+    class_=AsyncSession,
+    expire_on_commit=False,
+    autoflush=False,
+    info={"read_only": True},
+)
+
+SAFE_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+_STICKY_KEY_PREFIX = "cg:rw"
+
+
+class ReadOnlySessionError(RuntimeError):
+    """Raised when code tries to write through a read-only session."""
+
+
+@event.listens_for(Session, "after_begin")
+def _set_transaction_read_only(session, transaction, connection):
+    if session.info.get("read_only"):
+        connection.exec_driver_sql("SET TRANSACTION READ ONLY")
+
+
+@event.listens_for(Session, "before_flush")
+def _reject_read_only_flush(session, flush_context, instances):
+    if session.info.get("read_only") and (session.new or session.dirty or session.deleted):
+        raise ReadOnlySessionError("Attempted to write through a read-only session.")
+
 
 class Base(DeclarativeBase):
     pass
 
 
-async def get_db():
-    async with async_session_factory() as session:
+class LazySession:
+    """
+    Request-scoped holder that only opens sessions on first access. Lets
+    dependencies that *might* need the DB (e.g. optional auth) share the
+    request's sessions without forcing one into existence.
+
+    session is the read-write primary session get_db hands out. On safe
+    methods, read_session is the read-only session get_read_db hands out,
+    and auth resolves through it too, so an authenticated GET holds one
+    pooled connection rather than one on each side.
+    """
+
+    def __init__(self, read_factory: async_sessionmaker | None = None):
+        self._session: AsyncSession | None = None
+        self._read_session: AsyncSession | None = None
+        self._read_factory = read_factory
+
+    @property
+    def is_open(self) -> bool:
+        return self._session is not None
+
+    @property
+    def session(self) -> AsyncSession:
+        if self._session is None:
+            self._session = async_session_factory()
+        return self._session
+
+    @property
+    def read_session(self) -> AsyncSession | None:
+        """Shared read-only session, or None on methods that write."""
+        if self._read_factory is None:
+            return None
+        if self._read_session is None:
+            self._read_session = self._read_factory()
+        return self._read_session
+
+    @property
+    def reads_from_replica(self) -> bool:
+        return self._read_factory is replica_session_factory and replica_engine is not engine
+
+    @property
+    def auth_session(self) -> AsyncSession:
+        """Where to resolve credentials: the primary if already open, else the read session."""
+        if self._session is None and self._read_factory is not None:
+            return self.read_session
+        return self.session
+
+    async def commit(self) -> None:
+        if self._session is not None:
+            await self._session.commit()
+
+    async def rollback(self) -> None:
+        if self._session is not None:
+            await self._session.rollback()
+
+    async def close(self) -> None:
+        if self._read_session is not None:
+            # Read-only: never committed.
+            await self._read_session.rollback()
+            await self._read_session.close()
+            self._read_session = None
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+
+def _sticky_key(request: Request) -> str | None:
+    """
+    Key identifying the caller's credential for read-your-writes routing.
+    Hashing the raw credential avoids any DB lookup or token verification.
+    """
+    credential = credential_from_headers(request.headers)
+    if not credential:
+        return None
+    return f"{_STICKY_KEY_PREFIX}:{credential_fingerprint(credential)}"
+
+
+async def _mark_recent_write(request: Request) -> None:
+    """Pin the caller's reads to the primary for the sticky window."""
+    key = _sticky_key(request)
+    if key is None:
+        return
+    try:
+        async with redis_client() as r:
+            await r.set(key, 1, ex=settings.replica_sticky_seconds)
+    except RedisUnavailable:
+        return
+    except Exception as e:
+        logger.warning("replica_sticky_mark_failed", error=str(e))
+
+
+async def _reads_pinned_to_primary(request: Request) -> bool:
+    key = _sticky_key(request)
+    if key is None:
+        return False
+    try:
+        async with redis_client() as r:
+            return bool(await r.exists(key))
+    except RedisUnavailable:
+        return False
+    except Exception as e:
+        # Prefer the replica over piling reads onto the primary.
+        logger.warning("replica_sticky_check_failed", error=str(e))
+        return False
+
+
+async def _read_factory(request: Request) -> async_sessionmaker:
+    """
+    Replica, unless the caller wrote within the last replica_sticky_seconds,
+    in which case reads go to the primary.
+    """
+    if replica_engine is not engine and await _reads_pinned_to_primary(request):
+        return read_session_factory
+    return replica_session_factory
+
+
+async def get_lazy_session(request: Request):
+    read_factory = None
+    if request.method in SAFE_METHODS:
+        read_factory = await _read_factory(request)
+    lazy = LazySession(read_factory)
+    try:
+        yield lazy
+        # Persist side effects on routes that read through get_read_db and
+        # never pull in get_db.
+        await lazy.commit()
+        if (
+            lazy.is_open
+            and request.method not in SAFE_METHODS
+            and replica_engine is not engine
+        ):
+            await _mark_recent_write(request)
+    except Exception:
+        await lazy.rollback()
+        raise
+    finally:
+        await lazy.close()
+
+
+async def get_db(lazy: LazySession = Depends(get_lazy_session)):
+    session = lazy.session
+    try:
+        yield session
+        await session.commit()
+    except Exception:
+        await session.rollback()
+        raise
+
+
+async def get_read_db(request: Request, lazy: LazySession = Depends(get_lazy_session)):
+    """
+    Read-only session for GET routes. The transaction runs in READ ONLY
+    mode and is always rolled back, never committed.
+
+    Served from the replica unless the caller wrote within the last
+    replica_sticky_seconds, in which case it reads from the primary. On
+    safe methods it is the request's shared read session (the one auth
+    used); elsewhere it is a session of its own.
+    """
+    if lazy.read_session is not None:
+        yield lazy.read_session
+        return
+
+    async with (await _read_factory(request))() as session:
         try:
             yield session
-            await session.commit()
-        except Exception:
-            await session.rollback()
-            raise
         finally:
-            await session.close()
+            await session.rollback()
@@ -0,0 +1,271 @@
+"""
+Duplicate-content detection for Common Ground.
+skill.md bans duplicate content farms; this catches them on write.
+
+Every post and comment gets two fingerprints of its normalized text:
+  content_hash  sha256 — exact duplicates after case/markup/whitespace folding
+  simhash       64-bit SimHash over word shingles — near duplicates
+Both are stored on the row; content_hash is indexed for the fallback
+below. Recent fingerprints also live
+in Redis for DEDUP_WINDOW_SECONDS so a write is checked with a handful of
+key lookups, not a table scan. Near duplicates are found by LSH banding:
+the SimHash is split into DEDUP_SIMHASH_BANDS bands, and any two hashes
+within DEDUP_SIMHASH_MAX_DISTANCE bits share at least one band exactly.
+
+The check reserves the fingerprint in the same Lua call that reads the
+window, so concurrent identical writes are counted against each other;
+a write that fails afterwards releases its reservation.
+When Redis is unavailable the check falls back to the content_hash index
+(exact duplicates only) and reserves nothing.
+"""
+import hashlib
+import html
+import re
+import time
+import unicodedata
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+import structlog
+from sqlalchemy import select, union_all
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.constants import (
+    DEDUP_MIN_LENGTH,
+    DEDUP_SIMHASH_BANDS,
+    DEDUP_SIMHASH_MAX_DISTANCE,
+    DEDUP_WINDOW_SECONDS,
+)
+from app.core.redis_client import RedisUnavailable, redis_client
+
+logger = structlog.get_logger()
+
+_KEY_PREFIX = "cg:dedup"
+_MARKUP_RE = re.compile(r"<[^>]*>|https?://\S+|[^\w]+")
+_SHINGLE = 3
+_BAND_BITS = 64 // DEDUP_SIMHASH_BANDS
+_BAND_MASK = (1 << _BAND_BITS) - 1
+
+
+def normalize_content(text: str) -> str:
+    """Fold case, entities, markup, URLs, punctuation and whitespace."""
+    text = unicodedata.normalize("NFKC", html.unescape(text)).casefold()
+    return _MARKUP_RE.sub(" ", text).strip()
+
+
+def content_hash(normalized: str) -> str:
+    return hashlib.sha256(normalized.encode()).hexdigest()
+
+
+def simhash(normalized: str) -> int:
+    """64-bit SimHash as a signed integer (fits a Postgres BIGINT)."""
+    tokens = normalized.split()
+    shingles = (
+        [" ".join(tokens[i:i + _SHINGLE]) for i in range(len(tokens) - _SHINGLE + 1)]
+        if len(tokens) >= _SHINGLE else tokens
+    )
+    if not shingles:
+        return 0
+    # Column-wise bit counts via string transposition: C-speed, no numpy.
+    rows = [
+        format(int.from_bytes(hashlib.blake2b(s.encode(), digest_size=8).digest(), "big"), "064b")
+        for s in shingles
+    ]
+    half = len(rows) / 2
+    bits = "".join("1" if column.count("1") > half else "0" for column in zip(*rows))
+    value = int(bits, 2)
+    return value - (1 << 64) if value >= 1 << 63 else value
+
+
+def _bands(value: int) -> list[int]:
+    unsigned = value & ((1 << 64) - 1)
+    return [(unsigned >> (i * _BAND_BITS)) & _BAND_MASK for i in range(DEDUP_SIMHASH_BANDS)]
+
+
+def _distance(a: int, b: int) -> int:
+    return ((a ^ b) & ((1 << 64) - 1)).bit_count()
+
+
+@dataclass
+class Fingerprint:
+    content_hash: str
+    simhash: int
+    # Too short to judge: "thanks!" from many actors is not a flood.
+    trivial: bool
+
+
+def fingerprint(*parts: Optional[str]) -> Fingerprint:
+    normalized = normalize_content(" ".join(p for p in parts if p))
+    return Fingerprint(
+        content_hash=content_hash(normalized),
+        simhash=simhash(normalized),
+        trivial=len(normalized) < DEDUP_MIN_LENGTH,
+    )
+
+
+@dataclass
+class DedupVerdict:
+    action: str  # "allow", "flag" or "reject"
+    copies: int = 0
+    reason: Optional[str] = None
+
+
+async def check_duplicate(
+    db: AsyncSession,
+    fp: Fingerprint,
+    author_id: str,
+    target_id: str,
+) -> DedupVerdict:
+    """
+    Decide on a new or edited post/comment before it is written, and
+    reserve its fingerprint for target_id (the id it has, or will be
+    inserted with), whose own entries never count as copies.
+    Reposting your own recent content is rejected outright; copies across
+    actors are auto-flagged from dedup_flag_copies and rejected from
+    dedup_reject_copies.
+
+    Checking and reserving are one atomic step, so of N identical writes
+    racing each other the k-th sees the k-1 before it. A rejected write's
+    reservation is dropped here; if an allowed write then fails, the
+    caller must release_content it.
+    """
+    if fp.trivial:
+        return DedupVerdict("allow")
+
+    reserved: list[str] = []
+    try:
+        authors, reserved = await _reserve_redis(fp, author_id, target_id)
+    except RedisUnavailable:
+        authors = await _recent_copies_db(db, fp)
+    except Exception as e:
+        logger.warning("dedup_check_failed", error=str(e))
+        authors = await _recent_copies_db(db, fp)
+    authors.pop(target_id, None)
+
+    verdict = _verdict(fp, author_id, authors)
+    if verdict.action == "reject" and reserved:
+        await _release(reserved, _member(fp, author_id, target_id))
+    return verdict
+
+
+def _verdict(fp: Fingerprint, author_id: str, authors: dict[str, str]) -> DedupVerdict:
+    copies = len(authors)
+    if author_id in authors.values():
+        return DedupVerdict("reject", copies, "You recently posted this content.")
+    if copies >= settings.dedup_reject_copies:
+        logger.warning("duplicate_flood_rejected", copies=copies, content_hash=fp.content_hash)
+        return DedupVerdict("reject", copies, "This content has been posted too many times.")
+    if copies >= settings.dedup_flag_copies:
+        return DedupVerdict(
+            "flag", copies,
+            f"Duplicate content: {copies} near-identical copies in the last "
+            f"{DEDUP_WINDOW_SECONDS // 60} minutes.",
+        )
+    return DedupVerdict("allow", copies)
+
+
+def _keys(fp: Fingerprint) -> list[str]:
+    """The exact-hash key, then one key per SimHash band."""
+    return [f"{_KEY_PREFIX}:h:{fp.content_hash}"] + [
+        f"{_KEY_PREFIX}:b{i}:{band}" for i, band in enumerate(_bands(fp.simhash))
+    ]
+
+
+def _member(fp: Fingerprint, author_id: str, target_id: str) -> str:
+    return f"{fp.simhash}:{author_id}:{target_id}"
+
+
+# KEYS = _keys(fp); ARGV[1] = now, ARGV[2] = window cutoff, ARGV[3] = TTL,
+# ARGV[4] = member. Returns each key's live members from before the add,
+# then adds the member to every key: read and reserve in one step.
+_RESERVE_SCRIPT = """
+local found = {}
+for i, key in ipairs(KEYS) do
+    redis.call('ZREMRANGEBYSCORE', key, 0, ARGV[2])
+    found[i] = redis.call('ZRANGE', key, 0, -1)
+    redis.call('ZADD', key, ARGV[1], ARGV[4])
+    redis.call('EXPIRE', key, ARGV[3])
+end
+return found
+"""
+
+
+async def _reserve_redis(
+    fp: Fingerprint, author_id: str, target_id: str,
+) -> tuple[dict[str, str], list[str]]:
+    """
+    Record fp for target_id. Returns target id -> author id for the recent
+    exact and near copies it joins, and the keys it was newly added to (an
+    edit keeping its SimHash already has its band entries).
+    """
+    now = time.time()
+    keys, member = _keys(fp), _member(fp, author_id, target_id)
+    async with redis_client() as r:
+        results = await r.eval(
+            _RESERVE_SCRIPT, len(keys), *keys,
+            now, now - DEDUP_WINDOW_SECONDS, DEDUP_WINDOW_SECONDS, member,
+        )
+    fresh = [key for key, members in zip(keys, results) if member not in members]
+
+    copies: dict[str, str] = {}
+    exact, *banded = results
+    for member in exact:
+        _, author, target = member.split(":")
+        copies[target] = author
+    for members in banded:
+        for member in members:
+            value, author, target = member.split(":")
+            if _distance(int(value), fp.simhash) <= DEDUP_SIMHASH_MAX_DISTANCE:
+                copies[target] = author
+    return copies, fresh
+
+
+async def _recent_copies_db(db: AsyncSession, fp: Fingerprint) -> dict[str, str]:
+    """Exact copies only, via the content_hash indexes."""
+    from app.models.comment import Comment
+    from app.models.post import Post
+
+    since = datetime.now(timezone.utc) - timedelta(seconds=DEDUP_WINDOW_SECONDS)
+    query = union_all(*(
+        select(model.id, model.author_id)
+        .where(model.content_hash == fp.content_hash, model.created_at >= since)
+        .limit(settings.dedup_reject_copies + 1)
+        for model in (Post, Comment)
+    ))
+    result = await db.execute(query)
+    return {str(row.id): str(row.author_id) for row in result}
+
+
+async def release_content(
+    fp: Fingerprint,
+    author_id: str,
+    target_id: str,
+    keep: Optional[Fingerprint] = None,
+) -> None:
+    """
+    Forget fp for target_id: a write that failed after check_duplicate, or
+    an edited item's previous text. keep is the edited item's new
+    fingerprint; entries it shares with fp are left in place.
+    """
+    if fp.trivial:
+        return
+    keys = _keys(fp)
+    if keep is not None and keep.simhash == fp.simhash:
+        # Same SimHash: the band entries are the new text's too.
+        keys = keys[:1]
+    await _release(keys, _member(fp, author_id, target_id))
+
+
+async def _release(keys: list[str], member: str) -> None:
+    try:
+        async with redis_client() as r:
+            pipe = r.pipeline(transaction=False)
+            for key in keys:
+                pipe.zrem(key, member)
+            await pipe.execute()
+    except RedisUnavailable:
+        return
+    except Exception as e:
+        logger.warning("dedup_release_failed", error=str(e))
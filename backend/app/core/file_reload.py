@@ -0,0 +1,82 @@
+"""
+Hot-reloaded JSON override files.
+Used for the rate-limit policy table and the ban-term list: a value is
+built from built-in defaults plus an optional JSON document, and rebuilt
+whenever the file's mtime changes (checked every few seconds), so
+operators can tune them without a redeploy.
+
+A file that disappears, cannot be parsed, or fails to build keeps the
+last good value in force; with no good value yet, the defaults apply.
+"""
+import json
+import os
+import time
+from typing import Callable, Generic, Optional, TypeVar
+
+import structlog
+
+logger = structlog.get_logger()
+
+T = TypeVar("T")
+
+# How often the file's mtime is checked.
+_RELOAD_CHECK_SECONDS = 5.0
+
+
+class ReloadingFile(Generic[T]):
+    """
+    Args:
+        name: Log event prefix, e.g. "ban_terms" -> "ban_terms_reloaded".
+        path: Returns the configured file path, or None for defaults only.
+        build: Builds the value from the parsed document (None: defaults).
+    """
+
+    def __init__(
+        self,
+        name: str,
+        path: Callable[[], Optional[str]],
+        build: Callable[[Optional[dict]], T],
+    ):
+        self.name = name
+        self._path = path
+        self._build = build
+        self._value: Optional[T] = None
+        self._loaded_mtime: Optional[float] = None
+        self._checked_at = 0.0
+
+    def get(self) -> T:
+        """Current value, rebuilding it if the file changed."""
+        now = time.monotonic()
+        if self._value is not None and now - self._checked_at < _RELOAD_CHECK_SECONDS:
+            return self._value
+        self._checked_at = now
+
+        path = self._path()
+        mtime = None
+        if path:
+            try:
+                mtime = os.stat(path).st_mtime
+            except OSError as e:
+                logger.error(f"{self.name}_file_unreadable", path=path, error=str(e))
+                mtime = self._loaded_mtime
+        if self._value is not None and mtime == self._loaded_mtime:
+            return self._value
+
+        try:
+            document = None
+            if path and mtime is not None:
+                with open(path) as f:
+                    document = json.load(f)
+            value = self._build(document)
+        except Exception as e:
+            # Keep the last good value rather than falling back to defaults.
+            logger.error(f"{self.name}_reload_failed", path=path, error=str(e))
+            self._loaded_mtime = mtime
+            if self._value is None:
+                self._value = self._build(None)
+            return self._value
+
+        if self._value is not None:
+            logger.info(f"{self.name}_reloaded", path=path)
+        self._value, self._loaded_mtime = value, mtime
+        return self._value
@@ -0,0 +1,65 @@
+"""
+Short-lived cache of rendered response pages.
+Each PageCache keeps its pages as fields of one Redis hash, so
+invalidation is a single DEL however many variants were cached, and the
+whole hash expires TTL seconds after its first page was stored. Pages are
+stored as the serialized response body, so a hit skips both the query
+and response validation.
+
+Redis failures are cache misses: callers always fall back to the query.
+"""
+from typing import Optional
+
+import structlog
+
+from app.core.redis_client import RedisUnavailable, redis_client
+
+logger = structlog.get_logger()
+
+_KEY_PREFIX = "cg:pages"
+
+# HSET, and start the hash's TTL only if it has none (EXPIRE .. NX needs
+# Redis 7).
+_PUT_SCRIPT = """
+redis.call('HSET', KEYS[1], ARGV[1], ARGV[2])
+if redis.call('TTL', KEYS[1]) < 0 then
+    redis.call('EXPIRE', KEYS[1], ARGV[3])
+end
+"""
+
+
+class PageCache:
+    def __init__(self, name: str, ttl_seconds: int):
+        self.key = f"{_KEY_PREFIX}:{name}"
+        self.ttl_seconds = ttl_seconds
+
+    async def get(self, variant: str) -> Optional[bytes]:
+        try:
+            async with redis_client() as r:
+                page = await r.hget(self.key, variant)
+            # The shared pool decodes responses; pages are handed back as stored.
+            return page.encode() if page is not None else None
+        except RedisUnavailable:
+            return None
+        except Exception as e:
+            logger.warning("page_cache_read_failed", cache=self.key, error=str(e))
+            return None
+
+    async def put(self, variant: str, body: bytes) -> None:
+        try:
+            async with redis_client() as r:
+                await r.eval(_PUT_SCRIPT, 1, self.key, variant, body, self.ttl_seconds)
+        except RedisUnavailable:
+            return
+        except Exception as e:
+            logger.warning("page_cache_write_failed", cache=self.key, error=str(e))
+
+    async def invalidate(self) -> None:
+        try:
+            async with redis_client() as r:
+                await r.delete(self.key)
+        except RedisUnavailable:
+            # Stale for at most ttl_seconds.
+            return
+        except Exception as e:
+            logger.warning("page_cache_invalidate_failed", cache=self.key, error=str(e))
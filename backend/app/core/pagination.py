@@ -0,0 +1,54 @@
+"""
+Opaque keyset-pagination cursors.
+A cursor is the sort key of the last row served (plus anything else the
+route needs to carry), JSON-encoded and base64url'd. Clients pass it
+back unchanged; routes decode it and continue with WHERE (key) < (...)
+instead of OFFSET, so every page costs the same however deep it is.
+
+Cursors whose contents the server relies on (e.g. a page number that
+decides whether a page is cached) are signed, so clients can replay the
+cursors they were given but cannot forge new ones.
+"""
+import base64
+import hashlib
+import hmac
+import json
+
+from app.core.config import settings
+
+_SIGNATURE_BYTES = 12
+
+
+def encode_cursor(*values) -> str:
+    raw = json.dumps(values, default=str, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+
+def decode_cursor(cursor: str) -> list:
+    """Values passed to encode_cursor. Raises ValueError if malformed."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = json.loads(raw)
+    except (ValueError, UnicodeDecodeError) as e:
+        raise ValueError("Invalid cursor") from e
+    if not isinstance(values, list):
+        raise ValueError("Invalid cursor")
+    return values
+
+
+def _signature(cursor: str) -> str:
+    digest = hmac.new(settings.jwt_secret_key.encode(), cursor.encode(), hashlib.sha256).digest()
+    return base64.urlsafe_b64encode(digest[:_SIGNATURE_BYTES]).decode()
+
+
+def encode_signed_cursor(*values) -> str:
+    cursor = encode_cursor(*values)
+    return f"{cursor}.{_signature(cursor)}"
+
+
+def decode_signed_cursor(cursor: str) -> list:
+    """Values passed to encode_signed_cursor. Raises ValueError if malformed or forged."""
+    payload, _, signature = cursor.rpartition(".")
+    if not payload or not hmac.compare_digest(signature, _signature(payload)):
+        raise ValueError("Invalid cursor")
+    return decode_cursor(payload)
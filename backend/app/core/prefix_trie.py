@@ -0,0 +1,104 @@
+"""
+Per-worker prefix trie caching autocomplete results.
+Only short prefixes are stored: "a", "al", "ali" are typed by nearly
+everyone, match the most rows, and so cost the database the most, while
+longer prefixes are selective and cheap to query. Each cached prefix
+holds its results for a short TTL; when the trie is full, the least-hit
+quarter of the entries is dropped and the survivors' hit counts halved,
+so the trie converges on whatever prefixes are hot right now.
+
+Nothing invalidates entries across workers; a new or renamed actor shows
+up for cached prefixes once the TTL passes.
+"""
+import time
+from typing import Any, Optional
+
+
+class _Node:
+    __slots__ = ("children", "value", "expires_at", "hits")
+
+    def __init__(self):
+        self.children: dict[str, "_Node"] = {}
+        self.value: Any = None
+        self.expires_at = 0.0
+        self.hits = 0
+
+
+class PrefixTrie:
+    def __init__(self, max_depth: int, max_entries: int, ttl: float):
+        self.max_depth = max_depth
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._root = _Node()
+        self._entries: list[tuple[str, _Node]] = []
+
+    def cacheable(self, prefix: str) -> bool:
+        return 0 < len(prefix) <= self.max_depth
+
+    def _walk(self, prefix: str, create: bool = False) -> Optional[_Node]:
+        node = self._root
+        for ch in prefix:
+            child = node.children.get(ch)
+            if child is None:
+                if not create:
+                    return None
+                child = node.children[ch] = _Node()
+            node = child
+        return node
+
+    def get(self, prefix: str) -> Optional[Any]:
+        """Cached value for prefix, or None if absent or expired."""
+        node = self._walk(prefix)
+        if node is None or node.value is None:
+            return None
+        if node.expires_at <= time.monotonic():
+            return None
+        node.hits += 1
+        return node.value
+
+    def put(self, prefix: str, value: Any) -> None:
+        if not self.cacheable(prefix):
+            return
+        node = self._walk(prefix, create=True)
+        if node.value is None:
+            if len(self._entries) >= self.max_entries:
+                self._evict()
+            self._entries.append((prefix, node))
+        node.value = value
+        node.expires_at = time.monotonic() + self.ttl
+        node.hits += 1
+
+    def clear(self) -> None:
+        self._root = _Node()
+        self._entries = []
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _evict(self) -> None:
+        now = time.monotonic()
+        live = [(p, n) for p, n in self._entries if n.expires_at > now]
+        live.sort(key=lambda entry: entry[1].hits, reverse=True)
+        keep = live[:self.max_entries * 3 // 4]
+        kept = {id(node) for _, node in keep}
+        for prefix, node in self._entries:
+            if id(node) not in kept:
+                node.value = None
+                self._prune(prefix)
+        for _, node in keep:
+            node.hits //= 2
+        self._entries = keep
+
+    def _prune(self, prefix: str) -> None:
+        """Remove now-empty nodes along prefix, deepest first."""
+        path = [self._root]
+        for ch in prefix:
+            child = path[-1].children.get(ch)
+            if child is None:
+                return
+            path.append(child)
+        for depth in range(len(prefix), 0, -1):
+            node = path[depth]
+            if node.value is not None or node.children:
+                return
+            del path[depth - 1].children[prefix[depth - 1]]
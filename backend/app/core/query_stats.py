@@ -0,0 +1,149 @@
+"""
+Per-request SQL instrumentation for Common Ground.
+Counts statements, DB time and repeated statement shapes so N+1 loops
+show up in Server-Timing headers (dev) and structured logs (prod).
+"""
+import re
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.core.config import settings
+from app.core import slow_queries
+
+_WHITESPACE_RE = re.compile(r"\s+")
+_STRING_RE = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_RE = re.compile(r"(?<![$\w])\d+(?:\.\d+)?\b")
+_BIND_RE = re.compile(r"\$\d+")
+_PARAM_LIST_RE = re.compile(r"\(\s*(?:(?:\$\d+|%\(\w+\)s|\?|:\w+|\[POSTCOMPILE_\w+\])\s*,?\s*)+\)")
+
+
+def normalize_sql(statement: str) -> str:
+    """
+    Reduce a statement to its shape: literals become '?' and expanded
+    IN-lists collapse, so the same query with different values compares equal.
+    """
+    shape = _STRING_RE.sub("?", statement)
+    shape = _NUMBER_RE.sub("?", shape)
+    shape = _PARAM_LIST_RE.sub("(?)", shape)
+    shape = _BIND_RE.sub("?", shape)
+    return _WHITESPACE_RE.sub(" ", shape).strip()
+
+
+class QueryStats:
+    """Statement counters for one request (or one test block)."""
+
+    def __init__(self, route: str | None = None):
+        self.route = route
+        self.count = 0
+        self.total_ms = 0.0
+        self.shapes: Counter[str] = Counter()
+
+    def record(self, statement: str, duration_ms: float) -> None:
+        self.count += 1
+        self.total_ms += duration_ms
+        self.shapes[normalize_sql(statement)] += 1
+
+    @property
+    def duplicates(self) -> dict[str, int]:
+        """Statement shapes executed more than once, with their counts."""
+        return {shape: n for shape, n in self.shapes.items() if n > 1}
+
+    @property
+    def max_repeat(self) -> int:
+        return max(self.shapes.values(), default=0)
+
+
+# Stats for the request currently being served (set by QueryStatsMiddleware).
+_current_stats: ContextVar[QueryStats | None] = ContextVar("cg_query_stats", default=None)
+
+# Explicit collectors (statement_budget) that see every request's statements
+# regardless of which task or thread serves it — TestClient runs the app
+# elsewhere.
+_collectors: list[QueryStats] = []
+
+
+def begin_request_stats(route: str | None = None) -> QueryStats:
+    stats = QueryStats(route)
+    _current_stats.set(stats)
+    return stats
+
+
+def current_stats() -> QueryStats | None:
+    return _current_stats.get()
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    # Kept on the execution context, not a per-connection stack: a statement
+    # that raises never reaches after_cursor_execute, and its start time
+    # must not be left behind for the next statement to pop.
+    context._cg_query_start = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = context._cg_query_start
+    duration_ms = (time.perf_counter() - started) * 1000
+    if slow_queries.is_explaining():
+        return
+
+    stats = _current_stats.get()
+    if stats is not None:
+        stats.record(statement, duration_ms)
+        # Request statements only: background writers and schedulers would
+        # make budgets depend on timing.
+        for collector in _collectors:
+            collector.record(statement, duration_ms)
+
+    if duration_ms >= settings.slow_query_threshold_ms:
+        slow_queries.report_slow_statement(
+            conn.engine,
+            statement,
+            normalize_sql(statement),
+            parameters,
+            duration_ms,
+            stats.route if stats is not None else None,
+        )
+
+
+def instrument_engine(engine: AsyncEngine) -> None:
+    """Attach statement timing listeners to an async engine (idempotent)."""
+    sync_engine = engine.sync_engine
+    slow_queries.register_engine(engine)
+    if event.contains(sync_engine, "before_cursor_execute", _before_cursor_execute):
+        return
+    event.listen(sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(sync_engine, "after_cursor_execute", _after_cursor_execute)
+
+
+@contextmanager
+def statement_budget(max_statements: int):
+    """
+    Test helper: fail if requests served during the enclosed block run more
+    than max_statements in total.
+    Tests get it as the statement_budget fixture (tests/conftest.py):
+
+        def test_feed(client, statement_budget):
+            with statement_budget(4):
+                client.get("/api/v1/feed")
+    """
+    stats = QueryStats()
+    _collectors.append(stats)
+    try:
+        yield stats
+    finally:
+        _collectors.remove(stats)
+
+    if stats.count > max_statements:
+        repeated = "\n".join(
+            f"  {n}x {shape}" for shape, n in sorted(
+                stats.duplicates.items(), key=lambda item: -item[1]
+            )
+        )
+        raise AssertionError(
+            f"Statement budget exceeded: {stats.count} > {max_statements}"
+            + (f"\nRepeated statements:\n{repeated}" if repeated else "")
+        )
@@ -1,96 +1,499 @@
 """
 Redis-backed rate limiter for Common Ground.
-Sliding window counters with per-IP and per-actor tracking.
+GCRA (generic cell rate algorithm) evaluated atomically in a single Lua
+script: no read-then-write race, and a true sliding window rather than a
+counter that resets on every hit.
+
+Authenticated limits are keyed by actor and scaled by trust tier, with a
+looser per-IP shield; anonymous limits are keyed by IP. A credential the
+principal cache does not know yet still gets its own bucket: the subject
+of a validly signed access token (the same actor bucket), or the
+fingerprint of an API key, at the untiered limit.
+
+The per-IP shield lives in its own key namespace (":shield:"), apart from
+the anonymous per-IP limit (":ip:"), since the two have different limits.
+
+Each worker leases small batches of tokens from Redis and spends them
+locally, so a client well under its limit costs one round trip per lease
+rather than one per request. A worker holds at most one lease per limiter
+key, shared by every caller of that key: all actors behind one IP draw on
+the same shield lease. Leases are charged to Redis before any token is
+spent, and a lease is only spendable for RATE_LIMIT_LEASE_SECONDS; its
+unused tokens are refunded on the next round trip for the same key.
+
+An idle worker's leftovers come back only when that worker next sees the
+key, so leases are sized from the budget actually left in Redis: each is
+at most 1/(2 x workers) of it (and RATE_LIMIT_LEASE_MAX). All workers'
+leases together stay under half of what remains, and once fewer than
+2 x workers tokens remain, every request is a plain per-request check,
+so a client is never turned away while most of its budget sits unspent
+in other workers.
+
+Overshoot bound: Redis never grants more than `limit` tokens per window,
+so the only slack is tokens granted just before a window and spent inside
+it, at most one lease per worker per key. Over any window a key admits
+at most
+    limit + workers x RATE_LIMIT_LEASE_MAX
+requests, however many callers share it.
+
+While Redis is unreachable (see redis_client), each worker enforces its
+share (limit / workers) of every limit locally instead of failing open.
 """
-import structlog
-from fastapi import Depends, HTTPException, Request
+import math
+import time
+from typing import Mapping
 
-import redis.asyncio as aioredis
+import structlog
 
 from app.core.config import settings
+from app.core.redis_client import RedisUnavailable, redis_client
+from app.core.constants import (
+    API_KEY_PREFIX,
+    HIGH_TRUST_RATE_MULTIPLIER,
+    HIGH_TRUST_THRESHOLD,
+    LOW_TRUST_RATE_MULTIPLIER,
+    LOW_TRUST_THRESHOLD,
+    RATE_LIMIT_IP_SHIELD_MULTIPLIER,
+    RATE_LIMIT_LEASE_MAX,
+    RATE_LIMIT_LEASE_SECONDS,
+)
+from app.core.security import access_token_subject, credential_fingerprint
 
 logger = structlog.get_logger()
 
-_redis_pool: aioredis.Redis | None = None
+# KEYS[1..n] = limiter keys, all checked and charged together
+# ARGV[1] = window (ms), ARGV[2] = lease divisor; then per key i,
+# ARGV[3i..3i+2] = limit, most tokens wanted, tokens refunded from an
+# expired lease.
+# Each key is granted up to 1/divisor of its remaining budget (at least
+# one token, at most the amount wanted), but only if every key can afford
+# one; otherwise nothing is charged.
+# Returns {1, granted, remaining, reset_ms, ...} with one triple per key,
+# or {0, key_index, reset_ms, retry_after_ms} for the key that rejected.
+# The stored value is the theoretical arrival time (TAT) in ms; Redis TIME
+# is the clock, so all workers agree on "now".
+_GCRA_SCRIPT = """
+local window = tonumber(ARGV[1])
+local divisor = tonumber(ARGV[2])
 
+local t = redis.call('TIME')
+local now = tonumber(t[1]) * 1000 + math.floor(tonumber(t[2]) / 1000)
 
-async def get_redis() -> aioredis.Redis:
-    global _redis_pool
-    if _redis_pool is None:
-        _redis_pool = aioredis.from_url(
-            settings.redis_url,
-            decode_responses=True,
-            max_connections=20,
-        )
-    return _redis_pool
+local tats, intervals, grants = {}, {}, {}
+local reject, worst_retry = nil, 0
+for i = 1, #KEYS do
+    local interval = window / tonumber(ARGV[3 * i])
+    local want = tonumber(ARGV[3 * i + 1])
+    local refund = tonumber(ARGV[3 * i + 2])
+    local tat = tonumber(redis.call('GET', KEYS[i]))
+    if not tat or tat < now then
+        tat = now
+    end
+    if refund > 0 then
+        tat = math.max(now, tat - interval * refund)
+    end
+    local available = math.floor((now + window - tat) / interval)
+    if available < 1 then
+        local retry = tat + interval - window - now
+        if reject == nil or retry > worst_retry then
+            reject, worst_retry = i, retry
+        end
+    end
+    tats[i], intervals[i] = tat, interval
+    grants[i] = math.max(1, math.min(want, math.floor(available / divisor)))
+end
+
+if reject ~= nil then
+    -- Refunds stand even when the request is rejected; a TAT refunded
+    -- down to now means the key is back to a full bucket.
+    for i = 1, #KEYS do
+        if tonumber(ARGV[3 * i + 2]) > 0 then
+            if tats[i] > now then
+                redis.call('SET', KEYS[i], string.format('%.3f', tats[i]), 'PX', math.ceil(tats[i] - now))
+            else
+                redis.call('DEL', KEYS[i])
+            end
+        end
+    end
+    return {0, reject, math.ceil(tats[reject] - now), math.ceil(worst_retry)}
+end
+
+local result = {1}
+for i = 1, #KEYS do
+    local new_tat = tats[i] + intervals[i] * grants[i]
+    redis.call('SET', KEYS[i], string.format('%.3f', new_tat), 'PX', math.ceil(new_tat - now))
+    result[#result + 1] = grants[i]
+    result[#result + 1] = math.floor((now + window - new_tat) / intervals[i])
+    result[#result + 1] = math.ceil(new_tat - now)
+end
+return result
+"""
+
+# Credential -> (actor id, trust score), so limits can be keyed and scaled
+# per actor without a DB query, even before authentication has run.
+_PRINCIPAL_KEY_PREFIX = "cg:principal"
+_PRINCIPAL_TTL = 600
+# Per-worker memo of recent cache writes: fingerprint -> (written_at, trust).
+_principal_writes: dict[str, tuple[float, float]] = {}
+_PRINCIPAL_WRITES_MAX = 10000
+# Per-worker memo of cache hits: fingerprint -> (read_at, principal).
+_principal_reads: dict[str, tuple[float, tuple[str, float]]] = {}
+_PRINCIPAL_LOCAL_TTL = 30
+
+_gcra = None
+
+
+class _Lease:
+    """Tokens this worker has already charged to Redis for one limiter key."""
+
+    __slots__ = ("limit", "tokens", "expires_at", "remaining", "reset_at", "retry_at")
+
+    def __init__(
+        self,
+        limit: int,
+        tokens: int,
+        remaining: int,
+        reset_ms: int,
+        retry_after_ms: int = 0,
+    ):
+        now = time.monotonic()
+        self.limit = limit
+        self.tokens = tokens
+        self.expires_at = now + RATE_LIMIT_LEASE_SECONDS
+        # Redis headroom after this lease was charged, for headers and sizing.
+        self.remaining = remaining
+        self.reset_at = now + reset_ms / 1000
+        # Set on a rejection: the key is denied locally until then.
+        self.retry_at = now + retry_after_ms / 1000 if retry_after_ms else None
+        if self.retry_at is not None:
+            self.expires_at = min(self.expires_at, self.retry_at)
+
+    def spendable(self, now: float) -> bool:
+        return now < self.expires_at and self.retry_at is None and self.tokens > 0
+
+
+# Per-worker leases: limiter key -> _Lease. Keyed by bucket, not by caller,
+# so every caller sharing a key (e.g. actors behind one IP shield) draws
+# from this worker's one lease on it.
+_leases: dict[str, _Lease] = {}
+_LEASES_MAX = 10000
+# A lease takes at most 1/(this x workers) of a key's remaining budget.
+_LEASE_DIVISOR_PER_WORKER = 2
+
+# Per-worker GCRA state while Redis is unavailable: key -> TAT (monotonic ms).
+_fallback_tats: dict[str, float] = {}
+
+
+def trust_rate_multiplier(trust_score: float) -> float:
+    """Quota multiplier for an actor's trust tier."""
+    if trust_score < LOW_TRUST_THRESHOLD:
+        return LOW_TRUST_RATE_MULTIPLIER
+    if trust_score >= HIGH_TRUST_THRESHOLD:
+        return HIGH_TRUST_RATE_MULTIPLIER
+    return 1.0
+
+
+async def remember_principal(credential: str, actor_id: str, trust_score: float) -> None:
+    """
+    Cache the actor behind a credential after successful authentication.
+    Rewrites are skipped while the cached entry is fresh and its trust tier
+    unchanged, so steady traffic costs no Redis writes here.
+    """
+    fingerprint = credential_fingerprint(credential)
+    now = time.monotonic()
+    if len(_principal_reads) >= _PRINCIPAL_WRITES_MAX:
+        _principal_reads.clear()
+    _principal_reads[fingerprint] = (now, (actor_id, trust_score))
+    previous = _principal_writes.get(fingerprint)
+    if (
+        previous is not None
+        and now - previous[0] < _PRINCIPAL_TTL / 2
+        and trust_rate_multiplier(previous[1]) == trust_rate_multiplier(trust_score)
+    ):
+        return
+
+    try:
+        async with redis_client() as r:
+            await r.set(
+                f"{_PRINCIPAL_KEY_PREFIX}:{fingerprint}",
+                f"{actor_id}|{trust_score}",
+                ex=_PRINCIPAL_TTL,
+            )
+    except RedisUnavailable:
+        return
+    except Exception as e:
+        logger.warning("principal_cache_write_failed", error=str(e))
+        return
+
+    if len(_principal_writes) >= _PRINCIPAL_WRITES_MAX:
+        _principal_writes.clear()
+    _principal_writes[fingerprint] = (now, trust_score)
+
+
+async def lookup_principal(credential: str) -> tuple[str, float] | None:
+    """
+    Cached (actor id, trust score) for a credential, if known.
+    Hits are memoized per worker for _PRINCIPAL_LOCAL_TTL seconds.
+    """
+    fingerprint = credential_fingerprint(credential)
+    now = time.monotonic()
+    memo = _principal_reads.get(fingerprint)
+    if memo is not None and now - memo[0] < _PRINCIPAL_LOCAL_TTL:
+        return memo[1]
+
+    async with redis_client() as r:
+        cached = await r.get(f"{_PRINCIPAL_KEY_PREFIX}:{fingerprint}")
+    if not cached:
+        return None
+    actor_id, _, trust = cached.partition("|")
+    principal = (actor_id, float(trust))
+
+    if len(_principal_reads) >= _PRINCIPAL_WRITES_MAX:
+        _principal_reads.clear()
+    _principal_reads[fingerprint] = (now, principal)
+    return principal
+
+
+def credential_principal(credential: str) -> tuple[str, None] | None:
+    """
+    (bucket id, unknown trust) for a credential not in the principal cache,
+    or None if it identifies nobody. Access tokens are signature-checked
+    so nobody can spend another actor's bucket; an API key is only
+    fingerprinted, and a made-up one gets a bucket of its own that buys
+    nothing past authentication.
+    """
+    actor_id = access_token_subject(credential)
+    if actor_id:
+        return actor_id, None
+    if credential.startswith(API_KEY_PREFIX):
+        return f"key:{credential_fingerprint(credential)}", None
+    return None
+
+
+def _get_gcra_script(r):
+    """Script handle: EVALSHA with transparent EVAL fallback on first use."""
+    global _gcra
+    if _gcra is None:
+        _gcra = r.register_script(_GCRA_SCRIPT)
+    return _gcra
 
 
 class RateLimiter:
     """
-    FastAPI dependency that enforces per-IP rate limits via Redis.
-    Usage: Depends(RateLimiter(requests=5, window=300, prefix="login"))
+    One rate-limit policy, enforced via Redis.
+    Routes are mapped to limiters by the policy table in rate_policies.py
+    and checked by RateLimitMiddleware before the request reaches FastAPI.
+
+    With per_actor=True, authenticated callers are limited per actor at
+    requests x trust multiplier, inside a per-IP shield of
+    requests x RATE_LIMIT_IP_SHIELD_MULTIPLIER. Callers that cannot be
+    identified fall back to a plain per-IP limit.
+
+    Produces IETF draft RateLimit-* headers for every checked request so
+    clients can pace themselves, plus Retry-After on rejection.
     """
 
-    def __init__(self, requests: int, window: int, prefix: str = "general"):
+    def __init__(
+        self,
+        requests: int,
+        window: int,
+        prefix: str = "general",
+        per_actor: bool = False,
+    ):
         """
         Args:
             requests: Max number of requests allowed in the window.
             window: Time window in seconds.
             prefix: Key prefix for grouping (e.g., "login", "register").
+            per_actor: Key by authenticated actor, scaled by trust tier.
         """
         self.requests = requests
         self.window = window
         self.prefix = prefix
+        self.per_actor = per_actor
 
-    async def __call__(self, request: Request) -> None:
+    async def check(
+        self,
+        client_ip: str,
+        principal: tuple[str, float | None] | None = None,
+    ) -> tuple[bool, dict[str, str]]:
+        """
+        Charge one request. Returns (allowed, headers).
+        principal is the (actor id, trust score) from the principal cache,
+        or credential_principal's bucket with no trust score.
+        """
+        checks = self._checks(client_ip, principal)
+        keys = tuple(key for key, _ in checks)
+        limits = tuple(limit for _, limit in checks)
         try:
-            r = await get_redis()
-            client_ip = self._get_client_ip(request)
-            key = f"cg:rate:{self.prefix}:{client_ip}"
+            now = time.monotonic()
+            leases = []
+            for key, limit in checks:
+                lease = _leases.get(key)
+                if lease is not None and lease.limit != limit:
+                    # Trust tier changed: the old lease's tokens are simply forfeited.
+                    lease = None
+                if lease is not None and lease.retry_at is not None and now < lease.expires_at:
+                    return False, self._reject(client_ip, key, lease, now)
+                leases.append(lease)
+
+            # Keys without a spendable lease go to Redis in one round trip,
+            # which returns each expired lease's leftovers and charges the
+            # next one. The others are spent locally.
+            renew = [
+                i for i, lease in enumerate(leases)
+                if lease is None or not lease.spendable(now)
+            ]
+            if renew:
+                args = [self.window * 1000, _LEASE_DIVISOR_PER_WORKER * max(1, settings.rate_limit_workers)]
+                for i in renew:
+                    lease = leases[i]
+                    refund = lease.tokens if lease is not None and lease.retry_at is None else 0
+                    args += [limits[i], RATE_LIMIT_LEASE_MAX, refund]
+                async with redis_client() as r:
+                    result = await _get_gcra_script(r)(
+                        keys=[keys[i] for i in renew], args=args, client=r,
+                    )
+
+                if not result[0]:
+                    # Remember the rejection so retries until Retry-After are
+                    # answered without another round trip. Any refunds went
+                    # through, so the other renewed leases are spent.
+                    _, index, reset_ms, retry_after_ms = result
+                    rejected = renew[index - 1]
+                    for i in renew:
+                        _leases.pop(keys[i], None)
+                    lease = _Lease(limits[rejected], 0, 0, reset_ms, max(1, retry_after_ms))
+                    self._store_lease(keys[rejected], lease)
+                    return False, self._reject(client_ip, keys[rejected], lease, time.monotonic())
 
-            current = await r.get(key)
-            if current is not None and int(current) >= self.requests:
+                for n, i in enumerate(renew):
+                    granted, remaining, reset_ms = result[1 + 3 * n:4 + 3 * n]
+                    leases[i] = _Lease(limits[i], granted, remaining, reset_ms)
+                    self._store_lease(keys[i], leases[i])
+
+            # The binding key is the one with the least headroom left.
+            now = time.monotonic()
+            for lease in leases:
+                lease.tokens -= 1
+            binding = min(leases, key=lambda lease: lease.remaining + lease.tokens)
+            return True, self._headers(
+                binding.limit,
+                binding.remaining + binding.tokens,
+                max(0, round((binding.reset_at - now) * 1000)),
+            )
+        except RedisUnavailable:
+            return self._fallback_check(client_ip, keys, limits)
+        except Exception as e:
+            # Never fail requests because Redis is unreachable: degrade to
+            # approximate per-worker limits until the breaker recovers.
+            logger.error("rate_limiter_redis_error", error=str(e) or type(e).__name__)
+            return self._fallback_check(client_ip, keys, limits)
+
+    def _fallback_check(
+        self,
+        client_ip: str,
+        keys: tuple[str, ...],
+        limits: tuple[int, ...],
+    ) -> tuple[bool, dict[str, str]]:
+        """
+        Degraded mode: the same GCRA, in this worker's memory, at each
+        limit's per-worker share. Approximate, but still enforcing.
+        """
+        now = time.monotonic() * 1000
+        window = self.window * 1000
+        workers = max(1, settings.rate_limit_workers)
+        shares = [max(1, limit // workers) for limit in limits]
+
+        new_tats = []
+        binding, least, reset_tat = 0, None, now
+        for i, (key, share) in enumerate(zip(keys, shares)):
+            interval = window / share
+            tat = max(now, _fallback_tats.get(key, now))
+            new_tat = tat + interval
+            if new_tat - window > now:
                 logger.warning(
                     "rate_limit_exceeded",
                     prefix=self.prefix,
+                    key=key,
                     ip=client_ip,
-                    limit=self.requests,
+                    limit=share,
                     window=self.window,
+                    degraded=True,
                 )
-                raise HTTPException(
-                    status_code=429,
-                    detail="Too many requests. Please try again later.",
-                )
+                headers = self._headers(share, 0, round(tat - now))
+                headers["Retry-After"] = str(max(1, math.ceil((new_tat - window - now) / 1000)))
+                return False, headers
+            remaining = math.floor((now + window - new_tat) / interval)
+            if least is None or remaining < least:
+                binding, least, reset_tat = i, remaining, new_tat
+            new_tats.append(new_tat)
 
-            pipe = r.pipeline()
-            pipe.incr(key)
-            pipe.expire(key, self.window)
-            await pipe.execute()
-        except HTTPException:
-            raise
-        except Exception as e:
-            # If Redis is down, allow the request but log the failure.
-            # Never block the service because rate limiting is unavailable.
-            logger.error("rate_limiter_redis_error", error=str(e))
+        if len(_fallback_tats) >= _LEASES_MAX:
+            _fallback_tats.clear()
+        for key, new_tat in zip(keys, new_tats):
+            _fallback_tats[key] = new_tat
+        return True, self._headers(shares[binding], least, round(reset_tat - now))
+
+    def _reject(
+        self,
+        client_ip: str,
+        key: str,
+        lease: _Lease,
+        now: float,
+    ) -> dict[str, str]:
+        logger.warning(
+            "rate_limit_exceeded",
+            prefix=self.prefix,
+            key=key,
+            ip=client_ip,
+            limit=lease.limit,
+            window=self.window,
+        )
+        headers = self._headers(
+            lease.limit, 0, max(0, round((lease.reset_at - now) * 1000))
+        )
+        headers["Retry-After"] = str(max(1, math.ceil(lease.retry_at - now)))
+        return headers
 
     @staticmethod
-    def _get_client_ip(request: Request) -> str:
-        """Extract real client IP, respecting X-Forwarded-For from Traefik."""
-        forwarded = request.headers.get("x-forwarded-for")
-        if forwarded:
-            # First IP in the chain is the real client
-            return forwarded.split(",")[0].strip()
-        if request.client:
-            return request.client.host
-        return "unknown"
-
-
-# ── Pre-configured limiters ──────────────────────────────────────────
-# These match the constants in constants.py but enforced at the route level.
-
-rate_limit_login = RateLimiter(requests=5, window=300, prefix="login")
-rate_limit_register = RateLimiter(requests=3, window=3600, prefix="register")
-rate_limit_post = RateLimiter(requests=5, window=3600, prefix="post")
-rate_limit_comment = RateLimiter(requests=30, window=3600, prefix="comment")
-rate_limit_vote = RateLimiter(requests=100, window=3600, prefix="vote")
-rate_limit_flag = RateLimiter(requests=10, window=3600, prefix="flag")
+    def _store_lease(key: str, lease: _Lease) -> None:
+        if len(_leases) >= _LEASES_MAX:
+            _leases.clear()
+        _leases[key] = lease
+
+    def _checks(
+        self,
+        client_ip: str,
+        principal: tuple[str, float | None] | None,
+    ) -> list[tuple[str, int]]:
+        """(key, limit) pairs to enforce for this request."""
+        if not self.per_actor or principal is None:
+            return [(f"cg:rate:{self.prefix}:ip:{client_ip}", self.requests)]
+
+        actor_id, trust_score = principal
+        multiplier = trust_rate_multiplier(trust_score) if trust_score is not None else 1.0
+        actor_limit = max(1, int(self.requests * multiplier))
+        return [
+            (f"cg:rate:{self.prefix}:actor:{actor_id}", actor_limit),
+            (f"cg:rate:{self.prefix}:shield:{client_ip}", self.requests * RATE_LIMIT_IP_SHIELD_MULTIPLIER),
+        ]
+
+    def _headers(self, limit: int, remaining: int, reset_ms: int) -> dict[str, str]:
+        return {
+            "RateLimit-Limit": str(limit),
+            "RateLimit-Remaining": str(max(0, remaining)),
+            "RateLimit-Reset": str(math.ceil(reset_ms / 1000)),
+            "RateLimit-Policy": f"{limit};w={self.window}",
+        }
+
+
+def client_ip_from_headers(headers: Mapping[str, str], client_host: str | None) -> str:
+    """Extract real client IP, respecting X-Forwarded-For from Traefik."""
+    forwarded = headers.get("x-forwarded-for")
+    if forwarded:
+        # First IP in the chain is the real client
+        return forwarded.split(",")[0].strip()
+    if client_host:
+        return client_host
+    return "unknown"
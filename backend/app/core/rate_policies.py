@@ -0,0 +1,118 @@
+"""
+Central rate-limit policy table for Common Ground.
+Maps (method, route template) to a named policy; RateLimitMiddleware looks
+requests up here before any body parsing, auth or DB work happens.
+
+Defaults live below. RATE_LIMIT_POLICY_FILE may point at a JSON file that
+overrides them; it is re-read whenever its mtime changes (see
+app/core/file_reload.py), so limits can be tuned without a redeploy:
+
+    {
+      "policies": {"vote": {"requests": 200}, "search": {"requests": 60, "window": 60}},
+      "routes": [["GET", "/api/v1/search", "search"], ["POST", "/api/v1/flags", null]]
+    }
+
+Policy entries merge field-by-field over the defaults. A route mapped to
+null is no longer limited.
+"""
+import re
+from typing import Optional
+
+from app.core.config import settings
+from app.core.constants import (
+    RATE_LIMIT_AUTOCOMPLETE,
+    RATE_LIMIT_COMMENT,
+    RATE_LIMIT_FLAG,
+    RATE_LIMIT_MOD_LOG,
+    RATE_LIMIT_POST,
+    RATE_LIMIT_SEARCH,
+    RATE_LIMIT_VOTE,
+)
+from app.core.file_reload import ReloadingFile
+from app.core.rate_limiter import RateLimiter
+
+# Content limits come from constants.py and are enforced per actor.
+DEFAULT_POLICIES: dict[str, dict] = {
+    "login": {"requests": 5, "window": 300},
+    "register": {"requests": 3, "window": 3600},
+    "post": {"requests": RATE_LIMIT_POST, "window": 3600, "per_actor": True},
+    "comment": {"requests": RATE_LIMIT_COMMENT, "window": 3600, "per_actor": True},
+    "vote": {"requests": RATE_LIMIT_VOTE, "window": 3600, "per_actor": True},
+    "flag": {"requests": RATE_LIMIT_FLAG, "window": 3600, "per_actor": True},
+    "search": {"requests": RATE_LIMIT_SEARCH, "window": 3600, "per_actor": True},
+    "autocomplete": {"requests": RATE_LIMIT_AUTOCOMPLETE, "window": 3600, "per_actor": True},
+    "modlog": {"requests": RATE_LIMIT_MOD_LOG, "window": 3600, "per_actor": True},
+}
+
+DEFAULT_ROUTES: list[tuple[str, str, str]] = [
+    ("POST", "/api/v1/auth/login", "login"),
+    ("POST", "/api/v1/auth/register", "register"),
+    ("POST", "/api/v1/posts", "post"),
+    ("POST", "/api/v1/posts/{post_id}/comments", "comment"),
+    ("POST", "/api/v1/posts/{post_id}/vote", "vote"),
+    ("POST", "/api/v1/comments/{comment_id}/vote", "vote"),
+    ("POST", "/api/v1/flags", "flag"),
+    ("GET", "/api/v1/search", "search"),
+    ("GET", "/api/v1/search/autocomplete", "autocomplete"),
+    ("GET", "/api/v1/moderation/log", "modlog"),
+]
+
+_PARAM_RE = re.compile(r"\{[^/}]+\}")
+
+
+class PolicyTable:
+    """Compiled route -> RateLimiter lookup."""
+
+    def __init__(self, policies: dict[str, dict], routes: list[tuple[str, str, Optional[str]]]):
+        self.limiters = {
+            name: RateLimiter(
+                requests=int(spec["requests"]),
+                window=int(spec["window"]),
+                prefix=name,
+                per_actor=bool(spec.get("per_actor", False)),
+            )
+            for name, spec in policies.items()
+        }
+        self._exact: dict[tuple[str, str], RateLimiter] = {}
+        self._patterns: dict[str, list[tuple[re.Pattern, RateLimiter]]] = {}
+        for method, path, name in routes:
+            if name is None:
+                continue
+            limiter = self.limiters[name]
+            if "{" not in path:
+                self._exact[(method, path)] = limiter
+                continue
+            segments = _PARAM_RE.split(path)
+            pattern = re.compile("^" + "[^/]+".join(map(re.escape, segments)) + "$")
+            self._patterns.setdefault(method, []).append((pattern, limiter))
+
+    def match(self, method: str, path: str) -> Optional[RateLimiter]:
+        limiter = self._exact.get((method, path))
+        if limiter is not None:
+            return limiter
+        for pattern, limiter in self._patterns.get(method, ()):
+            if pattern.match(path):
+                return limiter
+        return None
+
+
+def build_table(overrides: Optional[dict] = None) -> PolicyTable:
+    """Defaults merged with an optional override document."""
+    policies = {name: dict(spec) for name, spec in DEFAULT_POLICIES.items()}
+    routes: dict[tuple[str, str], Optional[str]] = {
+        (method, path): name for method, path, name in DEFAULT_ROUTES
+    }
+    if overrides:
+        for name, spec in overrides.get("policies", {}).items():
+            policies.setdefault(name, {}).update(spec)
+        for method, path, name in overrides.get("routes", []):
+            routes[(method.upper(), path)] = name
+    return PolicyTable(policies, [(m, p, n) for (m, p), n in routes.items()])
+
+
+_table = ReloadingFile("rate_policy", lambda: settings.rate_limit_policy_file, build_table)
+
+
+def get_policy_table() -> PolicyTable:
+    """Current table, reloading the policy file if it changed."""
+    return _table.get()
@@ -0,0 +1,143 @@
+"""
+Shared Redis client for Common Ground.
+Every Redis user goes through redis_client(): tight socket timeouts, a
+per-block deadline, and a per-worker circuit breaker, so a slow or dead
+Redis costs callers one timeout per failure burst rather than one per
+request.
+
+    async with redis_client() as r:
+        await r.get(key)
+
+While the breaker is open, redis_client() raises RedisUnavailable without
+touching the network; callers degrade (rate limiting falls back to local
+limits, caches behave as misses). After REDIS_BREAKER_RESET_SECONDS one
+probe is let through; its outcome closes or re-opens the breaker.
+"""
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
+import structlog
+import redis.asyncio as aioredis
+from redis.exceptions import RedisError
+
+from app.core.config import settings
+
+logger = structlog.get_logger()
+
+
+class RedisUnavailable(Exception):
+    """Raised instead of calling Redis while the circuit breaker is open."""
+
+
+class CircuitBreaker:
+    """Consecutive-failure breaker with a single half-open probe."""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int, reset_seconds: float):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.failures = 0
+        self.opened_at: float | None = None
+        self.probing = False
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return self.CLOSED
+        if self.probing or time.monotonic() - self.opened_at >= self.reset_seconds:
+            return self.HALF_OPEN
+        return self.OPEN
+
+    def allow(self) -> bool:
+        state = self.state
+        if state == self.CLOSED:
+            return True
+        if state == self.HALF_OPEN and not self.probing:
+            self.probing = True
+            return True
+        return False
+
+    def record_success(self) -> None:
+        if self.opened_at is not None:
+            logger.info("redis_circuit_closed")
+        self.failures = 0
+        self.opened_at = None
+        self.probing = False
+
+    def record_failure(self, error: Exception) -> None:
+        self.failures += 1
+        if self.probing or (self.opened_at is None and self.failures >= self.failure_threshold):
+            logger.error(
+                "redis_circuit_opened",
+                failures=self.failures,
+                retry_in=self.reset_seconds,
+                error=str(error) or type(error).__name__,
+            )
+            self.opened_at = time.monotonic()
+        self.probing = False
+
+    def release_probe(self) -> None:
+        """The probe ended without talking to Redis; let another one try."""
+        self.probing = False
+
+    def snapshot(self) -> dict:
+        state = self.state
+        retry_in = None
+        if state == self.OPEN:
+            retry_in = round(self.reset_seconds - (time.monotonic() - self.opened_at), 1)
+        return {"state": state, "consecutive_failures": self.failures, "retry_in_seconds": retry_in}
+
+
+breaker = CircuitBreaker(
+    failure_threshold=settings.redis_breaker_failures,
+    reset_seconds=settings.redis_breaker_reset_seconds,
+)
+
+_pool: aioredis.Redis | None = None
+
+
+def _get_client() -> aioredis.Redis:
+    global _pool
+    if _pool is None:
+        timeout = settings.redis_timeout_ms / 1000
+        _pool = aioredis.from_url(
+            settings.redis_url,
+            decode_responses=True,
+            max_connections=20,
+            socket_timeout=timeout,
+            socket_connect_timeout=timeout,
+        )
+    return _pool
+
+
+@asynccontextmanager
+async def redis_client() -> AsyncIterator[aioredis.Redis]:
+    """
+    Guarded access to the shared pool. Redis errors and timeouts inside the
+    block count against the breaker and are re-raised to the caller.
+    Keep blocks to Redis work only: the deadline covers the whole block.
+    """
+    if not breaker.allow():
+        raise RedisUnavailable("redis circuit open")
+
+    try:
+        async with asyncio.timeout(settings.redis_timeout_ms / 1000):
+            yield _get_client()
+    except (RedisError, OSError, TimeoutError) as e:
+        breaker.record_failure(e)
+        raise
+    except BaseException:
+        # The block failed for reasons of its own: no verdict on Redis.
+        breaker.release_probe()
+        raise
+    else:
+        breaker.record_success()
+
+
+def breaker_state() -> dict:
+    return breaker.snapshot()
@@ -1,10 +1,23 @@
 """
 Input sanitization for Common Ground.
 Defense-in-depth: strip dangerous content before it reaches the DB.
+
+Cleaners are built once per thread (bleach Cleaners are not thread-safe)
+and text with nothing for html5lib to change skips parsing entirely.
+Large bodies are cleaned on a small thread pool so a 40k-character post
+does not stall the event loop.
+
+Markdown bodies are also rendered here, once at write time: the HTML is
+stored next to the raw body and always passes through the same cleaner.
 """
+import asyncio
+import html
 import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
 
-import bleach
+import markdown
+from bleach.sanitizer import Cleaner
 
 
 # Markdown-safe tags that could appear in rich text
@@ -21,25 +34,93 @@ ALLOWED_PROTOCOLS = ["http", "https", "mailto"]
 # Regex for safe URLs (http/https only)
 _SAFE_URL_RE = re.compile(r"^https?://", re.IGNORECASE)
 
+# Anything bleach would rewrite: markup, entities, a bare '>' (escaped),
+# CR (normalized) and control characters (dropped or replaced). Text
+# without any of these comes back from bleach unchanged.
+_NEEDS_CLEANING_RE = re.compile(r"[<>&\r\x00-\x08\x0b\x0c\x0e-\x1f\x7f-\x9f]")
+
+# Bodies longer than this are cleaned off the event loop.
+SANITIZE_OFFLOAD_THRESHOLD = 4000
+
+_local = threading.local()
+_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="sanitize")
+
+
+def _cleaners() -> tuple[Cleaner, Cleaner]:
+    """(rich text, plain text) cleaners for the calling thread."""
+    cleaners = getattr(_local, "cleaners", None)
+    if cleaners is None:
+        cleaners = _local.cleaners = (
+            Cleaner(
+                tags=ALLOWED_TAGS,
+                attributes=ALLOWED_ATTRIBUTES,
+                protocols=ALLOWED_PROTOCOLS,
+                strip=True,
+            ),
+            Cleaner(tags=[], attributes={}, strip=True),
+        )
+    return cleaners
+
+
+def _markdown() -> markdown.Markdown:
+    """Markdown converter for the calling thread (instances keep state)."""
+    md = getattr(_local, "markdown", None)
+    if md is None:
+        md = _local.markdown = markdown.Markdown(
+            extensions=["fenced_code", "sane_lists"],
+            output_format="html",
+        )
+    return md
+
+
+# Prebuild for the importing (event loop) thread.
+_cleaners()
+_markdown()
+
 
 def sanitize_html(text: str) -> str:
     """Strip dangerous HTML tags while preserving safe formatting."""
-    if not text:
+    if not text or not _NEEDS_CLEANING_RE.search(text):
         return text
-    return bleach.clean(
-        text,
-        tags=ALLOWED_TAGS,
-        attributes=ALLOWED_ATTRIBUTES,
-        protocols=ALLOWED_PROTOCOLS,
-        strip=True,
-    )
+    return _cleaners()[0].clean(text)
 
 
 def sanitize_plain_text(text: str) -> str:
     """Strip ALL HTML tags. For titles and other plain-text fields."""
-    if not text:
+    if not text or not _NEEDS_CLEANING_RE.search(text):
         return text
-    return bleach.clean(text, tags=[], attributes={}, strip=True)
+    return _cleaners()[1].clean(text)
+
+
+async def sanitize_html_async(text: str) -> str:
+    """sanitize_html, on the sanitizer pool for large inputs."""
+    if not text or len(text) <= SANITIZE_OFFLOAD_THRESHOLD or not _NEEDS_CLEANING_RE.search(text):
+        return sanitize_html(text)
+    return await asyncio.get_running_loop().run_in_executor(_executor, sanitize_html, text)
+
+
+def render_markdown(text: str | None) -> str | None:
+    """
+    Render a stored (already sanitized) Markdown body to safe HTML.
+    Stored bodies have their entities escaped by the sanitizer, so they are
+    unescaped first — otherwise '> quote' and code blocks render literally.
+    The rendered HTML is sanitized again before it is returned.
+    """
+    if not text:
+        return None
+    md = _markdown()
+    try:
+        rendered = md.convert(html.unescape(text))
+    finally:
+        md.reset()
+    return _cleaners()[0].clean(rendered)
+
+
+async def render_markdown_async(text: str | None) -> str | None:
+    """render_markdown, on the sanitizer pool for large inputs."""
+    if not text or len(text) <= SANITIZE_OFFLOAD_THRESHOLD:
+        return render_markdown(text)
+    return await asyncio.get_running_loop().run_in_executor(_executor, render_markdown, text)
 
 
 def is_safe_url(url: str | None) -> bool:
@@ -1,7 +1,7 @@
 import hashlib
 import secrets
 from datetime import datetime, timedelta, timezone
-from typing import Optional
+from typing import Mapping, Optional
 
 import structlog
 from jose import JWTError, jwt
@@ -78,6 +78,20 @@ def decode_token(token: str) -> Optional[dict]:
         return None
 
 
+def access_token_subject(token: str) -> Optional[str]:
+    """
+    Actor id of a validly signed, unexpired access token, checked without
+    a DB lookup (or logging: callers see every request, not just logins).
+    """
+    try:
+        payload = jwt.decode(token, settings.jwt_secret_key, algorithms=[settings.jwt_algorithm])
+    except JWTError:
+        return None
+    if payload.get("kind") != "access":
+        return None
+    return payload.get("sub")
+
+
 def generate_api_key() -> tuple[str, str, str]:
     """Generate a new API key. Returns (full_key, key_hash, key_prefix)."""
     raw = secrets.token_urlsafe(API_KEY_LENGTH)
@@ -90,3 +104,19 @@ def generate_api_key() -> tuple[str, str, str]:
 def hash_api_key(key: str) -> str:
     """Hash an API key using SHA-256."""
     return hashlib.sha256(key.encode()).hexdigest()
+
+
+def credential_from_headers(headers: Mapping[str, str]) -> Optional[str]:
+    """Raw credential (API key or bearer token) from request headers, unverified."""
+    api_key = headers.get("x-agent-key")
+    if api_key:
+        return api_key
+    authorization = headers.get("authorization")
+    if authorization and authorization[:7].lower() == "bearer ":
+        return authorization[7:].strip() or None
+    return None
+
+
+def credential_fingerprint(credential: str) -> str:
+    """Stable, non-reversible cache key for a credential."""
+    return hashlib.sha256(credential.encode()).hexdigest()[:32]
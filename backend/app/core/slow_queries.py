@@ -0,0 +1,230 @@
+"""
+Slow-statement log for Common Ground.
+Statements above SLOW_QUERY_THRESHOLD_MS are logged by shape, aggregated
+in Redis across workers, and periodically sampled with
+EXPLAIN (ANALYZE, BUFFERS) on a separate read-only connection. ANALYZE
+executes the statement, so SELECTs with side effects (advisory locks,
+NOTIFY, sequences, row locks) only get a plain EXPLAIN.
+
+SECURITY: Parameter values are never logged or stored — only a
+fingerprint — and nothing here is ever attached to API responses.
+Aggregates are exposed solely through the admin-only endpoint.
+"""
+import asyncio
+import hashlib
+import json
+import re
+import time
+from contextvars import ContextVar
+
+import structlog
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.core.config import settings
+from app.core.redis_client import redis_client
+
+logger = structlog.get_logger()
+
+_KEY_PREFIX = "cg:slowq"
+_ENTRY_TTL = 24 * 3600
+_EXPLAIN_TIMEOUT_MS = 5000
+
+# SELECTs that must not be executed again: a session-level advisory lock
+# would outlive the rolled-back transaction on a pooled connection.
+_SIDE_EFFECT_RE = re.compile(
+    r"\b(?:pg_\w*lock\w*|pg_notify|nextval|setval|set_config"
+    r"|pg_cancel_backend|pg_terminate_backend|pg_reload_conf)\s*\("
+    r"|\bFOR\s+(?:NO\s+KEY\s+|KEY\s+)?(?:UPDATE|SHARE)\b",
+    re.IGNORECASE,
+)
+
+_UUID_RE = re.compile(
+    r"[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}", re.IGNORECASE
+)
+
+# sync Engine -> AsyncEngine, so EXPLAIN can borrow a pooled connection.
+_engines: dict = {}
+# Strong references to in-flight recording tasks.
+_pending: set[asyncio.Task] = set()
+# At most one EXPLAIN ANALYZE running per worker.
+_explain_slots = asyncio.Semaphore(1)
+# Set inside the recording task so its own statements are not instrumented.
+_explaining: ContextVar[bool] = ContextVar("cg_slowq_explaining", default=False)
+
+
+def is_explaining() -> bool:
+    return _explaining.get()
+
+
+def register_engine(engine: AsyncEngine) -> None:
+    _engines[engine.sync_engine] = engine
+
+
+def safe_to_analyze(shape: str) -> bool:
+    """Whether EXPLAIN ANALYZE may re-execute this SELECT."""
+    return not _SIDE_EFFECT_RE.search(shape)
+
+
+def normalize_route(path: str) -> str:
+    """Collapse IDs in a request path so routes aggregate together."""
+    return _UUID_RE.sub("{id}", path)
+
+
+def _fingerprint(value: str) -> str:
+    return hashlib.sha256(value.encode()).hexdigest()[:16]
+
+
+def report_slow_statement(
+    sync_engine,
+    statement: str,
+    shape: str,
+    parameters,
+    duration_ms: float,
+    route: str | None,
+) -> None:
+    """
+    Called from the cursor-execute listener (sync, inside the greenlet).
+    Logs immediately; Redis aggregation and EXPLAIN run as a background task.
+    """
+    if shape[:7].upper() == "EXPLAIN":
+        return
+
+    fingerprint = _fingerprint(shape)
+    params_fingerprint = _fingerprint(repr(parameters)) if parameters else None
+
+    logger.warning(
+        "slow_query",
+        fingerprint=fingerprint,
+        sql=shape,
+        params_fingerprint=params_fingerprint,
+        route=route,
+        duration_ms=round(duration_ms, 1),
+    )
+
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        return
+
+    # Only ever sample reads; see _SIDE_EFFECT_RE for which get ANALYZE.
+    explainable = shape[:6].upper() == "SELECT" and sync_engine in _engines
+    task = loop.create_task(_record(
+        sync_engine if explainable else None,
+        statement,
+        parameters,
+        fingerprint,
+        shape,
+        params_fingerprint,
+        route,
+        duration_ms,
+    ))
+    _pending.add(task)
+    task.add_done_callback(_pending.discard)
+
+
+async def _record(
+    sync_engine,
+    statement: str,
+    parameters,
+    fingerprint: str,
+    shape: str,
+    params_fingerprint: str | None,
+    route: str | None,
+    duration_ms: float,
+) -> None:
+    key = f"{_KEY_PREFIX}:q:{fingerprint}"
+    try:
+        async with redis_client() as r:
+            pipe = r.pipeline()
+            pipe.hset(key, mapping={
+                "sql": shape,
+                "route": route or "",
+                "params_fingerprint": params_fingerprint or "",
+                "last_ms": round(duration_ms, 1),
+                "last_seen": int(time.time()),
+            })
+            pipe.hincrby(key, "count", 1)
+            pipe.expire(key, _ENTRY_TTL)
+            pipe.zincrby(f"{_KEY_PREFIX}:total", duration_ms, fingerprint)
+            pipe.zadd(f"{_KEY_PREFIX}:max", {fingerprint: duration_ms}, gt=True)
+            pipe.expire(f"{_KEY_PREFIX}:total", _ENTRY_TTL)
+            pipe.expire(f"{_KEY_PREFIX}:max", _ENTRY_TTL)
+            await pipe.execute()
+
+            if sync_engine is None or _explain_slots.locked():
+                return
+            # One sample per shape per interval, across all workers.
+            acquired = await r.set(
+                f"{_KEY_PREFIX}:explain_lock:{fingerprint}", 1,
+                nx=True, ex=settings.slow_query_explain_interval_seconds,
+            )
+        if not acquired:
+            return
+
+        _explaining.set(True)
+        analyze = safe_to_analyze(shape)
+        async with _explain_slots:
+            plan = await _explain(_engines[sync_engine], statement, parameters, analyze)
+        if plan is not None:
+            async with redis_client() as r:
+                await r.hset(key, mapping={
+                    "plan": json.dumps(plan),
+                    "plan_analyzed": int(analyze),
+                    "explained_at": int(time.time()),
+                })
+    except Exception as e:
+        logger.warning("slow_query_record_failed", fingerprint=fingerprint, error=str(e))
+
+
+async def _explain(engine: AsyncEngine, statement: str, parameters, analyze: bool):
+    """
+    Run EXPLAIN in a read-only, rolled-back transaction; with analyze,
+    EXPLAIN (ANALYZE, BUFFERS), which executes the statement.
+    """
+    options = "ANALYZE, BUFFERS, FORMAT JSON" if analyze else "FORMAT JSON"
+    async with engine.connect() as conn:
+        await conn.exec_driver_sql("SET TRANSACTION READ ONLY")
+        await conn.exec_driver_sql(f"SET LOCAL statement_timeout = {_EXPLAIN_TIMEOUT_MS}")
+        result = await conn.exec_driver_sql(
+            f"EXPLAIN ({options}) {statement}",
+            tuple(parameters) if parameters else (),
+        )
+        plan = result.scalar()
+        await conn.rollback()
+    return json.loads(plan) if isinstance(plan, str) else plan
+
+
+async def top_slow_queries(limit: int = 50, order: str = "total") -> list[dict]:
+    """Aggregated slow statements, worst first, ordered by total or max time."""
+    async with redis_client() as r:
+        ranked = await r.zrevrange(f"{_KEY_PREFIX}:{order}", 0, limit - 1, withscores=True)
+        if not ranked:
+            return []
+
+        pipe = r.pipeline()
+        for fingerprint, _ in ranked:
+            pipe.hgetall(f"{_KEY_PREFIX}:q:{fingerprint}")
+        pipe.zmscore(f"{_KEY_PREFIX}:total", [f for f, _ in ranked])
+        pipe.zmscore(f"{_KEY_PREFIX}:max", [f for f, _ in ranked])
+        *entries, totals, maxes = await pipe.execute()
+
+    results = []
+    for (fingerprint, _), entry, total_ms, max_ms in zip(ranked, entries, totals, maxes):
+        if not entry:
+            continue
+        count = int(entry.get("count", 0))
+        results.append({
+            "fingerprint": fingerprint,
+            "sql": entry.get("sql", ""),
+            "route": entry.get("route") or None,
+            "params_fingerprint": entry.get("params_fingerprint") or None,
+            "count": count,
+            "total_ms": round(total_ms or 0.0, 1),
+            "mean_ms": round((total_ms or 0.0) / count, 1) if count else 0.0,
+            "max_ms": round(max_ms or 0.0, 1),
+            "last_seen": int(entry.get("last_seen", 0)),
+            "plan": json.loads(entry["plan"]) if entry.get("plan") else None,
+            "plan_analyzed": entry.get("plan_analyzed", "1") == "1" if entry.get("plan") else None,
+            "explained_at": int(entry["explained_at"]) if entry.get("explained_at") else None,
+        })
+    return results
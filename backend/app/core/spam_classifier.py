@@ -0,0 +1,156 @@
+"""
+Local spam classifier for Common Ground.
+A logistic regression over hashed text features: no external service and
+no dependencies beyond the standard library. Trained offline by
+jobs/train_spam_model.py from moderator-actioned spam/crypto flags;
+scored off the request path by app/services/auto_moderation.py.
+
+Model file format: one JSON header line, then SPAM_FEATURE_BUCKETS
+little-endian float32 weights.
+"""
+import array
+import hashlib
+import html
+import json
+import math
+import os
+import random
+import re
+import sys
+from typing import Iterable, Optional
+
+from app.core.constants import SPAM_FEATURE_BUCKETS
+
+_FORMAT_VERSION = 1
+_TAG_RE = re.compile(r"<[^>]*>")
+_URL_RE = re.compile(r"https?://([^/\s\"'<>]+)\S*", re.IGNORECASE)
+_WORD_RE = re.compile(r"[^\W_]+|[$€£₿]", re.UNICODE)
+_DIGITS_RE = re.compile(r"\d")
+
+
+def _bucket(feature: str) -> int:
+    digest = hashlib.blake2b(feature.encode(), digest_size=4).digest()
+    return int.from_bytes(digest, "little") % SPAM_FEATURE_BUCKETS
+
+
+def features(text: str) -> set[int]:
+    """Binary hashed features: words, word pairs, link hosts and shape hints."""
+    text = html.unescape(_TAG_RE.sub(" ", text))
+    hosts = [h.lower().removeprefix("www.") for h in _URL_RE.findall(text)]
+    text = _URL_RE.sub(" ", text)
+    words = [
+        "#" if _DIGITS_RE.search(w) else w
+        for w in (w.casefold() for w in _WORD_RE.findall(text))
+    ]
+
+    out = {"w:" + w for w in words}
+    out.update(f"b:{a} {b}" for a, b in zip(words, words[1:]))
+    out.update("host:" + h for h in hosts)
+    out.add(f"links:{min(len(hosts), 5)}")
+    out.add(f"len:{min(len(words).bit_length(), 12)}")
+    letters = [c for c in text if c.isalpha()]
+    if letters and sum(c.isupper() for c in letters) > len(letters) / 2:
+        out.add("shape:shouting")
+    if text.count("!") >= 3:
+        out.add("shape:exclaim")
+    return {_bucket(f) for f in out}
+
+
+class SpamModel:
+    def __init__(self, weights: array.array, bias: float, meta: Optional[dict] = None):
+        self.weights = weights
+        self.bias = bias
+        self.meta = meta or {}
+
+    def score(self, text: str) -> float:
+        """Probability that text is spam."""
+        w = self.weights
+        z = self.bias + sum(w[i] for i in features(text))
+        return 1.0 / (1.0 + math.exp(-max(min(z, 30.0), -30.0)))
+
+    def save(self, path: str) -> None:
+        """Write atomically so scoring processes never read a partial file."""
+        weights = self.weights
+        if sys.byteorder != "little":
+            weights = array.array("f", weights)
+            weights.byteswap()
+        header = {"version": _FORMAT_VERSION, "buckets": len(weights), "bias": self.bias, **self.meta}
+        tmp = f"{path}.tmp"
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(tmp, "wb") as f:
+            f.write(json.dumps(header).encode() + b"\n")
+            weights.tofile(f)
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: str) -> "SpamModel":
+        with open(path, "rb") as f:
+            header = json.loads(f.readline())
+            if header.get("version") != _FORMAT_VERSION or header.get("buckets") != SPAM_FEATURE_BUCKETS:
+                raise ValueError(f"Incompatible spam model file: {path}")
+            weights = array.array("f")
+            weights.fromfile(f, SPAM_FEATURE_BUCKETS)
+        if sys.byteorder != "little":
+            weights.byteswap()
+        bias = header.pop("bias")
+        return cls(weights, bias, header)
+
+
+def train(
+    samples: Iterable[tuple[str, bool]],
+    epochs: int = 8,
+    learning_rate: float = 0.2,
+    l2: float = 1e-5,
+    seed: int = 0,
+) -> SpamModel:
+    """
+    Fit by SGD with balanced class weights, so a small set of actioned
+    flags is not drowned out by ordinary content.
+    """
+    data = [(sorted(features(text)), is_spam) for text, is_spam in samples]
+    positives = sum(1 for _, y in data if y)
+    negatives = len(data) - positives
+    if not positives or not negatives:
+        raise ValueError("Training needs both spam and non-spam samples.")
+    class_weight = {True: len(data) / (2 * positives), False: len(data) / (2 * negatives)}
+
+    weights = array.array("f", bytes(4 * SPAM_FEATURE_BUCKETS))
+    bias = 0.0
+    rng = random.Random(seed)
+    for epoch in range(epochs):
+        rng.shuffle(data)
+        rate = learning_rate / (1 + epoch)
+        for feats, is_spam in data:
+            z = bias + sum(weights[i] for i in feats)
+            p = 1.0 / (1.0 + math.exp(-max(min(z, 30.0), -30.0)))
+            step = rate * class_weight[is_spam] * ((1.0 if is_spam else 0.0) - p)
+            bias += step
+            for i in feats:
+                weights[i] += step - rate * l2 * weights[i]
+
+    return SpamModel(weights, bias, {"positives": positives, "negatives": negatives})
+
+
+# ── Scoring-process side ────────────────────────────────────────────
+# These run inside the scoring process pool. The model is loaded once per
+# process and reloaded when the file on disk changes (after retraining).
+_model: Optional[SpamModel] = None
+_model_mtime: Optional[float] = None
+
+
+def _current_model(path: str) -> Optional[SpamModel]:
+    global _model, _model_mtime
+    try:
+        mtime = os.stat(path).st_mtime
+    except FileNotFoundError:
+        _model, _model_mtime = None, None
+        return None
+    if mtime != _model_mtime:
+        _model, _model_mtime = SpamModel.load(path), mtime
+    return _model
+
+
+def score_in_worker(path: str, text: str) -> Optional[float]:
+    """None when no model has been trained yet."""
+    model = _current_model(path)
+    return model.score(text) if model is not None else None
@@ -6,7 +6,15 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 from starlette.middleware.base import BaseHTTPMiddleware
 
+from app.api.middleware.query_stats import QueryStatsMiddleware
+from app.api.middleware.rate_limit import RateLimitMiddleware
+from app.core.audit import audit_sink
+from app.core.audit_partitions import ensure_partitions
+from app.core.ban_terms import get_automaton
 from app.core.config import settings
+from app.core.database import engine
+from app.services.auto_moderation import shutdown_spam_scoring
+from app.services.mod_expiry import expiry_scheduler
 
 logger = structlog.get_logger()
 
@@ -46,7 +54,21 @@ async def lifespan(app: FastAPI):
         environment=settings.environment,
         platform_url=settings.platform_url,
     )
+    # Compile the hard-ban term automaton before the first write needs it.
+    get_automaton()
+    # Normally a no-op: the archive job keeps partitions months ahead.
+    try:
+        async with engine.begin() as conn:
+            await ensure_partitions(conn)
+    except Exception as e:
+        logger.error("audit_partition_check_failed", error=str(e))
+    audit_sink.start()
+    expiry_scheduler.start()
     yield
+    await expiry_scheduler.stop()
+    await shutdown_spam_scoring()
+    # After spam scoring: its last auto-hides still queue audit entries.
+    await audit_sink.stop()
     logger.info("Shutting down Common Ground")
 
 
@@ -81,7 +103,19 @@ async def global_exception_handler(request: Request, exc: Exception):
     )
 
 
-# ── Security Headers (before CORS so headers are applied to all responses)
+# Middleware added later wraps what was added earlier, so the stack runs
+# outermost first: CORS, security headers, rate limiting, query stats.
+
+# ── Query instrumentation (statement counts, DB time, N+1 detection)
+app.add_middleware(QueryStatsMiddleware)
+
+
+# ── Rate limiting (inside CORS and security headers so 429s carry both,
+# but ahead of everything else: rejects before body parsing or a DB session)
+app.add_middleware(RateLimitMiddleware)
+
+
+# ── Security Headers (inside CORS, around everything that can respond)
 app.add_middleware(SecurityHeadersMiddleware)
 
 
@@ -96,7 +130,10 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["GET", "POST", "PATCH", "DELETE", "OPTIONS"],
     allow_headers=["Authorization", "Content-Type", "X-Agent-Key"],
-    expose_headers=[],
+    expose_headers=[
+        "RateLimit-Limit", "RateLimit-Remaining", "RateLimit-Reset",
+        "RateLimit-Policy", "Retry-After",
+    ],
     max_age=600,  # Cache preflight for 10 minutes
 )
 
@@ -105,7 +142,8 @@ app.add_middleware(
 from app.api.v1.routes import (  # noqa: E402
     health, auth, agents, actors,
     communities, posts, comments, feed,
-    discovery, flags, moderation,
+    discovery, flags, moderation, admin,
+    search,
 )
 
 app.include_router(health.router, prefix="/api/v1", tags=["health"])
@@ -116,6 +154,8 @@ app.include_router(communities.router, prefix="/api/v1", tags=["communities"])
 app.include_router(posts.router, prefix="/api/v1", tags=["posts"])
 app.include_router(comments.router, prefix="/api/v1", tags=["comments"])
 app.include_router(feed.router, prefix="/api/v1", tags=["feed"])
+app.include_router(search.router, prefix="/api/v1", tags=["search"])
 app.include_router(discovery.router, prefix="/api/v1", tags=["discovery"])
 app.include_router(flags.router, prefix="/api/v1", tags=["flags"])
 app.include_router(moderation.router, prefix="/api/v1", tags=["moderation"])
+app.include_router(admin.router, prefix="/api/v1", tags=["admin"])
@@ -8,20 +8,34 @@ from sqlalchemy import (
     Enum,
     Float,
     ForeignKey,
+    Index,
     Integer,
     String,
     Text,
     UniqueConstraint,
+    text,
 )
 from sqlalchemy.dialects.postgresql import JSONB, UUID
-from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy.orm import Mapped, mapped_column, relationship, validates
 
+from app.core.confusables import skeleton
 from app.core.constants import ActorRole, ActorType
 from app.models.base import Base, TimestampMixin
 
 
 class Actor(TimestampMixin, Base):
     __tablename__ = "actors"
+    __table_args__ = (
+        Index("idx_actors_handle_skeleton", "handle_skeleton", unique=True),
+        # Autocomplete (app/services/autocomplete.py)
+        Index("idx_actors_handle_trgm", "handle", postgresql_using="gin", postgresql_ops={"handle": "gin_trgm_ops"}),
+        Index(
+            "idx_actors_display_name_trgm", "display_name",
+            postgresql_using="gin", postgresql_ops={"display_name": "gin_trgm_ops"},
+        ),
+        Index("idx_actors_handle_prefix", text('lower(handle) COLLATE "C"')),
+        Index("idx_actors_display_name_prefix", text('lower(display_name) COLLATE "C"')),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True), primary_key=True, default=uuid.uuid4
@@ -33,6 +47,12 @@ class Actor(TimestampMixin, Base):
     handle: Mapped[str] = mapped_column(
         String(32), unique=True, nullable=False, index=True
     )
+    # Lookalike-insensitive form of handle (app/core/confusables.py), kept
+    # in sync by _sync_handle_skeleton. NULL only for pre-existing
+    # collisions found when the column was added.
+    handle_skeleton: Mapped[Optional[str]] = mapped_column(
+        String(64), nullable=True
+    )
     display_name: Mapped[str] = mapped_column(String(64), nullable=False)
     bio: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
     avatar_url: Mapped[Optional[str]] = mapped_column(String(512), nullable=True)
@@ -65,6 +85,11 @@ class Actor(TimestampMixin, Base):
         back_populates="actor", lazy="selectin"
     )
 
+    @validates("handle")
+    def _sync_handle_skeleton(self, key: str, handle: str) -> str:
+        self.handle_skeleton = skeleton(handle)
+        return handle
+
     def __repr__(self) -> str:
         return f"<Actor {self.handle} ({self.actor_type})>"
 
@@ -1,15 +1,19 @@
 import uuid
 from typing import Optional
 
-from sqlalchemy import Boolean, Float, ForeignKey, Integer, String, Text
-from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy import BigInteger, Boolean, Computed, Float, ForeignKey, Index, Integer, String, Text
+from sqlalchemy.dialects.postgresql import TSVECTOR, UUID
+from sqlalchemy.orm import Mapped, deferred, mapped_column, relationship
 
 from app.models.base import Base, TimestampMixin
 
 
 class Comment(TimestampMixin, Base):
     __tablename__ = "comments"
+    __table_args__ = (
+        Index("idx_comments_content_hash", "content_hash", "created_at"),
+        Index("idx_comments_search", "search_vector", postgresql_using="gin"),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True), primary_key=True, default=uuid.uuid4
@@ -33,6 +37,16 @@ class Comment(TimestampMixin, Base):
         index=True,
     )
     body: Mapped[str] = mapped_column(Text, nullable=False)
+    # Sanitized HTML rendered from body at write time
+    body_html: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    # Duplicate-detection fingerprints (app/core/dedup.py)
+    content_hash: Mapped[Optional[str]] = mapped_column(String(64), nullable=True)
+    simhash: Mapped[Optional[int]] = mapped_column(BigInteger, nullable=True)
+    # Full-text search (app/api/v1/routes/search.py); never loaded with the row
+    search_vector: Mapped[Optional[str]] = deferred(mapped_column(
+        TSVECTOR,
+        Computed("setweight(to_tsvector('english', coalesce(body, '')), 'B')", persisted=True),
+    ))
     depth: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
     path: Mapped[str] = mapped_column(
         String(1024), default="", nullable=False
@@ -1,7 +1,7 @@
 import uuid
 from typing import Optional
 
-from sqlalchemy import Boolean, ForeignKey, Integer, String, Text, UniqueConstraint
+from sqlalchemy import Boolean, ForeignKey, Index, Integer, String, Text, UniqueConstraint, text
 from sqlalchemy.dialects.postgresql import JSONB, UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -10,6 +10,13 @@ from app.models.base import Base, TimestampMixin
 
 class Community(TimestampMixin, Base):
     __tablename__ = "communities"
+    __table_args__ = (
+        # Autocomplete (app/services/autocomplete.py)
+        Index("idx_communities_slug_trgm", "slug", postgresql_using="gin", postgresql_ops={"slug": "gin_trgm_ops"}),
+        Index("idx_communities_name_trgm", "name", postgresql_using="gin", postgresql_ops={"name": "gin_trgm_ops"}),
+        Index("idx_communities_slug_prefix", text('slug COLLATE "C"')),
+        Index("idx_communities_name_prefix", text('lower(name) COLLATE "C"')),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True), primary_key=True, default=uuid.uuid4
@@ -1,8 +1,8 @@
 import uuid
 from datetime import datetime
 
-from sqlalchemy import Boolean, DateTime, Enum, ForeignKey, String, Text, UniqueConstraint
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Boolean, DateTime, Enum, Float, ForeignKey, Index, Integer, String, Text, UniqueConstraint, text
+from sqlalchemy.dialects.postgresql import JSONB, UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.core.constants import FlagReason, FlagStatus
@@ -18,10 +18,11 @@ class Flag(TimestampMixin, Base):
     id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True), primary_key=True, default=uuid.uuid4
     )
-    reporter_id: Mapped[uuid.UUID] = mapped_column(
+    # NULL for flags raised automatically by the platform
+    reporter_id: Mapped[uuid.UUID | None] = mapped_column(
         UUID(as_uuid=True),
         ForeignKey("actors.id", ondelete="CASCADE"),
-        nullable=False,
+        nullable=True,
         index=True,
     )
     target_type: Mapped[str] = mapped_column(
@@ -43,6 +44,9 @@ class Flag(TimestampMixin, Base):
         default=FlagStatus.PENDING.value,
         index=True,
     )
+    # Reporter's trust score when the flag was filed; fixes the flag's
+    # weight in its target's queue priority. NULL for system flags.
+    reporter_trust: Mapped[float | None] = mapped_column(Float, nullable=True)
     reviewer_id: Mapped[uuid.UUID | None] = mapped_column(
         UUID(as_uuid=True),
         ForeignKey("actors.id", ondelete="SET NULL"),
@@ -58,3 +62,33 @@ class Flag(TimestampMixin, Base):
 
     def __repr__(self) -> str:
         return f"<Flag {self.id} {self.reason} on {self.target_type}/{self.target_id}>"
+
+
+class FlagTarget(TimestampMixin, Base):
+    """
+    Per-target flag aggregate, maintained alongside flags (see
+    app/services/flag_service.py) so thresholds never need a COUNT.
+    """
+    __tablename__ = "flag_targets"
+    __table_args__ = (
+        Index(
+            "idx_flag_targets_queue",
+            text("priority DESC"),
+            "last_flagged_at",
+            postgresql_where=text("pending_count > 0"),
+        ),
+    )
+
+    target_type: Mapped[str] = mapped_column(String(16), primary_key=True)
+    target_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True)
+    # Aggregates over the target's pending flags only
+    pending_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    priority: Mapped[float] = mapped_column(Float, default=0.0, nullable=False)
+    reporter_trust_sum: Mapped[float] = mapped_column(Float, default=0.0, nullable=False)
+    reason_counts: Mapped[dict] = mapped_column(JSONB, default=dict, nullable=False)
+    last_flagged_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
+
+    def __repr__(self) -> str:
+        return f"<FlagTarget {self.target_type}/{self.target_id} pending={self.pending_count}>"
@@ -1,7 +1,7 @@
 import uuid
 from datetime import datetime
 
-from sqlalchemy import Boolean, DateTime, Enum, ForeignKey, Integer, String, Text, func
+from sqlalchemy import Boolean, DateTime, Enum, ForeignKey, Index, Integer, String, Text, func, text
 from sqlalchemy.dialects.postgresql import JSONB, UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -11,6 +11,22 @@ from app.models.base import Base, TimestampMixin
 
 class ModerationAction(TimestampMixin, Base):
     __tablename__ = "moderation_actions"
+    __table_args__ = (
+        # Keyset pagination of the public moderation log
+        Index("idx_mod_actions_log", text("created_at DESC"), text("id DESC")),
+        # Next deadline for app/services/mod_expiry.py
+        Index(
+            "idx_mod_actions_expiry",
+            "expires_at",
+            postgresql_where=text("expires_at IS NOT NULL AND is_reversed = false AND expired_at IS NULL"),
+        ),
+        # Restrictions still in force per actor
+        Index(
+            "idx_mod_actions_restrictions",
+            "target_author_id",
+            postgresql_where=text("action IN ('mute', 'ban') AND is_reversed = false AND expired_at IS NULL"),
+        ),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True), primary_key=True, default=uuid.uuid4
@@ -34,6 +50,19 @@ class ModerationAction(TimestampMixin, Base):
     )
     reason: Mapped[str] = mapped_column(Text, nullable=False)
     duration_hours: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    # Mutes/bans: the restricted actor, and when a timed one lifts
+    target_author_id: Mapped[uuid.UUID | None] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("actors.id", ondelete="SET NULL"),
+        nullable=True,
+    )
+    expires_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
+    # Set when the expiry scheduler lifts it; reversals are is_reversed
+    expired_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
     flag_id: Mapped[uuid.UUID | None] = mapped_column(
         UUID(as_uuid=True),
         ForeignKey("flags.id", ondelete="SET NULL"),
@@ -62,6 +91,8 @@ class ModerationAction(TimestampMixin, Base):
 
 class AuditLog(Base):
     __tablename__ = "audit_log"
+    # Monthly partitions, managed by app/core/audit_partitions.py
+    __table_args__ = {"postgresql_partition_by": "RANGE (created_at)"}
 
     id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True), primary_key=True, default=uuid.uuid4
@@ -81,6 +112,7 @@ class AuditLog(Base):
     ip_address: Mapped[str | None] = mapped_column(String(45), nullable=True)
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
+        primary_key=True,
         server_default=func.now(),
         nullable=False,
     )
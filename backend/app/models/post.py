@@ -3,22 +3,29 @@ from datetime import datetime
 from typing import Optional
 
 from sqlalchemy import (
+    BigInteger,
     Boolean,
+    Computed,
     DateTime,
     Float,
     ForeignKey,
+    Index,
     Integer,
     String,
     Text,
 )
-from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy.dialects.postgresql import TSVECTOR, UUID
+from sqlalchemy.orm import Mapped, deferred, mapped_column, relationship
 
 from app.models.base import Base, TimestampMixin
 
 
 class Post(TimestampMixin, Base):
     __tablename__ = "posts"
+    __table_args__ = (
+        Index("idx_posts_content_hash", "content_hash", "created_at"),
+        Index("idx_posts_search", "search_vector", postgresql_using="gin"),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True), primary_key=True, default=uuid.uuid4
@@ -37,6 +44,20 @@ class Post(TimestampMixin, Base):
     )
     title: Mapped[str] = mapped_column(String(300), nullable=False)
     body: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    # Sanitized HTML rendered from body at write time
+    body_html: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    # Duplicate-detection fingerprints (app/core/dedup.py)
+    content_hash: Mapped[Optional[str]] = mapped_column(String(64), nullable=True)
+    simhash: Mapped[Optional[int]] = mapped_column(BigInteger, nullable=True)
+    # Full-text search (app/api/v1/routes/search.py); never loaded with the row
+    search_vector: Mapped[Optional[str]] = deferred(mapped_column(
+        TSVECTOR,
+        Computed(
+            "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+            "setweight(to_tsvector('english', coalesce(body, '')), 'B')",
+            persisted=True,
+        ),
+    ))
     post_type: Mapped[str] = mapped_column(
         String(16), default="discussion", nullable=False
     )
@@ -0,0 +1,18 @@
+from pydantic import BaseModel
+from typing import Optional
+
+
+class SlowQueryEntry(BaseModel):
+    fingerprint: str
+    sql: str  # Normalized shape — literals replaced, never parameter values
+    route: Optional[str] = None
+    params_fingerprint: Optional[str] = None
+    count: int
+    total_ms: float
+    mean_ms: float
+    max_ms: float
+    last_seen: int
+    plan: Optional[list] = None
+    # False for plain EXPLAIN (statements with side effects are not re-run)
+    plan_analyzed: Optional[bool] = None
+    explained_at: Optional[int] = None
@@ -21,6 +21,7 @@ class CommentPublic(BaseModel):
     author_type: Optional[str] = None
     parent_id: Optional[str] = None
     body: str
+    body_html: Optional[str] = None
     depth: int
     vote_score: int
     posted_via_human_assist: bool
@@ -1,6 +1,8 @@
 from pydantic import BaseModel, Field
 from typing import Optional
 
+from app.core.constants import MOD_BULK_MAX_ITEMS
+
 
 class FlagCreate(BaseModel):
     target_type: str = Field(..., pattern="^(post|comment)$")
@@ -24,3 +26,27 @@ class FlagPublic(BaseModel):
 
 class FlagUpdate(BaseModel):
     status: str = Field(..., pattern="^(reviewed|actioned|dismissed)$")
+
+
+class FlagBulkUpdate(BaseModel):
+    flag_ids: list[str] = Field(..., min_length=1, max_length=MOD_BULK_MAX_ITEMS)
+    status: str = Field(..., pattern="^(reviewed|actioned|dismissed)$")
+
+
+class FlagBulkResult(BaseModel):
+    status: str
+    updated: int
+
+
+class FlagTargetPublic(BaseModel):
+    """One queue entry: a flagged post/comment with its pending flags aggregated."""
+    target_type: str
+    target_id: str
+    pending_count: int
+    reasons: dict[str, int]
+    avg_reporter_trust: float
+    priority: float
+    preview: Optional[str]
+    author_handle: Optional[str]
+    is_removed: bool
+    last_flagged_at: Optional[str]
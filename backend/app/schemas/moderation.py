@@ -1,6 +1,10 @@
-from pydantic import BaseModel, Field
+from datetime import datetime
 from typing import Optional
 
+from pydantic import BaseModel, Field, model_validator
+
+from app.core.constants import MOD_BULK_MAX_ITEMS
+
 
 class ModActionCreate(BaseModel):
     target_type: str = Field(..., pattern="^(post|comment)$")
@@ -11,6 +15,42 @@ class ModActionCreate(BaseModel):
     flag_id: Optional[str] = None
 
 
+class BulkTarget(BaseModel):
+    target_type: str = Field(..., pattern="^(post|comment)$")
+    target_id: str
+
+
+class ModActionBulkCreate(BaseModel):
+    """
+    One action over many items: either explicit targets, or everything
+    by author_id (optionally only content created since `since`), up to
+    MOD_BULK_MAX_ITEMS items per request.
+    """
+    action: str = Field(..., pattern="^(remove|restore|warn|mute|ban|pin|unpin|lock|unlock)$")
+    reason: str = Field(..., min_length=1, max_length=2000)
+    duration_hours: Optional[int] = Field(None, ge=1)
+    targets: Optional[list[BulkTarget]] = Field(None, min_length=1, max_length=MOD_BULK_MAX_ITEMS)
+    author_id: Optional[str] = None
+    since: Optional[datetime] = None
+    resolve_flags: bool = True
+
+    @model_validator(mode="after")
+    def _one_selector(self):
+        if (self.targets is None) == (self.author_id is None):
+            raise ValueError("Provide either targets or author_id.")
+        if self.since is not None and self.author_id is None:
+            raise ValueError("since only applies with author_id.")
+        return self
+
+
+class ModActionBulkResult(BaseModel):
+    action: str
+    applied: int  # records written: items changed, or authors for warn/mute/ban
+    authors_affected: int
+    flags_resolved: int
+    truncated: bool = False  # author_id matched more than MOD_BULK_MAX_ITEMS; repeat for the rest
+
+
 class ModActionPublic(BaseModel):
     id: str
     moderator_handle: str
@@ -21,6 +61,8 @@ class ModActionPublic(BaseModel):
     reason: str
     duration_hours: Optional[int]
     is_reversed: bool
+    expires_at: Optional[str] = None  # timed mutes/bans
+    expired_at: Optional[str] = None  # when a timed one lifted
     created_at: str
 
 
@@ -33,3 +75,4 @@ class AuditEntry(BaseModel):
     resource_id: Optional[str]
     details: Optional[dict]
     created_at: str
+    archived: bool = False  # served from an archive file, not audit_log
@@ -26,6 +26,7 @@ class PostPublic(BaseModel):
     author_type: Optional[str] = None
     title: str
     body: Optional[str] = None
+    body_html: Optional[str] = None
     post_type: str
     link_url: Optional[str] = None
     is_pinned: bool
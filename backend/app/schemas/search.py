@@ -0,0 +1,43 @@
+from pydantic import BaseModel
+from typing import Optional
+
+
+class SearchHit(BaseModel):
+    type: str  # "post" or "comment"
+    id: str
+    post_id: str  # the post itself, or the post a comment belongs to
+    post_title: str
+    community_slug: str
+    author_handle: Optional[str] = None
+    author_type: Optional[str] = None
+    # Matching excerpt: HTML-escaped text with matches wrapped in <mark>
+    snippet: str
+    rank: float
+    vote_score: int
+    comment_count: Optional[int] = None  # posts only
+    created_at: str
+
+
+class SearchPage(BaseModel):
+    results: list[SearchHit]
+    # Pass back as cursor for the next page; null on the last page
+    next_cursor: Optional[str] = None
+
+
+class ActorSuggestion(BaseModel):
+    id: str
+    handle: str
+    display_name: str
+    actor_type: str
+    avatar_url: Optional[str] = None
+
+
+class CommunitySuggestion(BaseModel):
+    id: str
+    slug: str
+    name: str
+
+
+class AutocompleteResult(BaseModel):
+    actors: list[ActorSuggestion] = []
+    communities: list[CommunitySuggestion] = []
@@ -5,7 +5,8 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import settings
-from app.core.constants import ActorRole, ActorType, RESERVED_HANDLES
+from app.core.confusables import RESERVED_SKELETONS, skeleton
+from app.core.constants import ActorRole, ActorType
 from app.core.security import (
     create_access_token,
     create_refresh_token,
@@ -34,15 +35,21 @@ class AuthError(Exception):
 
 
 async def _validate_handle(db: AsyncSession, handle: str) -> None:
-    """Validate handle availability and format."""
-    handle_lower = handle.lower()
-    if handle_lower in RESERVED_HANDLES:
+    """
+    Validate handle availability. Lookalikes count as taken: a handle is
+    rejected if its confusable skeleton matches a reserved handle or any
+    existing actor's (which includes an exact match).
+    """
+    handle_skeleton = skeleton(handle)
+    if handle_skeleton in RESERVED_SKELETONS:
         raise AuthError("Registration failed. Please try a different email or handle.", 409)
 
     existing = await db.execute(
-        select(Actor).where(Actor.handle == handle_lower)
+        select(Actor.id).where(
+            (Actor.handle_skeleton == handle_skeleton) | (Actor.handle == handle.lower())
+        )
     )
-    if existing.scalar_one_or_none():
+    if existing.first():
         raise AuthError("Registration failed. Please try a different email or handle.", 409)
 
 
@@ -0,0 +1,174 @@
+import asyncio
+import multiprocessing
+import os
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Optional
+
+import structlog
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.audit import record_audit
+from app.core.ban_terms import TermMatch
+from app.core.config import settings
+from app.core.constants import SPAM_SCORE_MAX_CHARS, FlagReason, FlagStatus
+from app.core.database import async_session_factory
+from app.core.spam_classifier import score_in_worker
+from app.models.comment import Comment
+from app.models.flag import Flag
+from app.models.post import Post
+from app.services.flag_service import apply_flag
+
+logger = structlog.get_logger()
+
+_TARGET_MODELS = {"post": Post, "comment": Comment}
+
+# Scoring runs in a small process pool (spawned, not forked: the worker
+# holds an event loop, DB pool and threads). Created on first use.
+_pool: Optional[ProcessPoolExecutor] = None
+# Strong references so in-flight checks are not garbage collected.
+_pending: set[asyncio.Task] = set()
+
+
+async def raise_system_flag(
+    db: AsyncSession,
+    target_type: str,
+    target_id: uuid.UUID,
+    reason: str,
+    details: str,
+    source: str,
+) -> Flag:
+    """
+    Queue a platform-raised flag (no reporter) for moderator review.
+    source names the detector, e.g. "dedup", for the audit trail.
+    Caller commits.
+    """
+    flag = Flag(
+        reporter_id=None,
+        target_type=target_type,
+        target_id=target_id,
+        reason=reason,
+        details=details,
+        status=FlagStatus.PENDING.value,
+    )
+    db.add(flag)
+    await apply_flag(db, flag, 1)
+    record_audit(
+        db,
+        actor_id=None,
+        action="auto_flag",
+        resource_type=target_type,
+        resource_id=target_id,
+        details={"reason": reason, "source": source, "details": details},
+    )
+    logger.info(
+        "auto_flag_raised",
+        target_type=target_type,
+        target_id=str(target_id),
+        reason=reason,
+        source=source,
+    )
+    return flag
+
+
+async def flag_term_matches(
+    db: AsyncSession,
+    target_type: str,
+    target_id: uuid.UUID,
+    matches: list[TermMatch],
+) -> None:
+    """
+    Queue one system flag per hard-ban category matched (see
+    app/core/ban_terms.py), skipping categories that already have a
+    pending system flag on the target (e.g. when an edit re-matches).
+    Caller commits.
+    """
+    by_reason: dict[str, list[str]] = {}
+    for match in matches:
+        by_reason.setdefault(match.reason, []).append(match.term)
+
+    result = await db.execute(
+        select(Flag.reason).where(
+            Flag.target_type == target_type,
+            Flag.target_id == target_id,
+            Flag.reporter_id.is_(None),
+            Flag.status == FlagStatus.PENDING.value,
+        )
+    )
+    already_flagged = {FlagReason(r).value for r in result.scalars().all()}
+
+    for reason, terms in by_reason.items():
+        if reason in already_flagged:
+            continue
+        details = "Matched hard-ban terms: " + ", ".join(f'"{t}"' for t in terms)
+        await raise_system_flag(db, target_type, target_id, reason, details, source="ban_terms")
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
+    if _pool is None:
+        _pool = ProcessPoolExecutor(
+            max_workers=settings.spam_scoring_processes,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _pool
+
+
+def schedule_spam_check(target_type: str, target_id: uuid.UUID, text: str) -> None:
+    """
+    Score newly created content in the background. Returns immediately;
+    the request never waits on the classifier.
+    """
+    if not os.path.exists(settings.spam_model_path):
+        return
+    task = asyncio.create_task(_spam_check(target_type, target_id, text[:SPAM_SCORE_MAX_CHARS]))
+    _pending.add(task)
+    task.add_done_callback(_pending.discard)
+
+
+async def _spam_check(target_type: str, target_id: uuid.UUID, text: str) -> None:
+    global _pool
+    try:
+        loop = asyncio.get_running_loop()
+        try:
+            score = await loop.run_in_executor(_get_pool(), score_in_worker, settings.spam_model_path, text)
+        except BrokenProcessPool:
+            # A scoring process died (e.g. OOM-killed); start a fresh pool next time.
+            _pool = None
+            raise
+        if score is None or score < settings.auto_mod_spam_threshold:
+            return
+
+        model = _TARGET_MODELS[target_type]
+        async with async_session_factory() as db:
+            result = await db.execute(select(model).where(model.id == target_id))
+            target = result.scalar_one_or_none()
+            if target is None or target.is_removed:
+                return
+            target.is_removed = True
+            details = f"Spam classifier score {score:.2f} (threshold {settings.auto_mod_spam_threshold})"
+            await raise_system_flag(db, target_type, target_id, FlagReason.SPAM.value, details, source="spam_classifier")
+            record_audit(
+                db,
+                actor_id=None,
+                action="auto_hide",
+                resource_type=target_type,
+                resource_id=target_id,
+                details={"reason": details, "spam_score": round(score, 4)},
+            )
+            await db.commit()
+        logger.info("spam_auto_hidden", target_type=target_type, target_id=str(target_id), score=round(score, 4))
+    except Exception as e:
+        logger.error("spam_check_failed", target_type=target_type, target_id=str(target_id), error=str(e) or type(e).__name__)
+
+
+async def shutdown_spam_scoring() -> None:
+    """Let in-flight checks finish, then stop the scoring processes."""
+    global _pool
+    if _pending:
+        await asyncio.wait(set(_pending), timeout=10)
+    if _pool is not None:
+        _pool.shutdown(cancel_futures=True)
+        _pool = None
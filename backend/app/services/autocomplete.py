@@ -0,0 +1,161 @@
+"""
+Handle and community autocomplete.
+Each query runs in two stages, both index-backed (migration 013):
+
+  prefix  lower(handle) / lower(display_name) LIKE 'q%' (slug /
+          lower(name) for communities), compared and ordered in the "C"
+          collation so each is a btree range scan that stops after LIMIT
+          rows
+  fuzzy   only when the prefix stage came up short and q holds at least
+          one trigram: pg_trgm similarity on the handle or slug and
+          word_similarity on the display name, matched through GIN
+          indexes and ranked by the better of the two
+
+Results for the shortest prefixes, the ones every user types and the most
+expensive to answer, are served from a per-worker PrefixTrie.
+"""
+from sqlalchemy import func, literal, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.constants import (
+    AUTOCOMPLETE_FUZZY_MIN_LENGTH,
+    AUTOCOMPLETE_MAX_LIMIT,
+    AUTOCOMPLETE_TRIE_MAX_DEPTH,
+    AUTOCOMPLETE_TRIE_MAX_ENTRIES,
+    AUTOCOMPLETE_TRIE_TTL_SECONDS,
+)
+from app.core.prefix_trie import PrefixTrie
+from app.models.actor import Actor
+from app.models.community import Community
+from app.schemas.search import ActorSuggestion, CommunitySuggestion
+
+actor_trie = PrefixTrie(AUTOCOMPLETE_TRIE_MAX_DEPTH, AUTOCOMPLETE_TRIE_MAX_ENTRIES, AUTOCOMPLETE_TRIE_TTL_SECONDS)
+community_trie = PrefixTrie(AUTOCOMPLETE_TRIE_MAX_DEPTH, AUTOCOMPLETE_TRIE_MAX_ENTRIES, AUTOCOMPLETE_TRIE_TTL_SECONDS)
+
+
+def normalize_query(q: str) -> str:
+    return " ".join(q.split()).lower()
+
+
+def _c(expr):
+    """expr in the "C" collation the prefix indexes are built with."""
+    return expr.collate("C")
+
+
+def _prefix_pattern(q: str) -> str:
+    # Backslash is LIKE's default escape, which the planner understands
+    # when turning the pattern into an index range.
+    escaped = q.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return escaped + "%"
+
+
+def _merge(*stages: list, limit: int) -> list:
+    seen = set()
+    merged = []
+    for rows in stages:
+        for row in rows:
+            if row.id not in seen:
+                seen.add(row.id)
+                merged.append(row)
+    return merged[:limit]
+
+
+async def _query_actors(db: AsyncSession, q: str, limit: int) -> list[ActorSuggestion]:
+    columns = (Actor.id, Actor.handle, Actor.display_name, Actor.actor_type, Actor.avatar_url)
+    pattern = _prefix_pattern(q)
+    by_handle = (await db.execute(
+        select(*columns)
+        .where(_c(func.lower(Actor.handle)).like(pattern), Actor.is_active == True)  # noqa: E712
+        .order_by(_c(func.lower(Actor.handle)))
+        .limit(limit)
+    )).all()
+    by_name = []
+    if len(by_handle) < limit:
+        by_name = (await db.execute(
+            select(*columns)
+            .where(_c(func.lower(Actor.display_name)).like(pattern), Actor.is_active == True)  # noqa: E712
+            .order_by(_c(func.lower(Actor.display_name)))
+            .limit(limit)
+        )).all()
+    rows = _merge(by_handle, by_name, limit=limit)
+
+    if len(rows) < limit and len(q) >= AUTOCOMPLETE_FUZZY_MIN_LENGTH:
+        score = func.greatest(
+            func.similarity(Actor.handle, q),
+            func.word_similarity(q, Actor.display_name),
+        )
+        fuzzy = (await db.execute(
+            select(*columns)
+            .where(
+                or_(Actor.handle.op("%")(q), literal(q).op("<%")(Actor.display_name)),
+                Actor.is_active == True,  # noqa: E712
+            )
+            .order_by(score.desc(), Actor.handle)
+            .limit(limit)
+        )).all()
+        rows = _merge(rows, fuzzy, limit=limit)
+
+    return [
+        ActorSuggestion(
+            id=str(row.id),
+            handle=row.handle,
+            display_name=row.display_name,
+            actor_type=row.actor_type,
+            avatar_url=row.avatar_url,
+        )
+        for row in rows
+    ]
+
+
+async def _query_communities(db: AsyncSession, q: str, limit: int) -> list[CommunitySuggestion]:
+    columns = (Community.id, Community.slug, Community.name)
+    pattern = _prefix_pattern(q)
+    by_slug = (await db.execute(
+        select(*columns).where(_c(Community.slug).like(pattern)).order_by(_c(Community.slug)).limit(limit)
+    )).all()
+    by_name = []
+    if len(by_slug) < limit:
+        by_name = (await db.execute(
+            select(*columns)
+            .where(_c(func.lower(Community.name)).like(pattern))
+            .order_by(_c(func.lower(Community.name)))
+            .limit(limit)
+        )).all()
+    rows = _merge(by_slug, by_name, limit=limit)
+
+    if len(rows) < limit and len(q) >= AUTOCOMPLETE_FUZZY_MIN_LENGTH:
+        score = func.greatest(
+            func.similarity(Community.slug, q),
+            func.word_similarity(q, Community.name),
+        )
+        fuzzy = (await db.execute(
+            select(*columns)
+            .where(or_(Community.slug.op("%")(q), literal(q).op("<%")(Community.name)))
+            .order_by(score.desc(), Community.slug)
+            .limit(limit)
+        )).all()
+        rows = _merge(rows, fuzzy, limit=limit)
+
+    return [CommunitySuggestion(id=str(row.id), slug=row.slug, name=row.name) for row in rows]
+
+
+async def suggest_actors(db: AsyncSession, q: str, limit: int) -> list[ActorSuggestion]:
+    """Active actors whose handle or display name starts with, or resembles, q."""
+    if not actor_trie.cacheable(q):
+        return await _query_actors(db, q, limit)
+    suggestions = actor_trie.get(q)
+    if suggestions is None:
+        suggestions = await _query_actors(db, q, AUTOCOMPLETE_MAX_LIMIT)
+        actor_trie.put(q, suggestions)
+    return suggestions[:limit]
+
+
+async def suggest_communities(db: AsyncSession, q: str, limit: int) -> list[CommunitySuggestion]:
+    """Communities whose slug or name starts with, or resembles, q."""
+    if not community_trie.cacheable(q):
+        return await _query_communities(db, q, limit)
+    suggestions = community_trie.get(q)
+    if suggestions is None:
+        suggestions = await _query_communities(db, q, AUTOCOMPLETE_MAX_LIMIT)
+        community_trie.put(q, suggestions)
+    return suggestions[:limit]
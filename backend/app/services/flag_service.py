@@ -0,0 +1,172 @@
+import uuid
+from datetime import datetime, timezone
+
+from sqlalchemy import String, case, cast, func, literal, select, tuple_, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.audit import record_audit
+from app.core.constants import (
+    FLAG_REASON_WEIGHTS,
+    HIGH_TRUST_THRESHOLD,
+    SYSTEM_FLAG_TRUST,
+    FlagStatus,
+)
+from app.models.flag import Flag, FlagTarget
+
+Target = tuple[str, uuid.UUID]
+
+
+def flag_weight(reason: str, reporter_trust: float | None) -> float:
+    """A pending flag's contribution to its target's queue priority."""
+    trust = SYSTEM_FLAG_TRUST if reporter_trust is None else reporter_trust
+    return FLAG_REASON_WEIGHTS.get(reason, 1.0) * (1 + trust / HIGH_TRUST_THRESHOLD)
+
+
+async def apply_flag(db: AsyncSession, flag: Flag, sign: int) -> int:
+    """
+    Add (sign=1) or remove (sign=-1) a pending flag from its target's
+    aggregate in flag_targets and return the new pending count: one
+    upsert, no COUNT over flags. Runs in the caller's transaction, so the
+    aggregate commits or rolls back with the flag.
+    """
+    reason = getattr(flag.reason, "value", flag.reason)
+    trust = SYSTEM_FLAG_TRUST if flag.reporter_trust is None else flag.reporter_trust
+    weight = flag_weight(reason, flag.reporter_trust)
+    adding = sign > 0
+
+    stmt = insert(FlagTarget).values(
+        target_type=flag.target_type,
+        target_id=flag.target_id,
+        pending_count=1 if adding else 0,
+        priority=weight if adding else 0.0,
+        reporter_trust_sum=trust if adding else 0.0,
+        reason_counts={reason: 1} if adding else {},
+        last_flagged_at=datetime.now(timezone.utc) if adding else None,
+    )
+    current_reason = func.coalesce(FlagTarget.reason_counts[reason].as_integer(), 0)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[FlagTarget.target_type, FlagTarget.target_id],
+        set_={
+            "pending_count": func.greatest(FlagTarget.pending_count + sign, 0),
+            "priority": func.greatest(FlagTarget.priority + sign * weight, 0.0),
+            "reporter_trust_sum": func.greatest(FlagTarget.reporter_trust_sum + sign * trust, 0.0),
+            "reason_counts": FlagTarget.reason_counts.concat(
+                func.jsonb_build_object(literal(reason), func.greatest(current_reason + sign, 0))
+            ),
+            "last_flagged_at": (
+                stmt.excluded.last_flagged_at if adding else FlagTarget.last_flagged_at
+            ),
+        },
+    ).returning(FlagTarget.pending_count)
+    result = await db.execute(stmt)
+    return result.scalar_one()
+
+
+async def recompute_targets(db: AsyncSession, targets: set[Target]) -> None:
+    """
+    Rebuild the flag_targets aggregates of many targets from their pending
+    flags in two set-based statements. Used by bulk paths, where per-flag
+    apply_flag round trips would defeat the point.
+    """
+    if not targets:
+        return
+    keys = list(targets)
+    await db.execute(
+        update(FlagTarget)
+        .where(tuple_(FlagTarget.target_type, FlagTarget.target_id).in_(keys))
+        .values(pending_count=0, priority=0.0, reporter_trust_sum=0.0, reason_counts={})
+        .execution_options(synchronize_session=False)
+    )
+
+    trust = func.coalesce(Flag.reporter_trust, SYSTEM_FLAG_TRUST)
+    reason = cast(Flag.reason, String)
+    weight = case(FLAG_REASON_WEIGHTS, value=reason, else_=1.0) * (1 + trust / HIGH_TRUST_THRESHOLD)
+    per_reason = (
+        select(
+            Flag.target_type,
+            Flag.target_id,
+            reason.label("reason"),
+            func.count().label("n"),
+            func.sum(weight).label("weight"),
+            func.sum(trust).label("trust"),
+            func.max(Flag.created_at).label("last"),
+        )
+        .where(
+            Flag.status == FlagStatus.PENDING.value,
+            tuple_(Flag.target_type, Flag.target_id).in_(keys),
+        )
+        .group_by(Flag.target_type, Flag.target_id, reason)
+        .subquery()
+    )
+    aggregated = select(
+        per_reason.c.target_type,
+        per_reason.c.target_id,
+        func.sum(per_reason.c.n),
+        func.sum(per_reason.c.weight),
+        func.sum(per_reason.c.trust),
+        func.jsonb_object_agg(per_reason.c.reason, per_reason.c.n),
+        func.max(per_reason.c.last),
+    ).group_by(per_reason.c.target_type, per_reason.c.target_id)
+
+    stmt = insert(FlagTarget).from_select(
+        ["target_type", "target_id", "pending_count", "priority",
+         "reporter_trust_sum", "reason_counts", "last_flagged_at"],
+        aggregated,
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[FlagTarget.target_type, FlagTarget.target_id],
+        set_={
+            col: stmt.excluded[col]
+            for col in ("pending_count", "priority", "reporter_trust_sum", "reason_counts", "last_flagged_at")
+        },
+    )
+    await db.execute(stmt)
+
+
+async def resolve_flags(
+    db: AsyncSession,
+    status: str,
+    reviewer_id: uuid.UUID,
+    flag_ids: list[uuid.UUID] | None = None,
+    targets: set[Target] | None = None,
+) -> int:
+    """
+    Set the status of many flags at once: the given flag_ids, or every
+    pending flag on the given targets. One UPDATE .. RETURNING, an audit
+    entry per flag and one aggregate rebuild. Caller commits.
+    Returns the number of flags updated.
+    """
+    stmt = update(Flag).values(
+        status=status,
+        reviewer_id=reviewer_id,
+        reviewed_at=func.now(),
+    )
+    if flag_ids is not None:
+        stmt = stmt.where(Flag.id.in_(flag_ids), Flag.status != status)
+    elif targets:
+        stmt = stmt.where(
+            tuple_(Flag.target_type, Flag.target_id).in_(list(targets)),
+            Flag.status == FlagStatus.PENDING.value,
+        )
+    else:
+        return 0
+    result = await db.execute(
+        stmt.returning(Flag.id, Flag.target_type, Flag.target_id)
+        .execution_options(synchronize_session=False)
+    )
+    rows = result.all()
+    if not rows:
+        return 0
+
+    for row in rows:
+        record_audit(
+            db,
+            actor_id=reviewer_id,
+            action=f"flag_{status}",
+            resource_type="flag",
+            resource_id=row.id,
+            details={"target_type": row.target_type, "target_id": str(row.target_id), "bulk": True},
+        )
+    await recompute_targets(db, {(row.target_type, row.target_id) for row in rows})
+    return len(rows)
@@ -0,0 +1,173 @@
+"""
+Expiry of timed mutes and bans.
+A mute/ban with duration_hours stores its deadline in
+moderation_actions.expires_at. One scheduler per deployment (whichever
+worker holds a Postgres advisory lock) sleeps until the earliest
+unexpired deadline, read from the partial index idx_mod_actions_expiry,
+then lifts everything due in batches: the action gets expired_at (it is
+not marked reversed; that is for moderators overturning it), an audit
+entry is written, and the author is reactivated unless another mute/ban
+still applies.
+
+New timed actions NOTIFY the scheduler on commit, so a deadline earlier
+than the one it is sleeping towards is never late. The sleep is capped
+at MOD_EXPIRY_MAX_SLEEP_SECONDS in case a notification is lost. If the
+leading worker dies its lock is released with its connection, and
+another worker takes over within MOD_EXPIRY_LEADER_RETRY_SECONDS.
+"""
+import asyncio
+from typing import Optional
+
+import structlog
+from sqlalchemy import func, select, text
+
+from app.core.audit import record_audit
+from app.core.constants import (
+    MOD_EXPIRY_BATCH,
+    MOD_EXPIRY_LEADER_RETRY_SECONDS,
+    MOD_EXPIRY_MAX_SLEEP_SECONDS,
+)
+from app.core.database import async_session_factory, engine
+from app.models.moderation import ModerationAction
+from app.services.moderation_service import (
+    EXPIRY_CHANNEL,
+    commit_moderation,
+    moderation_log_changed,
+    reactivate_authors,
+)
+
+logger = structlog.get_logger()
+
+# Session-level advisory lock held by the leading worker.
+_LEADER_LOCK_KEY = 4_170_047
+
+# Seconds until the earliest deadline, by the database clock (the one
+# expire_due compares against).
+_SECONDS_TO_NEXT_DEADLINE = select(
+    func.extract("epoch", func.min(ModerationAction.expires_at) - func.now())
+).where(
+    ModerationAction.expires_at.is_not(None),
+    ModerationAction.is_reversed == False,  # noqa: E712
+    ModerationAction.expired_at.is_(None),
+)
+
+
+async def expire_due(limit: int = MOD_EXPIRY_BATCH) -> int:
+    """
+    Lift up to limit mutes/bans whose deadline has passed, in one
+    transaction. Safe to run concurrently (rows are claimed with SKIP
+    LOCKED). Returns the number lifted.
+    """
+    async with async_session_factory() as db:
+        result = await db.execute(text("""
+            UPDATE moderation_actions m
+            SET expired_at = now()
+            FROM (
+                SELECT id FROM moderation_actions
+                WHERE expires_at <= now() AND is_reversed = false AND expired_at IS NULL
+                ORDER BY expires_at
+                LIMIT :limit
+                FOR UPDATE SKIP LOCKED
+            ) due
+            WHERE m.id = due.id
+            RETURNING m.id, m.action, m.target_type, m.target_id, m.target_author_id, m.expires_at
+        """), {"limit": limit})
+        expired = result.all()
+        if not expired:
+            return 0
+        moderation_log_changed(db)
+
+        reactivated = set(await reactivate_authors(
+            db, list({row.target_author_id for row in expired if row.target_author_id})
+        ))
+        for row in expired:
+            record_audit(
+                db,
+                actor_id=None,
+                action=f"mod_{row.action}_expired",
+                resource_type=row.target_type,
+                resource_id=row.target_id,
+                details={
+                    "original_action_id": str(row.id),
+                    "expires_at": row.expires_at.isoformat(),
+                    "target_author_id": str(row.target_author_id) if row.target_author_id else None,
+                    "reactivated": row.target_author_id in reactivated,
+                },
+            )
+        await commit_moderation(db)
+
+    logger.info("mod_actions_expired", expired=len(expired), reactivated=len(reactivated))
+    return len(expired)
+
+
+class ExpiryScheduler:
+    def __init__(self):
+        self._task: Optional[asyncio.Task] = None
+        self._wake = asyncio.Event()
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        if not self.running:
+            self._wake = asyncio.Event()
+            self._task = asyncio.create_task(self._run(), name="mod-expiry")
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    def _on_notify(self, *_args) -> None:
+        self._wake.set()
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self._lead()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error("mod_expiry_scheduler_failed", error=str(e) or type(e).__name__)
+            await asyncio.sleep(MOD_EXPIRY_LEADER_RETRY_SECONDS)
+
+    async def _lead(self) -> None:
+        """Run the scheduler while holding the leader lock; return if another worker has it."""
+        async with engine.connect() as conn:
+            conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+            acquired = (await conn.execute(
+                text("SELECT pg_try_advisory_lock(:key)"), {"key": _LEADER_LOCK_KEY}
+            )).scalar_one()
+            if not acquired:
+                return
+            raw = (await conn.get_raw_connection()).driver_connection
+            try:
+                await raw.add_listener(EXPIRY_CHANNEL, self._on_notify)
+                logger.info("mod_expiry_scheduler_leading")
+                while True:
+                    # Cleared before reading the deadline: a NOTIFY that
+                    # arrives meanwhile cuts the next sleep short.
+                    self._wake.clear()
+                    while await expire_due() == MOD_EXPIRY_BATCH:
+                        pass
+                    wait = (await conn.execute(_SECONDS_TO_NEXT_DEADLINE)).scalar_one()
+                    timeout = MOD_EXPIRY_MAX_SLEEP_SECONDS
+                    if wait is not None:
+                        timeout = min(max(float(wait), 0), timeout)
+                    try:
+                        await asyncio.wait_for(self._wake.wait(), timeout)
+                    except asyncio.TimeoutError:
+                        pass
+            finally:
+                # Close rather than return the connection to the pool: that
+                # drops the advisory lock and the listener with it.
+                await conn.invalidate()
+
+
+expiry_scheduler = ExpiryScheduler()
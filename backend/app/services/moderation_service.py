@@ -0,0 +1,282 @@
+import uuid
+from collections import Counter
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+import structlog
+from sqlalchemy import bindparam, exists, func, select, text, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.audit import record_audit
+from app.core.constants import (
+    ModAction, FlagStatus, MOD_BULK_MAX_ITEMS, MOD_LOG_CACHE_TTL_SECONDS,
+    TRUST_FLAG_ACTIONED, TRUST_WARNED, TRUST_MUTED, TRUST_MIN, TRUST_MAX,
+)
+from app.core.page_cache import PageCache
+from app.models.actor import Actor
+from app.models.comment import Comment
+from app.models.moderation import ModerationAction
+from app.models.post import Post
+from app.services.flag_service import Target, resolve_flags
+
+logger = structlog.get_logger()
+
+_CONTENT_MODELS = {"post": Post, "comment": Comment}
+
+# Column flips per content action; pin/lock only exist on posts.
+_CONTENT_UPDATES = {
+    ModAction.REMOVE.value: ("is_removed", True),
+    ModAction.RESTORE.value: ("is_removed", False),
+    ModAction.PIN.value: ("is_pinned", True),
+    ModAction.UNPIN.value: ("is_pinned", False),
+    ModAction.LOCK.value: ("is_locked", True),
+    ModAction.UNLOCK.value: ("is_locked", False),
+}
+_AUTHOR_ACTIONS = {ModAction.WARN.value, ModAction.MUTE.value, ModAction.BAN.value}
+# Actions that confirm the content broke the rules: their flags are actioned.
+_ACTIONING = {ModAction.REMOVE.value} | _AUTHOR_ACTIONS
+# Actions that deactivate the author until expired or reversed.
+RESTRICTING_ACTIONS = frozenset({ModAction.MUTE.value, ModAction.BAN.value})
+
+# NOTIFY channel the expiry scheduler listens on (app/services/mod_expiry.py).
+EXPIRY_CHANNEL = "cg_mod_expiry"
+
+# Newest pages of GET /moderation/log. Writers of moderation_actions mark
+# the session with moderation_log_changed and commit via commit_moderation,
+# which invalidates it.
+moderation_log_cache = PageCache("modlog", MOD_LOG_CACHE_TTL_SECONDS)
+_LOG_CHANGED_KEY = "moderation_log_changed"
+
+
+def moderation_log_changed(db: AsyncSession) -> None:
+    """Note that db wrote to moderation_actions."""
+    db.info[_LOG_CHANGED_KEY] = True
+
+
+def add_moderation_action(db: AsyncSession, **fields) -> ModerationAction:
+    """Add a ModerationAction to db. Commit with commit_moderation."""
+    action = ModerationAction(**fields)
+    db.add(action)
+    moderation_log_changed(db)
+    return action
+
+
+async def commit_moderation(db: AsyncSession) -> None:
+    """Commit db, then drop the cached log pages if it changed moderation_actions."""
+    await db.commit()
+    if db.info.pop(_LOG_CHANGED_KEY, False):
+        await moderation_log_cache.invalidate()
+
+
+def restriction_expiry(action: str, duration_hours: Optional[int]) -> Optional[datetime]:
+    """When a mute/ban taken now lifts; None if permanent or not a restriction."""
+    if action not in RESTRICTING_ACTIONS or not duration_hours:
+        return None
+    return datetime.now(timezone.utc) + timedelta(hours=duration_hours)
+
+
+async def notify_expiry_scheduler(db: AsyncSession) -> None:
+    """
+    Wake the expiry scheduler once db commits, so a deadline earlier than
+    the one it is sleeping towards is not missed.
+    """
+    await db.execute(text("SELECT pg_notify(:channel, '')"), {"channel": EXPIRY_CHANNEL})
+
+
+async def reactivate_authors(db: AsyncSession, author_ids: list[uuid.UUID]) -> list[uuid.UUID]:
+    """
+    Reactivate the given actors unless another mute/ban is still in force
+    for them. Returns the ids reactivated. Caller commits.
+    """
+    if not author_ids:
+        return []
+    still_restricted = exists().where(
+        ModerationAction.target_author_id == Actor.id,
+        ModerationAction.action.in_(list(RESTRICTING_ACTIONS)),
+        ModerationAction.is_reversed == False,  # noqa: E712
+        ModerationAction.expired_at.is_(None),
+    )
+    result = await db.execute(
+        update(Actor)
+        .where(Actor.id.in_(author_ids), Actor.is_active == False, ~still_restricted)  # noqa: E712
+        .values(is_active=True)
+        .returning(Actor.id)
+        .execution_options(synchronize_session=False)
+    )
+    return list(result.scalars())
+
+
+@dataclass
+class BulkResult:
+    applied: int
+    authors_affected: int
+    flags_resolved: int
+    # An author_id selection hit MOD_BULK_MAX_ITEMS; run it again for the rest.
+    truncated: bool = False
+
+
+async def apply_bulk_action(
+    db: AsyncSession,
+    moderator_id: uuid.UUID,
+    action: str,
+    reason: str,
+    duration_hours: Optional[int] = None,
+    targets: Optional[list[Target]] = None,
+    author_id: Optional[uuid.UUID] = None,
+    since: Optional[datetime] = None,
+    resolve_pending_flags: bool = True,
+) -> BulkResult:
+    """
+    Apply one moderation action to many posts/comments in the caller's
+    transaction, set-based: one UPDATE .. RETURNING per content table,
+    one executemany for author trust, a batched ModerationAction insert
+    and audit entries via record_audit. Select content either by explicit
+    targets or by author (optionally only content created since a time),
+    at most MOD_BULK_MAX_ITEMS items either way.
+
+    Content actions only touch (and record) items whose state actually
+    changes, so re-running a truncated bulk removal picks up where it
+    stopped. warn/mute/ban are recorded once per distinct author, as an
+    "actor" target, however many of their items are selected; an
+    author_id selection applies them even if the author has no content.
+    Caller commits with commit_moderation.
+    """
+    affected: list[tuple[str, uuid.UUID, Optional[uuid.UUID]]] = []
+    truncated = False
+    for target_type, model in _CONTENT_MODELS.items():
+        if targets is not None:
+            ids = [target_id for t, target_id in targets if t == target_type]
+            if not ids:
+                continue
+            condition = model.id.in_(ids)
+        else:
+            room = MOD_BULK_MAX_ITEMS - len(affected)
+            if room <= 0:
+                truncated = True
+                break
+            condition = model.author_id == author_id
+            if since is not None:
+                condition = condition & (model.created_at >= since)
+
+        if action in _CONTENT_UPDATES:
+            column, value = _CONTENT_UPDATES[action]
+            if not hasattr(model, column):
+                continue
+            condition = condition & (getattr(model, column) != value)
+        if targets is None:
+            condition = model.id.in_(
+                select(model.id).where(condition).order_by(model.created_at.desc()).limit(room)
+            )
+
+        if action in _CONTENT_UPDATES:
+            stmt = (
+                update(model)
+                .where(condition)
+                .values({column: value})
+                .returning(model.id, model.author_id)
+                .execution_options(synchronize_session=False)
+            )
+        else:
+            stmt = select(model.id, model.author_id).where(condition)
+        rows = (await db.execute(stmt)).all()
+        affected += [(target_type, row.id, row.author_id) for row in rows]
+        if targets is None and len(rows) == room:
+            truncated = True
+
+    per_author = Counter(author for _, _, author in affected if author)
+    if author_id is not None and action in _AUTHOR_ACTIONS:
+        per_author.setdefault(author_id, 0)
+    if not affected and not per_author:
+        return BulkResult(0, 0, 0)
+
+    # ── Author effects, one statement for all authors ──────────────
+    trust_deltas: dict[uuid.UUID, float] = {}
+    if action == ModAction.REMOVE.value:
+        trust_deltas = {author: n * TRUST_FLAG_ACTIONED for author, n in per_author.items()}
+    elif action == ModAction.WARN.value:
+        trust_deltas = dict.fromkeys(per_author, TRUST_WARNED)
+    elif action in RESTRICTING_ACTIONS:
+        trust_deltas = dict.fromkeys(per_author, TRUST_MUTED)
+
+    if trust_deltas:
+        actors = Actor.__table__
+        values = {
+            "trust_score": func.greatest(
+                TRUST_MIN, func.least(TRUST_MAX, actors.c.trust_score + bindparam("b_delta"))
+            ),
+        }
+        if action in RESTRICTING_ACTIONS:
+            values["is_active"] = False
+        await db.execute(
+            update(actors).where(actors.c.id == bindparam("b_id")).values(values),
+            [{"b_id": author, "b_delta": delta} for author, delta in trust_deltas.items()],
+        )
+
+    handles = {}
+    if per_author:
+        result = await db.execute(select(Actor.id, Actor.handle).where(Actor.id.in_(list(per_author))))
+        handles = {row.id: row.handle for row in result}
+
+    # ── Records, batched ────────────────────────────────────────────
+    # (target type, target id, restricted author, items it stands for)
+    if action in _AUTHOR_ACTIONS:
+        records = [("actor", author, author, n) for author, n in per_author.items()]
+    else:
+        records = [(target_type, target_id, None, None) for target_type, target_id, _ in affected]
+    restricting = action in RESTRICTING_ACTIONS
+    expires_at = restriction_expiry(action, duration_hours)
+    await db.execute(insert(ModerationAction), [
+        {
+            "moderator_id": moderator_id,
+            "target_type": target_type,
+            "target_id": target_id,
+            "action": action,
+            "reason": reason,
+            "duration_hours": duration_hours,
+            "target_author_id": author if restricting else None,
+            "expires_at": expires_at,
+        }
+        for target_type, target_id, author, _ in records
+    ])
+    moderation_log_changed(db)
+    if expires_at is not None:
+        await notify_expiry_scheduler(db)
+    authors_of = {target_id: author for _, target_id, author in affected}
+    for target_type, target_id, author, items in records:
+        details = {
+            "reason": reason,
+            "target_author": handles.get(author or authors_of.get(target_id)),
+            "bulk": True,
+        }
+        if items is not None:
+            details["items"] = items
+        record_audit(
+            db,
+            actor_id=moderator_id,
+            action=f"mod_{action}",
+            resource_type=target_type,
+            resource_id=target_id,
+            details=details,
+        )
+
+    flags_resolved = 0
+    if resolve_pending_flags and action in _ACTIONING and affected:
+        flags_resolved = await resolve_flags(
+            db,
+            FlagStatus.ACTIONED.value,
+            moderator_id,
+            targets={(target_type, target_id) for target_type, target_id, _ in affected},
+        )
+
+    logger.info(
+        "bulk_moderation_action",
+        action=action,
+        applied=len(records),
+        items=len(affected),
+        authors=len(per_author),
+        flags_resolved=flags_resolved,
+        truncated=truncated,
+    )
+    return BulkResult(len(records), len(per_author), flags_resolved, truncated)
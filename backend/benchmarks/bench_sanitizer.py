@@ -0,0 +1,150 @@
+"""
+Common Ground - Sanitizer benchmark
+Compares per-call bleach.clean with the prebuilt cleaners in
+app.core.sanitizer over realistic post bodies, and measures how long the
+event loop stalls while a large body is sanitized.
+Run with: docker exec cg-backend python -m benchmarks.bench_sanitizer
+"""
+
+import asyncio
+import os
+import random
+import sys
+import time
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import bleach
+
+from app.core import sanitizer
+from app.core.sanitizer import (
+    ALLOWED_ATTRIBUTES,
+    ALLOWED_PROTOCOLS,
+    ALLOWED_TAGS,
+    sanitize_html,
+    sanitize_html_async,
+)
+
+_WORDS = (
+    "agents humans forum trust moderation council policy proposal evidence "
+    "reasoning community thread reply vote consensus model context question "
+    "answer source claim argument honest transparent governance"
+).split()
+
+
+def _prose(rng: random.Random, sentences: int) -> str:
+    out = []
+    for _ in range(sentences):
+        words = rng.choices(_WORDS, k=rng.randint(6, 20))
+        out.append(" ".join(words).capitalize() + ".")
+    return " ".join(out)
+
+
+def _markdown(rng: random.Random, paragraphs: int) -> str:
+    blocks = []
+    for i in range(paragraphs):
+        kind = i % 5
+        if kind == 0:
+            blocks.append(f"## {_prose(rng, 1)[:40]}")
+        elif kind == 1:
+            blocks.append(
+                f"{_prose(rng, 3)} See [the proposal](https://common-ground.live/p/{i}) "
+                f"and **why it matters**."
+            )
+        elif kind == 2:
+            blocks.append("\n".join(f"- {_prose(rng, 1)}" for _ in range(4)))
+        elif kind == 3:
+            blocks.append(f"```\nscore = a & b  # {i}\nif x < y: pass\n```")
+        else:
+            blocks.append(f"> {_prose(rng, 2)}")
+    return "\n\n".join(blocks)
+
+
+def _html(rng: random.Random, paragraphs: int) -> str:
+    parts = [f"<p>{_prose(rng, 3)}</p>" for _ in range(paragraphs)]
+    parts.insert(1, '<script>alert("x")</script><a href="javascript:evil()">link</a>')
+    return "".join(parts)
+
+
+def corpus() -> dict[str, list[str]]:
+    rng = random.Random(42)
+    return {
+        "plain short (comment)": [_prose(rng, rng.randint(1, 4)) for _ in range(200)],
+        "plain long (essay)": [_prose(rng, rng.randint(40, 120)) for _ in range(50)],
+        "markdown (post)": [_markdown(rng, rng.randint(5, 20)) for _ in range(50)],
+        "html w/ payloads": [_html(rng, rng.randint(3, 10)) for _ in range(50)],
+        "max-size body (40k)": [_markdown(rng, 400)[:40000] for _ in range(5)],
+    }
+
+
+def _legacy(text: str) -> str:
+    return bleach.clean(
+        text,
+        tags=ALLOWED_TAGS,
+        attributes=ALLOWED_ATTRIBUTES,
+        protocols=ALLOWED_PROTOCOLS,
+        strip=True,
+    )
+
+
+def _time_per_item(fn, items: list[str], rounds: int = 3) -> float:
+    best = float("inf")
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for text in items:
+            fn(text)
+        best = min(best, time.perf_counter() - start)
+    return best / len(items) * 1e6
+
+
+async def _loop_stall(fn, text: str, n: int = 5) -> float:
+    """Longest gap between 1ms ticks of a concurrent task while fn runs n times."""
+    gaps = []
+    running = True
+
+    async def ticker():
+        last = time.perf_counter()
+        while running:
+            await asyncio.sleep(0.001)
+            now = time.perf_counter()
+            gaps.append(now - last)
+            last = now
+
+    task = asyncio.create_task(ticker())
+    await asyncio.sleep(0.01)
+    for _ in range(n):
+        await fn(text)
+    running = False
+    await task
+    return max(gaps) * 1000
+
+
+async def _inline(text: str) -> str:
+    return sanitize_html(text)
+
+
+def main():
+    print(f"{'corpus':<24}{'bleach.clean':>14}{'prebuilt':>12}{'speedup':>10}")
+    for name, items in corpus().items():
+        legacy = _time_per_item(_legacy, items)
+        current = _time_per_item(sanitize_html, items)
+        print(f"{name:<24}{legacy:>11.0f} us{current:>9.0f} us{legacy / current:>9.1f}x")
+
+    for name, items in corpus().items():
+        mismatched = sum(_legacy(t) != sanitize_html(t) for t in items)
+        if mismatched:
+            print(f"OUTPUT MISMATCH in {name}: {mismatched} items")
+
+    big = corpus()["max-size body (40k)"][0] + "<b>x</b>"
+    inline = asyncio.run(_loop_stall(_inline, big))
+    offloaded = asyncio.run(_loop_stall(sanitize_html_async, big))
+    print(
+        f"\nevent loop stall, 40k body x5: inline {inline:.1f} ms, "
+        f"offloaded {offloaded:.1f} ms "
+        f"(threshold {sanitizer.SANITIZE_OFFLOAD_THRESHOLD} chars)"
+    )
+
+
+if __name__ == "__main__":
+    main()
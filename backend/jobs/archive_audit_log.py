@@ -0,0 +1,78 @@
+"""
+Common Ground - audit log partition maintenance
+Creates audit_log partitions for the coming months, then archives every
+month older than the retention window: the partition is exported to
+AUDIT_ARCHIVE_DIR/audit_log_YYYY_MM.jsonl.gz, checked, detached and
+dropped. Archived entries remain searchable through
+GET /api/v1/moderation/audit?include_archived=true.
+
+Run daily (cron); a run with nothing to do only checks the partition list.
+
+Run with: docker exec cg-backend python -m jobs.archive_audit_log
+Options:  --keep-months 12 --dry-run
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+from datetime import datetime, timezone
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import text
+
+from app.core.audit_partitions import (
+    add_months,
+    archive_partition,
+    ensure_partitions,
+    list_partitions,
+    month_start,
+    partition_name,
+)
+from app.core.config import settings
+from app.core.database import engine
+
+
+async def main(args):
+    started = time.perf_counter()
+    async with engine.connect() as conn:
+        created = await ensure_partitions(conn)
+        months = await list_partitions(conn)
+        stray = (await conn.execute(text("SELECT count(*) FROM audit_log_default"))).scalar_one()
+        if args.dry_run:
+            await conn.rollback()
+            print(f"Would create partitions: {', '.join(created) or 'none'}")
+        else:
+            await conn.commit()
+            print(f"Created partitions: {', '.join(created) or 'none'}")
+    if stray:
+        print(f"WARNING: {stray} rows in audit_log_default (partition maintenance lapsed?)")
+
+    cutoff = add_months(month_start(datetime.now(timezone.utc).date()), -args.keep_months)
+    expired = [month for month in months if month < cutoff]
+    print(f"Keeping {args.keep_months} months; {len(expired)} partitions before {cutoff:%Y-%m} to archive")
+
+    for month in expired:
+        if args.dry_run:
+            print(f"  would archive {partition_name(month)}")
+            continue
+        # One transaction per month: a failure keeps that partition and
+        # stops the run, leaving earlier archives complete.
+        async with engine.begin() as conn:
+            # DETACH briefly locks audit_log; don't queue behind long queries.
+            await conn.execute(text("SET LOCAL lock_timeout = '5s'"))
+            result = await archive_partition(conn, month)
+        print(f"  archived {partition_name(month)}: {result.rows} rows -> {result.path}")
+
+    await engine.dispose()
+    print(f"Done in {time.perf_counter() - started:.1f}s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Create upcoming audit_log partitions and archive old ones.")
+    parser.add_argument("--keep-months", type=int, default=settings.audit_retention_months)
+    parser.add_argument("--dry-run", action="store_true", help="report what would be archived")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,114 @@
+"""
+Common Ground - body_html backfill
+Renders Markdown bodies of existing posts and comments into body_html.
+Rows are read in keyset-paginated batches, rendered in parallel across a
+process pool, and written back with one executemany UPDATE per batch.
+A row is only written if its body is unchanged since it was read, so
+edits made while the job runs are never overwritten.
+
+Run with: docker exec cg-backend python -m jobs.backfill_body_html
+Options:  --all (re-render every row, e.g. after a renderer change)
+          --batch-size 500 --workers 4
+"""
+
+import argparse
+import asyncio
+import hashlib
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import Table, bindparam, func, select, update
+
+from app.core.database import engine
+from app.core.sanitizer import render_markdown
+from app.models.comment import Comment
+from app.models.post import Post
+
+
+def _digest(body: str) -> str:
+    return hashlib.md5(body.encode()).hexdigest()
+
+
+def _render_batch(rows: list[tuple[str, str]]) -> list[dict]:
+    """Runs in a worker process."""
+    return [
+        {"b_id": row_id, "b_digest": _digest(body), "b_html": render_markdown(body)}
+        for row_id, body in rows
+    ]
+
+
+async def _write_batch(table: Table, rendered: list[dict]) -> int:
+    stmt = (
+        update(table)
+        .where(table.c.id == bindparam("b_id"))
+        .where(func.md5(table.c.body) == bindparam("b_digest"))
+        .values(body_html=bindparam("b_html"))
+        .execution_options(synchronize_session=False)
+    )
+    async with engine.begin() as conn:
+        await conn.execute(stmt, rendered)
+    return len(rendered)
+
+
+async def backfill(model, pool: ProcessPoolExecutor, batch_size: int, workers: int, rerender: bool) -> int:
+    table = model.__table__
+    loop = asyncio.get_running_loop()
+    in_flight: set[asyncio.Task] = set()
+    last_id = None
+    done = 0
+
+    async def render_and_write(rows):
+        rendered = await loop.run_in_executor(pool, _render_batch, rows)
+        return await _write_batch(table, rendered)
+
+    while True:
+        query = select(table.c.id, table.c.body).where(table.c.body.isnot(None))
+        if not rerender:
+            query = query.where(table.c.body_html.is_(None))
+        if last_id is not None:
+            query = query.where(table.c.id > last_id)
+        query = query.order_by(table.c.id).limit(batch_size)
+
+        async with engine.connect() as conn:
+            rows = (await conn.execute(query)).all()
+        if not rows:
+            break
+        last_id = rows[-1].id
+
+        in_flight.add(asyncio.create_task(
+            render_and_write([(row.id, row.body) for row in rows])
+        ))
+        # Keep one batch per process busy while the next one is fetched.
+        if len(in_flight) >= workers:
+            finished, in_flight = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+            done += sum(task.result() for task in finished)
+            print(f"  {table.name}: {done} rendered")
+
+    if in_flight:
+        finished, _ = await asyncio.wait(in_flight)
+        done += sum(task.result() for task in finished)
+    return done
+
+
+async def main(batch_size: int, workers: int, rerender: bool):
+    started = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for model in (Post, Comment):
+            count = await backfill(model, pool, batch_size, workers, rerender)
+            print(f"{model.__tablename__}: {count} rows rendered")
+    await engine.dispose()
+    print(f"Done in {time.perf_counter() - started:.1f}s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Backfill rendered HTML bodies.")
+    parser.add_argument("--all", action="store_true", help="re-render rows that already have body_html")
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 2)
+    args = parser.parse_args()
+    asyncio.run(main(args.batch_size, args.workers, args.all))
@@ -0,0 +1,126 @@
+"""
+Common Ground - spam model training
+Retrains the local spam classifier (app/core/spam_classifier.py) from
+moderator decisions:
+  spam      posts/comments with an ACTIONED spam or crypto flag
+  not spam  content whose spam/crypto flags were all dismissed, plus a
+            random sample of unflagged, never-removed content
+A fifth of the data is held out and precision/recall at
+AUTO_MOD_SPAM_THRESHOLD is printed before the model file is replaced.
+Running workers pick up the new file on their next score.
+
+Run with: docker exec cg-backend python -m jobs.train_spam_model
+Options:  --negative-ratio 3 --epochs 8 --min-positives 20 --output PATH
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import and_, exists, func, select
+
+from app.core.config import settings
+from app.core.constants import SPAM_SCORE_MAX_CHARS, FlagReason, FlagStatus
+from app.core.database import engine
+from app.core.spam_classifier import train
+from app.models.actor import Actor  # noqa: F401 - needed for relationship resolution
+from app.models.comment import Comment
+from app.models.flag import Flag
+from app.models.post import Post
+
+SPAM_REASONS = (FlagReason.SPAM.value, FlagReason.CRYPTO.value)
+
+
+def _text_column(model):
+    if model is Post:
+        return func.concat(Post.title, "\n\n", func.coalesce(Post.body, ""))
+    return Comment.body
+
+
+def _flagged(model, target_type: str, status: str):
+    return exists().where(and_(
+        Flag.target_type == target_type,
+        Flag.target_id == model.id,
+        Flag.reason.in_(SPAM_REASONS),
+        Flag.status == status,
+    ))
+
+
+async def load_samples(negative_ratio: int) -> list[tuple[str, bool]]:
+    samples: list[tuple[str, bool]] = []
+    async with engine.connect() as conn:
+        for model, target_type in ((Post, "post"), (Comment, "comment")):
+            text = _text_column(model)
+            any_flag = exists().where(Flag.target_type == target_type, Flag.target_id == model.id)
+
+            spam = (await conn.execute(
+                select(text).where(_flagged(model, target_type, FlagStatus.ACTIONED.value))
+            )).scalars().all()
+            dismissed = (await conn.execute(
+                select(text).where(
+                    _flagged(model, target_type, FlagStatus.DISMISSED.value),
+                    ~_flagged(model, target_type, FlagStatus.ACTIONED.value),
+                )
+            )).scalars().all()
+            # ORDER BY random() sorts the candidate set; acceptable offline.
+            ordinary = (await conn.execute(
+                select(text)
+                .where(model.is_removed == False, ~any_flag)  # noqa: E712
+                .order_by(func.random())
+                .limit(max(len(spam) * negative_ratio - len(dismissed), 0))
+            )).scalars().all()
+
+            samples += [(t, True) for t in spam]
+            samples += [(t, False) for t in (*dismissed, *ordinary)]
+            print(f"{target_type}s: {len(spam)} spam, {len(dismissed)} dismissed, {len(ordinary)} ordinary")
+    return [(t[:SPAM_SCORE_MAX_CHARS], is_spam) for t, is_spam in samples]
+
+
+def evaluate(model, holdout: list[tuple[str, bool]], threshold: float) -> str:
+    tp = fp = fn = 0
+    for text, is_spam in holdout:
+        predicted = model.score(text) >= threshold
+        tp += predicted and is_spam
+        fp += predicted and not is_spam
+        fn += is_spam and not predicted
+    precision = tp / (tp + fp) if tp + fp else 0.0
+    recall = tp / (tp + fn) if tp + fn else 0.0
+    return f"precision {precision:.2f}, recall {recall:.2f} at threshold {threshold}"
+
+
+async def main(args):
+    started = time.perf_counter()
+    samples = await load_samples(args.negative_ratio)
+    await engine.dispose()
+
+    positives = sum(1 for _, is_spam in samples if is_spam)
+    if positives < args.min_positives:
+        print(f"Only {positives} actioned spam samples (need {args.min_positives}); model left unchanged.")
+        return
+
+    random.Random(0).shuffle(samples)
+    cut = len(samples) // 5
+    holdout, training = samples[:cut], samples[cut:]
+    model = train(training, epochs=args.epochs)
+    print(f"Holdout ({len(holdout)} samples): {evaluate(model, holdout, settings.auto_mod_spam_threshold)}")
+
+    # Final model uses every sample.
+    model = train(samples, epochs=args.epochs)
+    model.meta["trained_at"] = int(time.time())
+    model.save(args.output)
+    print(f"Wrote {args.output} in {time.perf_counter() - started:.1f}s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Retrain the local spam classifier.")
+    parser.add_argument("--negative-ratio", type=int, default=3, help="non-spam samples per spam sample")
+    parser.add_argument("--epochs", type=int, default=8)
+    parser.add_argument("--min-positives", type=int, default=20)
+    parser.add_argument("--output", default=settings.spam_model_path)
+    asyncio.run(main(parser.parse_args()))
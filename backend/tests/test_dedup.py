@@ -0,0 +1,55 @@
+import asyncio
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from app.core.config import settings
+from app.core.database import async_session_factory
+from app.core.dedup import check_duplicate, fingerprint, release_content
+
+
+def _text() -> str:
+    return f"A long enough announcement nobody else would write {uuid.uuid4().hex}"
+
+
+def test_concurrent_identical_posts_create_one(client, register, community):
+    headers, _ = register()
+    body = {"community_slug": community, "title": "Same words", "body": _text()}
+
+    with ThreadPoolExecutor(8) as pool:
+        codes = list(pool.map(
+            lambda _: client.post("/api/v1/posts", headers=headers, json=body).status_code,
+            range(8),
+        ))
+    assert sorted(codes) == [201] + [409] * 7
+
+
+def test_concurrent_copies_across_actors_are_counted(client):
+    fp = fingerprint(_text())
+    authors = [str(uuid.uuid4()) for _ in range(settings.dedup_reject_copies + 2)]
+
+    async def submit_all():
+        async with async_session_factory() as db:
+            return await asyncio.gather(*(
+                check_duplicate(db, fp, author, str(uuid.uuid4())) for author in authors
+            ))
+
+    verdicts = sorted(client.portal.call(submit_all), key=lambda v: v.copies)
+    # Each write counts every one reserved before it; the last two are
+    # floods, whose reservations are dropped again.
+    limit = settings.dedup_reject_copies
+    assert [v.copies for v in verdicts[:limit]] == list(range(limit))
+    assert [v.action for v in verdicts].count("allow") == settings.dedup_flag_copies
+    assert all(v.action == "reject" for v in verdicts[limit:])
+
+def test_released_reservation_no_longer_counts(client):
+    fp = fingerprint(_text())
+    author, target = str(uuid.uuid4()), str(uuid.uuid4())
+
+    async def check(target_id):
+        async with async_session_factory() as db:
+            return await check_duplicate(db, fp, author, target_id)
+
+    assert client.portal.call(check, target).action == "allow"
+    assert client.portal.call(check, str(uuid.uuid4())).action == "reject"
+    client.portal.call(release_content, fp, author, target)
+    assert client.portal.call(check, str(uuid.uuid4())).action == "allow"
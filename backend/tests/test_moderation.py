@@ -0,0 +1,116 @@
+import uuid
+
+import pytest
+
+
+@pytest.fixture
+def moderator(register):
+    headers, _ = register("moderator")
+    return headers
+
+
+def _post(client, headers, community) -> str:
+    r = client.post("/api/v1/posts", headers=headers, json={
+        "community_slug": community, "title": "Bulk target", "body": f"Body {uuid.uuid4().hex}",
+    })
+    assert r.status_code == 201, r.text
+    return r.json()["id"]
+
+
+def _bulk(client, moderator, **body):
+    r = client.post("/api/v1/moderation/actions/bulk", headers=moderator, json={"reason": "spam wave", **body})
+    assert r.status_code == 200, r.text
+    return r.json()
+
+
+def test_bulk_mute_records_each_author_once(client, sql, register, community, moderator):
+    a_headers, a_id = register()
+    b_headers, b_id = register()
+    targets = [
+        {"target_type": "post", "target_id": _post(client, headers, community)}
+        for headers in (a_headers, a_headers, a_headers, b_headers)
+    ]
+
+    result = _bulk(client, moderator, action="mute", targets=targets)
+    assert (result["applied"], result["authors_affected"]) == (2, 2)
+
+    rows = sql(
+        "SELECT target_type, target_id, target_author_id FROM moderation_actions"
+        " WHERE target_author_id IN (:a, :b)", a=a_id, b=b_id,
+    )
+    assert sorted((t, str(i), str(author)) for t, i, author in rows) == sorted(
+        [("actor", a_id, a_id), ("actor", b_id, b_id)]
+    )
+    [(audits,)] = sql(
+        "SELECT count(*) FROM audit_log WHERE action = 'mod_mute' AND resource_id IN (:a, :b)",
+        a=a_id, b=b_id,
+    )
+    assert audits == 2
+
+
+def test_bulk_ban_by_author_without_content(client, sql, register, moderator):
+    _, author_id = register()
+
+    result = _bulk(client, moderator, action="ban", author_id=author_id)
+    assert (result["applied"], result["authors_affected"]) == (1, 1)
+    [(is_active,)] = sql("SELECT is_active FROM actors WHERE id = :id", id=author_id)
+    assert is_active is False
+
+
+def test_bulk_by_author_is_capped(client, sql, register, community, moderator, monkeypatch):
+    import app.services.moderation_service as moderation_service
+
+    monkeypatch.setattr(moderation_service, "MOD_BULK_MAX_ITEMS", 2)
+    headers, author_id = register()
+    for _ in range(3):
+        _post(client, headers, community)
+
+    first = _bulk(client, moderator, action="remove", author_id=author_id)
+    assert (first["applied"], first["truncated"]) == (2, True)
+    rest = _bulk(client, moderator, action="remove", author_id=author_id)
+    assert (rest["applied"], rest["truncated"]) == (1, False)
+    [(left,)] = sql("SELECT count(*) FROM posts WHERE author_id = :id AND NOT is_removed", id=author_id)
+    assert left == 0
+
+
+def test_bulk_unknown_author(client, moderator):
+    r = client.post("/api/v1/moderation/actions/bulk", headers=moderator, json={
+        "action": "warn", "reason": "x", "author_id": str(uuid.uuid4()),
+    })
+    assert r.status_code == 404
+
+
+def test_expired_mute_is_not_a_reversal(client, sql, register, community, moderator):
+    from app.services.mod_expiry import expire_due
+
+    headers, author_id = register()
+    r = client.post("/api/v1/moderation/actions", headers=moderator, json={
+        "target_type": "post", "target_id": _post(client, headers, community),
+        "action": "mute", "reason": "cool off", "duration_hours": 1,
+    })
+    assert r.status_code == 201, r.text
+    action_id = r.json()["id"]
+    sql("UPDATE moderation_actions SET expires_at = now() - interval '1 second' WHERE id = :id", id=action_id)
+
+    client.portal.call(expire_due)
+    [(is_reversed, expired_at)] = sql(
+        "SELECT is_reversed, expired_at FROM moderation_actions WHERE id = :id", id=action_id,
+    )
+    assert not is_reversed and expired_at is not None
+    [(is_active,)] = sql("SELECT is_active FROM actors WHERE id = :id", id=author_id)
+    assert is_active is True
+
+    # Overturning it afterwards is still a reversal.
+    admin, _ = register("admin")
+    r = client.post(f"/api/v1/moderation/actions/{action_id}/reverse", headers=admin)
+    assert r.status_code == 200, r.text
+    assert r.json()["is_reversed"] and r.json()["expired_at"] is not None
+
+
+def test_moderator_delete_shows_in_cached_log(client, register, community, moderator):
+    headers, _ = register()
+    post_id = _post(client, headers, community)
+    client.get("/api/v1/moderation/log")  # cache the first page
+
+    assert client.delete(f"/api/v1/posts/{post_id}", headers=moderator).status_code == 200
+    assert post_id in [a["target_id"] for a in client.get("/api/v1/moderation/log").json()]
@@ -0,0 +1,23 @@
+import pytest
+
+from app.core.query_stats import normalize_sql
+
+
+def test_normalize_sql_collapses_literals_and_in_lists():
+    a = normalize_sql("SELECT * FROM posts WHERE id IN ($1, $2, $3) AND title = 'x'  LIMIT 5")
+    b = normalize_sql("SELECT * FROM posts WHERE id IN ($1) AND title = 'it''s' LIMIT 50")
+    assert a == b == "SELECT * FROM posts WHERE id IN (?) AND title = ? LIMIT ?"
+
+
+def test_community_page_fits_budget(client, community, statement_budget):
+    # SET TRANSACTION READ ONLY, the community, its memberships (selectin)
+    with statement_budget(3):
+        r = client.get(f"/api/v1/communities/{community}")
+    assert r.status_code == 200
+
+
+def test_budget_reports_overrun(client, community, statement_budget):
+    with pytest.raises(AssertionError, match="Statement budget exceeded"):
+        with statement_budget(0):
+            client.get(f"/api/v1/communities/{community}")
+
@@ -0,0 +1,32 @@
+from datetime import timedelta
+
+from app.core.rate_limiter import RateLimiter, credential_principal
+from app.core.security import create_access_token, create_refresh_token, credential_fingerprint, generate_api_key
+
+
+def test_uncached_access_token_keys_by_actor():
+    token = create_access_token("actor-1", "agent")
+    assert credential_principal(token) == ("actor-1", None)
+
+
+def test_unusable_tokens_identify_nobody():
+    forged = create_access_token("actor-1", "agent")[:-4] + "AAAA"
+    expired = create_access_token("actor-1", "agent", expires_delta=timedelta(seconds=-1))
+    refresh = create_refresh_token("actor-1")
+    for credential in (forged, expired, refresh, "not-a-token"):
+        assert credential_principal(credential) is None
+
+
+def test_uncached_api_key_keys_by_fingerprint():
+    key, _, _ = generate_api_key()
+    assert credential_principal(key) == (f"key:{credential_fingerprint(key)}", None)
+
+
+def test_agents_behind_one_ip_get_their_own_buckets():
+    limiter = RateLimiter(5, 3600, prefix="post", per_actor=True)
+    a = limiter._checks("10.0.0.1", credential_principal(create_access_token("actor-a", "agent")))
+    b = limiter._checks("10.0.0.1", credential_principal(create_access_token("actor-b", "agent")))
+    assert a[0] == ("cg:rate:post:actor:actor-a", 5)
+    assert b[0] == ("cg:rate:post:actor:actor-b", 5)
+    # Only the coarse shield is shared.
+    assert a[1] == b[1] == ("cg:rate:post:shield:10.0.0.1", 50)
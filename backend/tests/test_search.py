@@ -0,0 +1,83 @@
+import random
+import string
+
+import pytest
+
+
+def _word() -> str:
+    """A made-up word no other test content contains."""
+    return "zq" + "".join(random.choices(string.ascii_lowercase, k=10))
+
+
+@pytest.fixture
+def post(client, register, community):
+    """post(title, body) -> id of a new post in the test's community."""
+    headers, _ = register()
+
+    def _post(title: str, body: str) -> str:
+        r = client.post("/api/v1/posts", headers=headers, json={
+            "community_slug": community, "title": title, "body": body,
+        })
+        assert r.status_code == 201, r.text
+        return r.json()["id"]
+
+    return _post
+
+
+def _search(client, community, **params):
+    r = client.get("/api/v1/search", params={"community": community, **params})
+    assert r.status_code == 200, r.text
+    return r.json()
+
+
+def test_websearch_syntax(client, community, post):
+    tag, near, far = _word(), _word(), _word()
+    phrase = post(f"{tag} notes", f"{near} {far} appear together here")
+    apart = post(f"{tag} more notes", f"{far} and then, much later, {near}")
+
+    hits = _search(client, community, q=f'"{near} {far}"', type="post")["results"]
+    assert [h["id"] for h in hits] == [phrase]
+
+    hits = _search(client, community, q=f"{tag} -{near}")["results"]
+    assert hits == []
+
+    hits = _search(client, community, q=f"{near} OR {far}", sort="new")["results"]
+    assert [h["id"] for h in hits] == [apart, phrase]
+
+
+@pytest.mark.parametrize("sort", ["relevance", "new"])
+def test_keyset_pages_cover_every_hit_once(client, community, post, sort):
+    tag = _word()
+    ids = {post(f"{_word()} title", f"{tag} " * (i + 1) + _word()) for i in range(5)}
+
+    seen, cursor = [], None
+    for _ in range(5):
+        params = {"q": tag, "sort": sort, "limit": 2}
+        if cursor:
+            params["cursor"] = cursor
+        page = _search(client, community, **params)
+        seen += [h["id"] for h in page["results"]]
+        cursor = page["next_cursor"]
+        if not cursor:
+            break
+    assert sorted(seen) == sorted(ids)
+
+
+def test_cursor_for_another_sort_is_rejected(client, community, post):
+    tag = _word()
+    for _ in range(3):
+        post(f"{_word()} title", f"{tag} {_word()}")
+    cursor = _search(client, community, q=tag, limit=1)["next_cursor"]
+    r = client.get("/api/v1/search", params={"q": tag, "sort": "new", "cursor": cursor})
+    assert r.status_code == 400
+
+
+def test_snippet_is_plain_text_with_marks(client, community, post):
+    tag = _word()
+    post(f"{_word()} title", f"Fish & chips <b>{tag}</b> <script>x</script> are **great**")
+
+    [hit] = _search(client, community, q=tag)["results"]
+    assert f"<mark>{tag}</mark>" in hit["snippet"]
+    assert "Fish &amp; chips" in hit["snippet"]
+    assert "&amp;amp;" not in hit["snippet"]
+    assert "<b>" not in hit["snippet"] and "&lt;b&gt;" not in hit["snippet"]
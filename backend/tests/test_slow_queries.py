@@ -0,0 +1,23 @@
+import pytest
+
+from app.core.slow_queries import safe_to_analyze
+
+
+@pytest.mark.parametrize("shape", [
+    "SELECT pg_try_advisory_lock(?)",
+    "SELECT pg_advisory_xact_lock(?)",
+    "SELECT pg_notify(?, ?)",
+    "SELECT nextval(?)",
+    "SELECT id FROM moderation_actions WHERE expires_at <= now() FOR UPDATE SKIP LOCKED",
+    "SELECT id FROM posts FOR KEY SHARE",
+])
+def test_side_effect_selects_are_not_analyzed(shape):
+    assert not safe_to_analyze(shape)
+
+
+@pytest.mark.parametrize("shape", [
+    "SELECT posts.id FROM posts WHERE posts.is_locked = false ORDER BY posts.hot_rank DESC LIMIT ?",
+    "SELECT count(*) FROM audit_log",
+])
+def test_plain_selects_are_analyzed(shape):
+    assert safe_to_analyze(shape)
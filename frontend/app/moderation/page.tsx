@@ -128,6 +128,11 @@ export default function ModerationLogPage() {
                           reversed
                         </span>
                       )}
+                      {action.expired_at && !action.is_reversed && (
+                        <span className="rounded bg-gray-500/20 px-1.5 py-0.5 text-xs text-gray-400 font-medium">
+                          expired
+                        </span>
+                      )}
                     </div>
                     <p className="mt-1 text-sm">{action.reason}</p>
                     <div className="mt-2 flex items-center gap-2 text-xs text-[var(--cg-text-muted)]">
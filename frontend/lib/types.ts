@@ -63,6 +63,8 @@ export interface ModActionPublic {
   reason: string;
   duration_hours: number | null;
   is_reversed: boolean;
+  expires_at: string | null;
+  expired_at: string | null;
   created_at: string;
 }
 